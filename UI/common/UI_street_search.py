@@ -0,0 +1,95 @@
+"""
+UI_street_search.py
+Autocomplete nama jalan/persimpangan untuk QComboBox, dipakai bersama sisi pelanggan
+(halaman pesan & profil) dan seller (pilihan node di Simulasi).
+
+Combo dibuat editable; setiap ketikan diteruskan ke NameSearchIndex
+(logic/graph/name_search.py) dan popup hanya berisi top-k hasil, sehingga tidak
+perlu menyaring ribuan item combo secara linear. Teks yang tidak cocok dengan
+item mana pun dikembalikan ke pilihan terakhir saat fokus lepas, jadi
+currentText() tetap selalu nama simpang yang valid.
+
+Komponen:
+- StreetSearchCompleter: QCompleter yang modelnya diisi dari indeks pencarian
+- attach_street_search(combo, region_getter, select_region): pasang ke combo
+"""
+
+from typing import Callable, Optional
+
+from PyQt6.QtCore import Qt, QStringListModel
+from PyQt6.QtWidgets import QComboBox, QCompleter
+
+from logic.graph.name_search import DEFAULT_LIMIT, get_name_index
+
+
+class StreetSearchCompleter(QCompleter):
+    """
+    - region_getter(): daerah aktif (membatasi hasil) atau None untuk semua daerah
+    - select_region(region): dipanggil bila nama terpilih berada di luar item combo,
+      agar halaman bisa mengganti daerah (dan mengisi ulang combo) lebih dulu
+    """
+
+    def __init__(self, combo: QComboBox, region_getter: Optional[Callable[[], Optional[str]]] = None,
+                 select_region: Optional[Callable[[str], None]] = None, limit: int = DEFAULT_LIMIT,
+                 path: Optional[str] = None):
+        super().__init__(combo)
+        self._combo = combo
+        self._region_getter = region_getter
+        self._select_region = select_region
+        self._limit = limit
+        self._index = get_name_index(path) if path else get_name_index()
+
+        self._model = QStringListModel(self)
+        self.setModel(self._model)
+        self.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.setMaxVisibleItems(12)
+
+        combo.setEditable(True)
+        combo.setInsertPolicy(QComboBox.InsertPolicy.NoInsert)
+        combo.setCompleter(self)
+        combo.lineEdit().textEdited.connect(self._on_text_edited)
+        combo.lineEdit().editingFinished.connect(self._on_editing_finished)
+        self.activated[str].connect(self._on_activated)
+
+    def _region(self) -> Optional[str]:
+        return self._region_getter() if self._region_getter else None
+
+    def _on_text_edited(self, text: str):
+        self._model.setStringList(self._index.search(text, self._limit, self._region()))
+        if text.strip():
+            self.complete()
+
+    def _on_activated(self, name: str):
+        idx = self._combo.findText(name, Qt.MatchFlag.MatchFixedString)
+        if idx < 0 and self._select_region is not None:
+            region = self._index.region_of(name)
+            if region is not None:
+                self._select_region(region)
+                idx = self._combo.findText(name, Qt.MatchFlag.MatchFixedString)
+        if idx >= 0:
+            self._combo.setCurrentIndex(idx)
+        else:
+            self._restore_current()
+
+    def _on_editing_finished(self):
+        text = self._combo.currentText()
+        idx = self._combo.findText(text, Qt.MatchFlag.MatchFixedString)
+        if idx >= 0:
+            if idx != self._combo.currentIndex():
+                self._combo.setCurrentIndex(idx)
+        else:
+            self._restore_current()
+
+    def _restore_current(self):
+        self._combo.setEditText(self._combo.itemText(self._combo.currentIndex()))
+
+
+def attach_street_search(combo: QComboBox, region_getter=None, select_region=None,
+                         limit: int = DEFAULT_LIMIT) -> Optional[StreetSearchCompleter]:
+    """Pasang autocomplete ke `combo`; None (combo tetap biasa) jika katalog gagal dimuat."""
+    try:
+        return StreetSearchCompleter(combo, region_getter, select_region, limit)
+    except Exception as e:
+        print(f"Peringatan: pencarian nama jalan tidak tersedia: {e}")
+        return None
@@ -16,6 +16,8 @@ from PyQt6.QtWidgets import (
 )
 import os, json, datetime
 
+from logic.tracing import traced
+
 try:
     # Import fungsi logic untuk load/save data pesanan
     from logic.file.order_logic import load_orders, save_orders
@@ -268,6 +270,10 @@ class OrderCard(QFrame):
 
     def _build_eta_text(self) -> str:
         eta = self.order.get("eta") or "-"
+        # Rute yang dihitung seller tersimpan di pesanan (lihat DeliveryPreviewDialog)
+        route = self.order.get("route")
+        if isinstance(route, dict) and route.get("distance_km") is not None and eta != "-":
+            return f"Estimasi Sampai: {eta} ({float(route['distance_km']):.2f} km)"
         return f"Estimasi Sampai: {eta}"
 
     def _build_mode_text(self) -> str:
@@ -428,6 +434,7 @@ class CustomerDashboard(QWidget):
             """
         )
 
+    @traced("ui.cs_dashboard.reload_orders")
     def reload_orders(self):
         """Muat ulang data pesanan dari storage dan render kartu-kartu, difilter per user."""
         all_orders = load_orders() or []
@@ -12,6 +12,8 @@ from PyQt6.QtWidgets import (
 )
 import datetime
 
+from logic.tracing import traced
+
 try:
     # Import logic untuk load history
     from logic.file.history_logic import load_history
@@ -227,6 +229,7 @@ class CustomerHistory(QWidget):
             """
         )
 
+    @traced("ui.cs_history.reload_history")
     def reload_history(self):
         """Muat ulang data riwayat sesuai user saat ini dan status final yang diizinkan."""
         all_records = load_history() or []
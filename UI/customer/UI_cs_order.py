@@ -21,6 +21,11 @@ except ImportError as e:
     def load_orders(): return []
     def save_orders(_): return False
 
+from logic.graph.location_catalog import get_location_catalog
+from logic.graph.isochrone import get_service_areas, kemacetan_jadwal
+from logic.graph.ongkir import get_ongkir_table
+from UI.common.UI_street_search import attach_street_search
+
 # Konstanta PRODUCTS sebagai fallback
 DEFAULT_PRODUCTS = {
     "Galon Aqua 19L": 20000,
@@ -66,22 +71,10 @@ def _load_area_streets_from_geojson() -> dict:
     Fallback ke konstanta jika gagal.
     """
     path = _graph_path('output.geojson')
-    area_map: dict[str, set] = {} # Gunakan set untuk otomatis handle duplikat
 
     try:
-        print(f"Mencoba memuat area/jalan dari: {path}")
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        for feat in data.get('features', []):
-            props = (feat or {}).get('properties') or {}
-            region = props.get('region_name')
-            inter = props.get('intersection_name') # Nama persimpangan/jalan
-
-            # Hanya proses jika region dan intersection_name valid (string non-kosong)
-            if isinstance(region, str) and region.strip() and \
-               isinstance(inter, str) and inter.strip():
-                area_map.setdefault(region.strip(), set()).add(inter.strip())
+        # Katalog lokasi di-parse sekali & dibagi dengan halaman lain (lihat location_catalog)
+        area_map = get_location_catalog(path).region_to_streets
 
         if not area_map:
             print(f"Tidak ada data region/jalan valid ditemukan di {path}. GeoJSON mungkin kosong atau format salah.")
@@ -89,8 +82,7 @@ def _load_area_streets_from_geojson() -> dict:
             return {"Daerah Tidak Dikenal": ["Jalan Tidak Ditemukan"]}
 
         print(f"Berhasil memuat {len(area_map)} daerah dari GeoJSON.")
-        # Konversi set ke list terurut untuk konsistensi UI
-        return {k: sorted(list(v)) for k, v in area_map.items()}
+        return dict(area_map)
 
     except FileNotFoundError:
         print(f"ERROR: File GeoJSON tidak ditemukan di {path}. Gunakan data fallback.")
@@ -121,6 +113,10 @@ class OrderDialog(QDialog):
         # [MODIFIKASI] Muat data area/jalan dari GeoJSON saat inisialisasi
         self._area_map = _load_area_streets_from_geojson()
         self._products = _load_products_from_json()
+        # Zona layanan depot (poligon isokron, tanpa graf): kelayakan & ongkir per slot
+        self._service_areas = get_service_areas()
+        # Ongkir berbasis jarak jalan dari depot (tabel precomputed, lookup dict)
+        self._ongkir_table = get_ongkir_table()
 
         self._build_ui()
         self._wire_events()
@@ -144,6 +140,8 @@ class OrderDialog(QDialog):
 
         self.combo_street = QComboBox()
         self.combo_street.addItem("-- Pilih Jalan/Persimpangan --") # Ganti nama
+        # Ketik nama jalan langsung; daerah ikut terpilih bila belum dipilih
+        self._street_search = attach_street_search(self.combo_street, self._current_area, self._select_area)
         self.input_note = QLineEdit(); self.input_note.setPlaceholderText("Keterangan Tambahan (Nomor Rumah, dll.)")
         area_row.addWidget(self.combo_area, 1) # Beri proporsi
         area_row.addWidget(self.combo_street, 2) # Beri proporsi lebih besar
@@ -197,9 +195,23 @@ class OrderDialog(QDialog):
         self.combo_street.currentIndexChanged.connect(self._update_submit_enabled)
         self.combo_mode.currentIndexChanged.connect(self._update_submit_enabled)
         self.combo_time.currentIndexChanged.connect(self._update_submit_enabled)
+        # Ongkir bergantung pada lokasi & slot pengiriman
+        self.combo_street.currentIndexChanged.connect(self._refresh_totals)
+        self.combo_mode.currentIndexChanged.connect(self._refresh_totals)
+        self.combo_time.currentIndexChanged.connect(self._refresh_totals)
         self.list_items.model().rowsInserted.connect(self._update_submit_enabled) # Cek saat item ditambah
         self.list_items.model().rowsRemoved.connect(self._update_submit_enabled) # Cek saat item dihapus
 
+    def _current_area(self):
+        """Daerah terpilih (membatasi pencarian jalan), None jika belum dipilih."""
+        area = self.combo_area.currentText()
+        return area if area in self._area_map else None
+
+    def _select_area(self, area: str):
+        idx = self.combo_area.findText(area)
+        if idx >= 0:
+            self.combo_area.setCurrentIndex(idx)
+
     def _on_area_changed(self, index): # Terima index
         """Update dropdown jalan/persimpangan saat area berubah."""
         self.combo_street.blockSignals(True) # Cegah trigger _update_submit_enabled
@@ -272,9 +284,56 @@ class OrderDialog(QDialog):
         self._refresh_totals()
         # _update_submit_enabled() akan dipanggil oleh sinyal rowsInserted/rowsRemoved
 
+    def _schedule_value(self) -> str:
+        """'Segera' atau 'HH.MM' sesuai pilihan mode/waktu."""
+        if self.combo_mode.currentText() == "Pengiriman Terjadwal" and self.combo_time.currentIndex() > 0:
+            return self.combo_time.currentText()
+        return "Segera"
+
+    def _shipping_zone(self):
+        """
+        Zona isokron tujuan untuk slot terpilih: (menit, ongkir), None jika di luar
+        jangkauan, atau "unknown" jika lokasi/data zona belum tersedia.
+        Hanya point-in-polygon pada depot_isochrones.geojson (lihat logic/graph/isochrone.py).
+        """
+        if self._service_areas is None or self.combo_street.currentIndex() <= 0:
+            return "unknown"
+        try:
+            coords = get_location_catalog(_graph_path('output.geojson')).name_to_coords.get(self.combo_street.currentText())
+        except Exception:
+            coords = None
+        if coords is None:
+            return "unknown"
+        kemacetan = kemacetan_jadwal(self._schedule_value())
+        if not self._service_areas.has_level(kemacetan):
+            return "unknown"
+        return self._service_areas.zone_for(coords[0], coords[1], kemacetan)
+
+    def _shipping_fee(self, zone):
+        """
+        (ongkir, keterangan) untuk jalan terpilih: dari tabel ongkir jarak jalan
+        (logic/graph/ongkir.py), atau tarif zona isokron jika nama tidak ada di tabel.
+        None jika belum bisa dihitung.
+        """
+        if self.combo_street.currentIndex() > 0 and self._ongkir_table is not None:
+            found = self._ongkir_table.lookup(self.combo_street.currentText())
+            if found is not None:
+                distance_m, fee = found
+                return fee, f"{distance_m / 1000:.2f} km dari depot"
+        if isinstance(zone, tuple) and zone[1] is not None:
+            return zone[1], f"zona ≤ {zone[0]} menit dari depot"
+        return None
+
     def _refresh_totals(self):
         subtotal = sum(it["price"] * it["qty"] for it in self.items)
-        shipping = "Rp ?" # Placeholder
+        zone = self._shipping_zone()
+        fee = self._shipping_fee(zone)
+        if zone is None:
+            shipping = "di luar jangkauan pengiriman"
+        elif fee is None:
+            shipping = "Rp ?" # Placeholder
+        else:
+            shipping = f"Rp {fee[0]:,} ({fee[1]})"
         self.label_total_barang.setText(f"Total Barang: Rp {subtotal:,}")
         self.label_total_ongkir.setText(f"Biaya Pengiriman: {shipping}")
 
@@ -286,6 +345,7 @@ class OrderDialog(QDialog):
         if not self.items: return False # Cek list items
         if self.combo_mode.currentIndex() <= 0: return False # Cek pilihan mode valid
         if self.combo_mode.currentIndex() == 2 and self.combo_time.currentIndex() <= 0: return False # Cek waktu jika terjadwal
+        if self._shipping_zone() is None: return False # Di luar zona layanan depot untuk slot ini
         return True
 
     def _update_submit_enabled(self):
@@ -309,10 +369,9 @@ class OrderDialog(QDialog):
             return
 
         # Bangun record order
-        mode = self.combo_mode.currentText()
-        schedule_val = "Segera"
-        if mode == "Pengiriman Terjadwal":
-            schedule_val = self.combo_time.currentText()
+        schedule_val = self._schedule_value()
+        zone = self._shipping_zone()
+        fee = self._shipping_fee(zone)
 
         order = {
             "id": self._generate_order_id(),
@@ -328,7 +387,10 @@ class OrderDialog(QDialog):
             "user_name": self.current_user.get("name"),
             "user_email": self.current_user.get("email"),
             # Tambahkan field lain jika perlu, misal total harga
-            "subtotal": sum(it["price"] * it["qty"] for it in self.items)
+            "subtotal": sum(it["price"] * it["qty"] for it in self.items),
+            # Ongkir saat pemesanan (None jika tabel ongkir & data zona tidak tersedia)
+            "shipping_fee": fee[0] if fee is not None else None,
+            "zone_minutes": zone[0] if isinstance(zone, tuple) else None,
         }
 
         try:
@@ -11,6 +11,9 @@ from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import QWidget, QLabel, QVBoxLayout, QHBoxLayout, QComboBox, QLineEdit, QFrame, QPushButton, QMessageBox
 import os, json
 
+from logic.graph.location_catalog import get_location_catalog
+from UI.common.UI_street_search import attach_street_search
+
 
 def _db_path(filename: str) -> str:
     base = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
@@ -45,17 +48,9 @@ def _load_areas_from_json() -> dict:
 def _load_area_streets_from_geojson() -> dict:
     path = _graph_path('output.geojson')
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        area_map: dict[str, set] = {}
-        for feat in data.get('features', []):
-            props = (feat or {}).get('properties') or {}
-            region = props.get('region_name') or ''
-            inter = props.get('intersection_name') or ''
-            if region and inter:
-                area_map.setdefault(region, set()).add(inter)
+        area_map = get_location_catalog(path).region_to_streets
         if area_map:
-            return {k: sorted(v) for k, v in area_map.items()}
+            return dict(area_map)
         return _load_areas_from_json()
     except Exception:
         try:
@@ -159,6 +154,7 @@ class CustomerProfile(QWidget):
         self.combo_street = QComboBox()
         self.combo_street.addItem("-- Pilih Jalan --")
         self.combo_area.currentIndexChanged.connect(self._on_area_changed)
+        self._street_search = attach_street_search(self.combo_street, self._current_area, self._select_area)
 
         self.input_note = QLineEdit()
         self.input_note.setPlaceholderText("nomor rumah, warna rumah, dll...")
@@ -184,6 +180,15 @@ class CustomerProfile(QWidget):
 
         root.addWidget(addr_panel)
 
+    def _current_area(self):
+        area = self.combo_area.currentText()
+        return area if area in self._area_map else None
+
+    def _select_area(self, area: str):
+        idx = self.combo_area.findText(area)
+        if idx >= 0:
+            self.combo_area.setCurrentIndex(idx)
+
     def _on_area_changed(self):
         self.combo_street.clear()
         self.combo_street.addItem("-- Pilih Jalan --")
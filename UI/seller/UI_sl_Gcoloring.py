@@ -10,28 +10,19 @@ from PyQt6.QtWidgets import (
 )
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 
-try:
-    # Asumsi timeline ada di logic.graph atau sesuaikan path-nya
-    from logic.graph.path_finder import buat_visualisasi_timeline_dijkstra
-except ImportError:
-    print("PERINGATAN: Fungsi buat_visualisasi_timeline_dijkstra tidak ditemukan.")
-    # Buat dummy function agar tidak error
-    def buat_visualisasi_timeline_dijkstra(*args, **kwargs):
-        print("Fungsi visualisasi timeline tidak tersedia.")
-        QMessageBox.warning(None, "Timeline Error", "Fungsi untuk menampilkan timeline tidak ditemukan.")
+from logic.tracing import traced
 
 # [MODIFIKASI] Use try-except for robust imports
+# path_finder (osmnx/geopandas) tidak diimpor di sini: baru dimuat saat rute
+# sebuah grup pertama kali dihitung (lihat _load_graph_if_needed).
 try:
     from logic.graph.graph_coloring import build_order_graph_from_json, color_graph_with_capacity
-    # Assume path_finder is in the same directory as graph_coloring
-    from logic.graph.path_finder import muat_data_peta_dan_lokasi, cari_rute_by_nama
     # Assume RoutePreviewDialog is in UI.seller
     from UI.seller.UI_sl_deliv import RoutePreviewDialog
+    from UI.seller.UI_sl_route_overlay import find_route_host, route_color
 except ImportError as e:
     print(f"CRITICAL IMPORT ERROR: {e}. Route functionality will be disabled.")
     # Provide dummy fallbacks
-    def muat_data_peta_dan_lokasi(*args, **kwargs): return None, None
-    def cari_rute_by_nama(*args, **kwargs): return (None, 0)
     def build_order_graph_from_json(*args, **kwargs): return nx.Graph()
     def color_graph_with_capacity(*args, **kwargs): return {}, {}
     class RoutePreviewDialog(QDialog):
@@ -45,6 +36,11 @@ except ImportError as e:
             btn = QPushButton("Close")
             btn.clicked.connect(self.accept)
             layout.addWidget(btn)
+    def find_route_host(widget): return None
+    def route_color(index): return "#E53935"
+
+# Nama simpang depot di output.geojson (titik awal semua rute grup)
+DEPOT_NAME = "Pusat Depot Galon"
 
 def _db_path(filename: str) -> str:
     # Assuming this file is in UI/seller, go up 3 levels
@@ -60,8 +56,10 @@ class OrderPreviewDialog(QDialog):
         self.gdf_lokasi = None
         self.G_awal = None # Keep original graph for routing
         self.gdf_lokasi_awal = None
+        self._routing = None # map_cache.RoutingData bersama (graf + katalog lokasi)
         self.address_map = {} # Map Customer Name -> Intersection Name
         self.bins = {} # Store coloring results
+        self._orders_simple = [] # Orders used for the last coloring run
 
         self.setWindowTitle("Preview Orderan")
         self.resize(1000, 720)
@@ -161,6 +159,7 @@ class OrderPreviewDialog(QDialog):
         # --- Action Buttons ---
         btn_row = QHBoxLayout()
         self.btn_do_gc = QPushButton("Lakukan Graph Coloring"); self.btn_do_gc.setObjectName("Primary"); btn_row.addWidget(self.btn_do_gc)
+        self.btn_map_all = QPushButton("Tampilkan Semua Rute di Peta"); self.btn_map_all.setObjectName("Secondary"); self.btn_map_all.setEnabled(False); btn_row.addWidget(self.btn_map_all)
         btn_row.addStretch(1)
         self.btn_back = QPushButton("Kembali"); self.btn_back.setObjectName("Secondary"); btn_row.addWidget(self.btn_back)
         layout.addLayout(btn_row)
@@ -168,6 +167,7 @@ class OrderPreviewDialog(QDialog):
         # --- Connections ---
         self.btn_back.clicked.connect(self.reject)
         self.btn_do_gc.clicked.connect(self._perform_graph_coloring) # Changed target function
+        self.btn_map_all.clicked.connect(self._show_all_routes_on_map)
 
     def _normalize_schedule(self, s: str) -> str:
         s = (s or '').strip().lower()
@@ -234,6 +234,7 @@ class OrderPreviewDialog(QDialog):
         if not orders_simple:
              QMessageBox.information(self, "Tidak Ada Pesanan", f"Tidak ada pesanan yang cocok (status 'Menunggu'/'Sedang Disiapkan') untuk jadwal '{current_schedule}' untuk diwarnai.")
              self._clear_optimal_layout()
+             self.btn_map_all.setEnabled(False)
              self.lbl_optimal_placeholder = QLabel(f"Tidak ada pesanan untuk jadwal '{current_schedule}'.")
              self.optimal_layout.addWidget(self.lbl_optimal_placeholder)
              self.optimal_layout.addStretch(1)
@@ -251,7 +252,9 @@ class OrderPreviewDialog(QDialog):
 
         # Update the main dialog's optimal section based on results
         self.bins = getattr(dlg, 'bins', {}) or {} # Get bins from the preview dialog
+        self._orders_simple = orders_simple
         self._update_optimal_layout(orders_simple)
+        self.btn_map_all.setEnabled(bool(self.bins))
 
 
     def _update_optimal_layout(self, orders_simple_list):
@@ -364,8 +367,7 @@ class OrderPreviewDialog(QDialog):
              return True # Indicate success
 
         print("[DEBUG] Attempting to load map graph and GeoJSON...")
-        lokasi_peta = (-6.872, 107.578) # Center point for OSMnx
-        path_geojson = "logic/graph/output.geojson"
+        path_geojson = os.path.abspath("logic/graph/output.geojson")
 
         try:
             if not os.path.exists(path_geojson):
@@ -373,19 +375,27 @@ class OrderPreviewDialog(QDialog):
                 self.G, self.gdf_lokasi, self.G_awal, self.gdf_lokasi_awal = None, None, None, None
                 return False # Indicate failure
 
-            # Call the imported function
-            G, gdf = muat_data_peta_dan_lokasi(lokasi_peta, path_ke_geojson=path_geojson)
+            try:
+                from logic.graph.map_cache import get_routing_data
+            except ImportError as e:
+                QMessageBox.critical(self, "Map Load Failed", f"Routing module unavailable: {e}")
+                self.G, self.gdf_lokasi, self.G_awal, self.gdf_lokasi_awal = None, None, None, None
+                return False
+
+            # Snapshot graf + katalog lokasi dibagi per proses (tidak diunduh/di-parse ulang)
+            data = get_routing_data(path_geojson, depot_name=DEPOT_NAME)
 
-            if G is None or gdf is None:
-                 QMessageBox.critical(self, "Map Load Failed", "Failed to load map data using muat_data_peta_dan_lokasi.")
+            if data is None:
+                 QMessageBox.critical(self, "Map Load Failed", "Failed to load map data.")
                  self.G, self.gdf_lokasi, self.G_awal, self.gdf_lokasi_awal = None, None, None, None
                  return False
 
-            # Store the original graph data for routing
-            self.G = G # Current G (might be modified by simulation later if needed)
-            self.gdf_lokasi = gdf
-            self.G_awal = G.copy()
-            self.gdf_lokasi_awal = gdf.copy()
+            # Dialog ini hanya membaca graf, jadi data bersama dipakai langsung tanpa copy
+            self._routing = data
+            self.G = data.G
+            self.gdf_lokasi = data.gdf_lokasi
+            self.G_awal = data.G
+            self.gdf_lokasi_awal = data.gdf_lokasi
             print("[DEBUG] Map graph and GDF loaded successfully.")
             return True # Indicate success
 
@@ -394,74 +404,86 @@ class OrderPreviewDialog(QDialog):
             self.G, self.gdf_lokasi, self.G_awal, self.gdf_lokasi_awal = None, None, None, None
             return False # Indicate failure
 
-    def _calculate_and_show_route(self, customer_names: list):
+    def _compute_bin_route(self, customer_names: list):
         """
-        Calculates the sequential shortest path and displays the map route
-        WITH customer highlights. Does NOT show a separate timeline.
+        Menghitung rute berurutan Depot -> pelanggan-pelanggan dalam satu grup.
+        Returns dict {path_nodes, distance_km, customer_node_ids, customer_intersections}
+        atau None jika gagal (pesan error sudah ditampilkan).
         """
         print(f"Calculating route for bin: {customer_names}")
 
         if not self._load_graph_if_needed():
             QMessageBox.warning(self, "Map Data Error", "Cannot calculate route: map data failed to load.")
-            return
+            return None
 
-        start_node_name = "Pusat Depot Galon" # <<<=== SESUAIKAN JIKA PERLU
+        start_node_name = DEPOT_NAME
         stops_names = [start_node_name]
-        valid_stops = True
         customer_intersection_names = []
         for name in customer_names:
             address = self.address_map.get(name)
             if not address or address == "Unknown Address":
                 QMessageBox.warning(self, "Missing Address", f"Cannot find address for customer: '{name}'. Route calculation aborted.")
-                valid_stops = False
-                break
+                return None
             stops_names.append(address)
             customer_intersection_names.append(address)
 
-        if not valid_stops: return
         print(f"Route stops (intersection names): {stops_names}")
 
         total_route_nodes = []
         total_distance_km = 0.0
-        route_possible = True
 
+        from logic.graph.path_finder import cari_rute_by_nama
+        current_graph = self.G_awal
+        current_gdf = self.gdf_lokasi_awal
+
+        if current_graph is None or current_gdf is None:
+            raise ValueError("Original map graph (G_awal) or gdf_lokasi_awal is not loaded.")
+
+        for i in range(len(stops_names) - 1):
+            start_name_segment = stops_names[i]
+            end_name_segment = stops_names[i + 1]
+            print(f"  Calculating segment: {start_name_segment} -> {end_name_segment}")
+            edges, length_km = cari_rute_by_nama(current_graph, current_gdf, start_name_segment, end_name_segment,
+                                                 show_preview=False, name_index=self._routing.name_to_node)
+            if edges is None:
+                QMessageBox.critical(self, "Route Segment Failed", f"Could not find path between '{start_name_segment}' and '{end_name_segment}'.")
+                return None
+            path_nodes_segment = [edges[0][0]] + [edge[1] for edge in edges]
+            print(f"    Segment found: {length_km:.2f} km, {len(path_nodes_segment)} nodes")
+            total_distance_km += length_km
+            if i == 0: total_route_nodes.extend(path_nodes_segment)
+            else: total_route_nodes.extend(path_nodes_segment[1:])
+
+        # --- Persiapan ID Pelanggan (Tetap diperlukan) ---
+        customer_destination_ids = []
+        # Simpul graf routing (sama dengan path_nodes), bukan osmid mentah dari GeoJSON
+        name_to_id_map = self._routing.name_to_node
+
+        for intersection_name in customer_intersection_names:
+            node_id = name_to_id_map.get(intersection_name)
+            if node_id is not None: customer_destination_ids.append(node_id)
+            else: print(f"Warning: Cannot find OSM ID for '{intersection_name}'")
+        # --- Selesai Persiapan ID ---
+
+        return {
+            "path_nodes": total_route_nodes,
+            "distance_km": total_distance_km,
+            "customer_node_ids": customer_destination_ids,
+            "customer_intersections": customer_intersection_names,
+        }
+
+    def _calculate_and_show_route(self, customer_names: list):
+        """
+        Calculates the sequential shortest path and displays the map route
+        WITH customer highlights. Does NOT show a separate timeline.
+        """
         try:
-            current_graph = self.G_awal
-            current_gdf = self.gdf_lokasi_awal
-
-            if current_graph is None or current_gdf is None:
-                raise ValueError("Original map graph (G_awal) or gdf_lokasi_awal is not loaded.")
-
-            for i in range(len(stops_names) - 1):
-                start_name_segment = stops_names[i]
-                end_name_segment = stops_names[i + 1]
-                print(f"  Calculating segment: {start_name_segment} -> {end_name_segment}")
-                edges, length_km = cari_rute_by_nama(current_graph, current_gdf, start_name_segment, end_name_segment, show_preview=False)
-                if edges is None:
-                    QMessageBox.critical(self, "Route Segment Failed", f"Could not find path between '{start_name_segment}' and '{end_name_segment}'.")
-                    route_possible = False; break
-                path_nodes_segment = [edges[0][0]] + [edge[1] for edge in edges]
-                print(f"    Segment found: {length_km:.2f} km, {len(path_nodes_segment)} nodes")
-                total_distance_km += length_km
-                if i == 0: total_route_nodes.extend(path_nodes_segment)
-                else: total_route_nodes.extend(path_nodes_segment[1:])
-
-            if not route_possible: return
-
-            # --- Persiapan ID Pelanggan (Tetap diperlukan) ---
-            customer_destination_ids = []
-            name_to_id_map = {}
-            if current_gdf is not None and not current_gdf.empty:
-                 try:
-                      gdf_indexed_by_name = current_gdf.set_index('intersection_name')
-                      name_to_id_map = gdf_indexed_by_name['osmid'].to_dict()
-                 except Exception as e: print(f"Error making name_to_id_map: {e}")
-
-            for intersection_name in customer_intersection_names:
-                node_id = name_to_id_map.get(intersection_name)
-                if node_id is not None: customer_destination_ids.append(node_id)
-                else: print(f"Warning: Cannot find OSM ID for '{intersection_name}'")
-            # --- Selesai Persiapan ID ---
+            route = self._compute_bin_route(customer_names)
+            if route is None:
+                return
+            total_route_nodes = route["path_nodes"]
+            total_distance_km = route["distance_km"]
+            customer_destination_ids = route["customer_node_ids"]
 
             # 4. Display the combined route MAP in the preview dialog
             route_title = f"Rute Grup: {', '.join(customer_names)}\nTotal Jarak: {total_distance_km:.2f} km"
@@ -470,7 +492,7 @@ class OrderPreviewDialog(QDialog):
 
             # [MODIFIKASI] Kirim customer_destination_ids ke RoutePreviewDialog
             route_dialog = RoutePreviewDialog(
-                g=current_graph,
+                g=self.G_awal,
                 path_nodes=total_route_nodes,
                 customer_node_ids=customer_destination_ids, # <-- KIRIM ID PELANGGAN
                 title=route_title,
@@ -487,6 +509,57 @@ class OrderPreviewDialog(QDialog):
             QMessageBox.critical(self, "Route Calculation Error", f"An error occurred: {e}")
             print(f"ERROR calculating route: {e}")
 
+    def _show_all_routes_on_map(self):
+        """
+        Kirim rute SEMUA grup (satu warna per grup) ke peta Leaflet di halaman Simulasi.
+        Hanya koordinat yang dikirim; basemap tidak dirender ulang.
+        """
+        if not self.bins:
+            QMessageBox.information(self, "Belum Ada Grup", "Lakukan Graph Coloring terlebih dahulu.")
+            return
+        host = find_route_host(self)
+        if host is None:
+            QMessageBox.warning(self, "Peta Tidak Tersedia", "Halaman peta (Simulasi) tidak ditemukan.")
+            return
+
+        from logic.graph.route_geometry import route_polyline, node_latlon
+
+        name_map = {str(o.get('id')): str(o.get('name') or o.get('id')) for o in self._orders_simple}
+        routes = []
+        try:
+            for i, cid in enumerate(sorted(self.bins.keys())):
+                nodes = self.bins[cid].get('nodes', [])
+                customer_names = [name_map.get(str(n), f"ID:{n}") for n in nodes]
+                route = self._compute_bin_route(customer_names)
+                if route is None:
+                    return
+
+                coords = route_polyline(self.G_awal, route["path_nodes"])
+                markers = []
+                start = node_latlon(self.G_awal, route["path_nodes"][0])
+                if start:
+                    markers.append({"lat": start[0], "lon": start[1], "label": "Pusat Depot Galon", "kind": "start"})
+                coords_by_name = self._routing.locations.name_to_coords
+                for cust_name, inter_name in zip(customer_names, route["customer_intersections"]):
+                    latlon = coords_by_name.get(inter_name)
+                    if latlon is not None:
+                        markers.append({"lat": latlon[0], "lon": latlon[1], "label": f"{cust_name} ({inter_name})", "kind": "customer"})
+
+                routes.append({
+                    "id": f"grup-{cid + 1}",
+                    "coords": coords,
+                    "color": route_color(i),
+                    "label": f"Grup {cid + 1}: {', '.join(customer_names)} ({route['distance_km']:.2f} km)",
+                    "markers": markers,
+                })
+        except Exception as e:
+            QMessageBox.critical(self, "Route Calculation Error", f"An error occurred: {e}")
+            print(f"ERROR calculating routes: {e}")
+            return
+
+        host.show_routes_on_map(routes)
+        self.accept()
+
 # --- (Kelas GraphColoringPreview Anda tetap sama persis) ---
 class GraphColoringPreview(QDialog):
     def __init__(self, orders_simple: list, parent=None):
@@ -525,6 +598,7 @@ class GraphColoringPreview(QDialog):
         btn_row = QHBoxLayout(); btn_row.addStretch(1); self.btn_close = QPushButton("Kembali"); self.btn_close.setObjectName("Secondary"); btn_row.addWidget(self.btn_close); layout.addLayout(btn_row)
         self.btn_close.clicked.connect(self.accept)
 
+    @traced("ui.gcoloring.render")
     def _render_graph_coloring(self):
         try:
             gal_cap = 4; kar_cap = 2
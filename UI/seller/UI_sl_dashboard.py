@@ -16,6 +16,8 @@ from PyQt6.QtWidgets import (
 )
 import os, json, datetime
 
+from logic.tracing import traced
+
 try:
     # Import fungsi logic untuk load/save data pesanan
     from logic.file.order_logic import load_orders, save_orders
@@ -347,6 +349,7 @@ class CustomerDashboard(QWidget):
             """
         )
 
+    @traced("ui.sl_dashboard.reload_orders")
     def reload_orders(self):
         """Muat ulang data pesanan: Dashboard hanya menampilkan status 'menunggu'."""
         all_orders = load_orders() or []
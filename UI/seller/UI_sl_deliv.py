@@ -1,18 +1,30 @@
 from PyQt6.QtCore import Qt, QSize
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QWidget, QFrame,
-    QListWidget, QListWidgetItem, QPushButton, QSpacerItem, QSizePolicy, QMessageBox, QScrollArea
+    QListWidget, QListWidgetItem, QPushButton, QSpacerItem, QSizePolicy, QMessageBox, QScrollArea,
+    QButtonGroup
 )
 import textwrap
-import os, json, datetime, random
-from datetime import time
+import os, json, datetime, random, hashlib
 import math
-import networkx as nx
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-import geopandas as gpd
-import osmnx as ox
-from logic.graph.path_finder import muat_data_peta_dan_lokasi, cari_rute_by_nama
+from typing import TYPE_CHECKING
+
+from logic.tracing import traced
+
+# Stack GIS & plotting (osmnx, geopandas, networkx, matplotlib) sengaja TIDAK
+# diimpor di level modul: modul ini ikut termuat saat dashboard seller dibuat,
+# padahal peta baru dibutuhkan saat rute pertama kali dihitung/ditampilkan.
+if TYPE_CHECKING:
+    import networkx as nx
+    import geopandas as gpd
+
+
+def _figure_canvas(figsize=(12, 9)):
+    """Buat pasangan (fig, ax, canvas) matplotlib secara lazy."""
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+    fig, ax = plt.subplots(figsize=figsize)
+    return fig, ax, FigureCanvas(fig)
 
 
 def _db_path(filename: str) -> str:
@@ -49,11 +61,12 @@ class DeliveryPreviewDialog(QDialog):
     - Bawah: Tombol Kembali dan Kirim Sekarang
     """
 
-    def __init__(self, order: dict, parent=None, marker_deleted=None, desc_marker=None):
+    def __init__(self, order: dict, parent=None, marker_deleted=None, desc_marker=None, edge_deleted=None):
         super().__init__(parent)
         self.order = order or {}
         self._price_map = _load_products_price_map()
         self.marker_deleted=marker_deleted
+        self.edge_deleted = edge_deleted or []  # ruas ditutup: [(u, v), ...] dari halaman Simulasi
         self.desc_marker=desc_marker
 
         self.setWindowTitle("Preview Pengiriman")
@@ -184,6 +197,8 @@ class DeliveryPreviewDialog(QDialog):
         self.btn_fastest.setObjectName("Secondary")
         self.btn_nodes = QPushButton("Node")
         self.btn_nodes.setObjectName("Secondary")
+        self.btn_on_map = QPushButton("Lihat di Peta")
+        self.btn_on_map.setObjectName("Secondary")
         self.btn_back = QPushButton("Kembali")
         self.btn_back.setObjectName("Secondary")
         self.btn_send = QPushButton("Kirim Sekarang")
@@ -191,6 +206,7 @@ class DeliveryPreviewDialog(QDialog):
         # Urutan kiri -> kanan sesuai permintaan
         btn_row.addWidget(self.btn_fastest)
         btn_row.addWidget(self.btn_nodes)
+        btn_row.addWidget(self.btn_on_map)
         btn_row.addSpacing(12)
         btn_row.addWidget(self.btn_back)
         btn_row.addWidget(self.btn_send)
@@ -204,7 +220,9 @@ class DeliveryPreviewDialog(QDialog):
         self.btn_send.clicked.connect(self._on_send)
         self.btn_fastest.clicked.connect(self._on_show_fastest_route)
         self.btn_nodes.clicked.connect(self._on_show_nodes_timeline)
+        self.btn_on_map.clicked.connect(self._on_show_route_on_map)
 
+    @traced("ui.deliv.populate")
     def _populate_data(self):
         # Nama & akun pembeli
         name = self.order.get('customer_name') or '-'
@@ -222,7 +240,30 @@ class DeliveryPreviewDialog(QDialog):
         order_type = self.order.get('schedule')
         self.lbl_order_type.setText(f"Jadwal Pesanan: {order_type}")
 
-        # Estimasi
+        # Estimasi: rute & ETA yang sudah tersimpan di pesanan cukup dibaca
+        # (tanpa memuat peta, routing, maupun simulasi ETA ulang)
+        stored = self._stored_route()
+        if stored is not None:
+            self._show_eta(stored.get("eta_seconds"))
+        else:
+            self._compute_eta()
+
+        # Rincian item & total
+        total = 0
+        items = self.order.get('items') or []
+        for it in items:
+            nm = it.get('name', 'Produk')
+            qty = int(it.get('qty', 1) or 1)
+            price = int(self._price_map.get(nm, 0))
+            line_total = price * qty
+            total += line_total
+            text = f"{nm} x{qty} - Rp{line_total:,}"
+            self.list_items.addItem(QListWidgetItem(text))
+
+        self.lbl_total.setText(f"Total Harga: Rp{total:,}")
+
+    def _compute_eta(self):
+        """Routing depot -> tujuan + simulasi ETA, lalu simpan hasilnya ke pesanan."""
         self._load_graph_if_needed()
         start_name = "Depot Air Pusat"
         dest_name = self._get_destination_name()
@@ -230,53 +271,118 @@ class DeliveryPreviewDialog(QDialog):
         length_km = 0.0
         if self.G is not None and self.gdf_lokasi is not None and dest_name:
             try:
-                edges, length_km = cari_rute_by_nama(self.G, self.gdf_lokasi, start_name, dest_name, show_preview=False)
+                edges, length_km = self._route_from_depot(start_name, dest_name)
             except Exception:
                 edges, length_km = [], 0.0
-        # Pastikan waktu_kirim berupa datetime
+        waktu_kirim_dt = self._waktu_kirim()
+        jumlah_tikungan = len(edges) if edges else 0
+
+        if not edges or not length_km:
+            # Tidak ada jalur yang ditemukan
+            self._show_eta(None)
+        else:
+            total_detik = self.hitung_simulasi_kecepatan(float(length_km), waktu_kirim_dt, jumlah_tikungan)
+            self._show_eta(int(round(total_detik)))
+            self._persist_route(edges, float(length_km))
+
+    def _waktu_kirim(self) -> datetime.datetime:
+        """Waktu berangkat untuk ETA: jam jadwal hari ini, atau sekarang untuk 'Segera'."""
         schedule = self.order.get('schedule') or 'Segera'
         if schedule != 'Segera':
             s = str(schedule).replace('.', ':')
             try:
                 today = datetime.datetime.now()
                 hh, mm = s.split(':')
-                waktu_kirim_dt = today.replace(hour=int(hh), minute=int(mm), second=0, microsecond=0)
+                return today.replace(hour=int(hh), minute=int(mm), second=0, microsecond=0)
             except Exception:
-                waktu_kirim_dt = datetime.datetime.now()
-        else:
-            waktu_kirim_dt = datetime.datetime.now()
-        jumlah_tikungan = len(edges) if edges else 0
+                pass
+        return datetime.datetime.now()
 
-        if not edges or not length_km:
-            # Tidak ada jalur yang ditemukan
+    def _show_eta(self, seconds):
+        """Isi waktu_tempuh(_detik) & label ETA; None = tidak ada jalur."""
+        if seconds is None:
             self.waktu_tempuh_detik = None
             self.waktu_tempuh = None
             self.lbl_eta_duration.setText("Estimasi Waktu Pengiriman: Tidak ada jalur yang ditemukan")
             self.lbl_eta_arrival.setText("Estimasi Sampai: -")
-        else:
-            total_detik = self.hitung_simulasi_kecepatan(float(length_km), waktu_kirim_dt, jumlah_tikungan)
-            self.waktu_tempuh_detik = int(round(total_detik))
-            menit = self.waktu_tempuh_detik // 60
-            detik = self.waktu_tempuh_detik % 60
-            # Pertahankan kompatibilitas: variabel menit yang dipakai bagian lain
-            self.waktu_tempuh = menit
-            self.lbl_eta_duration.setText(f"Estimasi Waktu Pengiriman: {menit} menit {detik} detik")
-            arrival_str = self._estimate_arrival_hhmm(self.waktu_tempuh)
-            self.lbl_eta_arrival.setText(f"Estimasi Sampai: {arrival_str}")
-
-        # Rincian item & total
-        total = 0
-        items = self.order.get('items') or []
-        for it in items:
-            nm = it.get('name', 'Produk')
-            qty = int(it.get('qty', 1) or 1)
-            price = int(self._price_map.get(nm, 0))
-            line_total = price * qty
-            total += line_total
-            text = f"{nm} x{qty} - Rp{line_total:,}"
-            self.list_items.addItem(QListWidgetItem(text))
+            return
+        self.waktu_tempuh_detik = int(seconds)
+        menit = self.waktu_tempuh_detik // 60
+        detik = self.waktu_tempuh_detik % 60
+        # Pertahankan kompatibilitas: variabel menit yang dipakai bagian lain
+        self.waktu_tempuh = menit
+        self.lbl_eta_duration.setText(f"Estimasi Waktu Pengiriman: {menit} menit {detik} detik")
+        arrival_str = self._estimate_arrival_hhmm(self.waktu_tempuh)
+        self.lbl_eta_arrival.setText(f"Estimasi Sampai: {arrival_str}")
 
-        self.lbl_total.setText(f"Total Harga: Rp{total:,}")
+    # ------------------------------
+    # Rute & ETA tersimpan di pesanan
+    # ------------------------------
+    def _route_signature(self) -> dict:
+        """
+        Kunci validitas rute tersimpan: versi isi graf (graph_version; None selama
+        snapshot graf belum ada, rute tidak dipakai/disimpan), tujuan, jadwal, tingkat
+        kemacetan saat berangkat dan penutupan simulasi yang aktif. Kemacetan ikut dicatat karena pesanan 'Segera' memakai jam sekarang:
+        jadwalnya tetap sama, tetapi ETA berubah begitu jam macet mulai/berakhir.
+        """
+        from logic.graph.map_cache import graph_version
+        closures = sorted(str(n) for n in (self.marker_deleted or []))
+        closures += sorted(f"{u}-{v}" for u, v in self.edge_deleted)
+        return {
+            "graph_version": graph_version(),
+            "dest": self._get_destination_name(),
+            "schedule": self.order.get('schedule') or 'Segera',
+            "kemacetan": self.get_tingkat_kemacetan(self._waktu_kirim()),
+            "closures": hashlib.sha1("|".join(closures).encode("utf-8")).hexdigest()[:12] if closures else "",
+        }
+
+    def _stored_route(self):
+        """Record rute di pesanan jika masih valid untuk kondisi saat ini, selain itu None."""
+        from logic.graph.route_codec import ROUTE_CODEC
+        route = self.order.get('route')
+        if not isinstance(route, dict) or route.get("codec") != ROUTE_CODEC:
+            return None
+        if route.get("eta_seconds") is None:
+            return None
+        signature = self._route_signature()
+        if signature["graph_version"] is None:
+            return None
+        if any(route.get(k) != v for k, v in signature.items()):
+            return None
+        return route
+
+    def _persist_route(self, edges, length_km: float):
+        """
+        Simpan urutan simpul (ter-encode), polyline sederhana (untuk digambar tanpa
+        graf), jarak, ETA & versi graf ke record pesanan.
+        """
+        from logic.graph.route_codec import ROUTE_CODEC, encode_nodes
+        from logic.graph.route_geometry import STORAGE_TOLERANCE_M, encode_polyline, route_polyline
+        signature = self._route_signature()
+        if signature["graph_version"] is None:
+            return
+        try:
+            nodes = [edges[0][0]] + [v for _, v in edges]
+            route = dict(
+                signature,
+                codec=ROUTE_CODEC,
+                nodes=encode_nodes(nodes),
+                polyline=encode_polyline(route_polyline(self.G, nodes, tolerance_m=STORAGE_TOLERANCE_M)),
+                distance_km=round(length_km, 3),
+                eta_seconds=self.waktu_tempuh_detik,
+                computed_at=datetime.datetime.now().isoformat(timespec='seconds'),
+            )
+        except (TypeError, ValueError) as e:
+            print(f"[WARN] Rute tidak bisa di-encode, tidak disimpan: {e}")
+            return
+        eta = self._estimate_arrival_hhmm(self.waktu_tempuh)
+        self.order['route'] = route
+        self.order['eta'] = eta
+        order_id = self.order.get('id')
+        if order_id:
+            from logic.file.order_logic import update_order_route
+            if not update_order_route(order_id, route=route, eta=eta):
+                print(f"[WARN] Gagal menyimpan rute pesanan {order_id}")
 
     def _estimate_duration_minutes(self) -> int:
         # Placeholder estimasi: 15 menit dasar + 2 menit per item
@@ -288,22 +394,18 @@ class DeliveryPreviewDialog(QDialog):
 
     def _estimate_arrival_hhmm(self, duration_min: int) -> str:
         # Jika terjadwal, gunakan jam terjadwal sebagai start, selain itu gunakan sekarang
-        schedule = self.order.get('schedule') or 'Segera'
-        start = datetime.datetime.now()
-        if schedule and schedule != 'Segera':
-            # format wishlist: "HH.mm" atau "HH:MM" -> normalisasi
-            s = str(schedule).replace('.', ':')
-            try:
-                today = datetime.datetime.now()
-                hh, mm = s.split(':')
-                start = today.replace(hour=int(hh), minute=int(mm), second=0, microsecond=0)
-            except Exception:
-                pass
-        arrival = start + datetime.timedelta(minutes=duration_min)
+        arrival = self._waktu_kirim() + datetime.timedelta(minutes=duration_min)
         return _fmt_hhmm(arrival)
 
     def _on_send(self):
         # Tidak mengubah status di sini — biarkan pemanggil yang memutuskan.
+        # ETA pelanggan dihitung dari saat truk berangkat (durasi tersimpan, tanpa routing ulang)
+        order_id = self.order.get('id')
+        if order_id and getattr(self, 'waktu_tempuh', None) is not None:
+            from logic.file.order_logic import update_order_route
+            eta = self._estimate_arrival_hhmm(self.waktu_tempuh)
+            self.order['eta'] = eta
+            update_order_route(order_id, eta=eta)
         self.accept()
 
     # ------------------------------
@@ -319,8 +421,9 @@ class DeliveryPreviewDialog(QDialog):
     def _load_graph_if_needed(self):
         if hasattr(self, 'G') and hasattr(self, 'gdf_lokasi') and self.G is not None and self.gdf_lokasi is not None:
             return
-        lokasi_peta = (-6.872, 107.578)  # pusat area
         path_geojson = os.path.abspath(self._geojson_path())
+        self._routing = None
+        self._closure = None
         try:
             exists = os.path.exists(path_geojson)
             print(f"[DEBUG] Memuat peta & GeoJSON... path_geojson={path_geojson} exists={exists}")
@@ -328,38 +431,77 @@ class DeliveryPreviewDialog(QDialog):
                 QMessageBox.warning(self, "GeoJSON Tidak Ditemukan", f"File tidak ditemukan:\n{path_geojson}")
                 self.G, self.gdf_lokasi = None, None
                 return
-            G, gdf = muat_data_peta_dan_lokasi(lokasi_peta, path_ke_geojson=path_geojson)
-
-            self.G_awal = G.copy()
-            self.gdf_lokasi_awal = gdf.copy()
-
-            osmid_to_remove = gdf[gdf["intersection_name"].isin(self.marker_deleted)]["osmid"].tolist()
-            print("OSMID yang akan dihapus:", osmid_to_remove)
-
-            gdf = gdf[~gdf["intersection_name"].isin(self.marker_deleted)]
-
-            self.G, self.gdf_lokasi = G, gdf
+            # Data routing dibagi per proses dan biasanya sudah dihangatkan oleh prefetch
+            # setelah login (lihat main.AppController). Jika belum, dimuat di sini sekali.
+            from logic.graph.map_cache import get_routing_data
+            data = get_routing_data(path_geojson, depot_name="Depot Air Pusat")
+            if data is None:
+                self.G, self.gdf_lokasi = None, None
+                return
+            self._routing = data
 
-            self.G.remove_nodes_from(osmid_to_remove)
+            # Graf asli dipakai bersama (read-only), tidak perlu di-copy
+            self.G_awal = data.G
+            self.gdf_lokasi_awal = data.gdf_lokasi
 
-            # Hapus node-node tersebut dari graph
-            self.G.remove_nodes_from(osmid_to_remove)
-            print("Nodes to remove:", osmid_to_remove)
-            print("Node count sebelum hapus:", self.G.number_of_nodes())
-            self.G.remove_nodes_from(osmid_to_remove)
-            print("Node count setelah hapus:", self.G.number_of_nodes())
+            if not self._has_closures():
+                self.G, self.gdf_lokasi = data.G, data.gdf_lokasi
+                return
 
-            print("Contoh node dan atribut di G:")
-            for n, attr in list(self.G.nodes(data=True))[:10]:
-                print(n, attr)
+            # Ada simulasi penutupan: SPT depot diperbaiki hanya pada subpohon yang
+            # terdampak (lihat logic/graph/shortest_path_tree.py); graf tidak di-copy,
+            # cukup view tanpa simpul/ruas yang ditutup untuk visualisasi
+            from logic.graph.graph_view import closure_view
+            gdf = data.gdf_lokasi
+            closed_names = self.marker_deleted or []
+            # osmid asli dari data peta -> simpul graf routing (simpul antara bisa sudah dikontraksi)
+            closed_osmids = gdf[gdf["intersection_name"].isin(closed_names)]["osmid"].tolist()
+            osmid_to_remove = [n for n in dict.fromkeys(data.resolve_node(o) for o in closed_osmids) if n is not None]
+            print("OSMID yang akan dihapus:", osmid_to_remove)
 
+            self.gdf_lokasi = gdf[~gdf["intersection_name"].isin(closed_names)]
+            # Ruas jalan ditutup dua arah; semua sisi paralel ikut disembunyikan
+            self.G = closure_view(data.G, nodes=osmid_to_remove, edges=self.edge_deleted)
+            tree = data.depot_tree
+            if tree is not None:
+                mask = tree.edge_mask(self.edge_deleted, both_directions=True)
+                self._closure = tree.with_closures(nodes=osmid_to_remove, edge_mask=mask)
 
-            
         except Exception as e:
             print(f"[ERROR] _load_graph_if_needed: {e}")
             print(f"[DEBUG] path_geojson={path_geojson}")
             self.G, self.gdf_lokasi = None, None
 
+    def _has_closures(self) -> bool:
+        return bool(self.marker_deleted) or bool(self.edge_deleted)
+
+    def _closure_reason(self) -> str:
+        if self.desc_marker:
+            return self.desc_marker[0]
+        return f"{len(self.edge_deleted)} ruas jalan yang ditutup"
+
+    def _route_from_depot(self, start_name: str, dest_name: str):
+        """
+        Rute depot -> tujuan. Tanpa simulasi penutupan, ambil langsung dari tabel
+        jarak depot yang sudah dihitung; selain itu jalankan Dijkstra pada graf saat ini.
+        """
+        data = getattr(self, '_routing', None)
+        if data is not None and start_name == data.depot_name:
+            closure = getattr(self, '_closure', None)
+            if closure is not None:
+                node = data.name_to_node.get(dest_name)
+                if node is not None and dest_name not in (self.marker_deleted or ()):
+                    return closure.route(node)
+                return None, None
+            if self.G is data.G:
+                edges, length_km = data.depot_route(dest_name)
+                if edges is not None:
+                    return edges, length_km
+        from logic.graph.path_finder import cari_rute_by_nama
+        name_index = data.name_to_node if data is not None else None
+        return cari_rute_by_nama(self.G, self.gdf_lokasi, start_name, dest_name,
+                                 show_preview=False, name_index=name_index)
+
     def _get_destination_name(self) -> str:
         # Gunakan 'street' dari order sebagai nama tujuan (harus cocok dengan 'intersection_name' di GeoJSON)
         street = (self.order.get('street') or '').strip()
@@ -376,7 +518,7 @@ class DeliveryPreviewDialog(QDialog):
             self.lbl_estimated_time.setText("Estimasi Waktu Tempuh: Gagal memuat peta")
             self.lbl_analysis_text.setText("Analisis:\nTidak dapat menghitung rute karena data peta tidak tersedia.")
             return None, None, None
-            
+
         start_name = "Depot Air Pusat" # Pastikan nama ini ADA di GeoJSON Anda
         dest_name = self._get_destination_name()
         if not dest_name:
@@ -388,7 +530,7 @@ class DeliveryPreviewDialog(QDialog):
         
 
         # --- HITUNG RUTE PADA GRAF SAAT INI (Normal atau Detour) ---
-        current_edges, current_length_km = cari_rute_by_nama(self.G, self.gdf_lokasi, start_name, dest_name, show_preview=False)
+        current_edges, current_length_km = self._route_from_depot(start_name, dest_name)
         
         # --- HITUNG RUTE Lama PADA GRAF SAAT INI (Normal atau Detour) ---
         # current_edges_awal, current_length_km_awal = cari_rute_by_nama(self.G_awal, self.gdf_lokasi_awal, start_name, dest_name, show_preview=False)
@@ -398,21 +540,20 @@ class DeliveryPreviewDialog(QDialog):
         label_jarak = "Jarak Tempuh Total: "
         label_waktu = "Estimasi Waktu Tempuh: "
 
-        # --- LOGIKA BARU: Cek apakah ada simulasi ---
-        if self.marker_deleted:
-            # Ada simulasi, coba hitung rute asli untuk perbandingan
-            if self.G_awal:
-                try:
-                    # Muat GDF asli lagi untuk lookup nama lengkap
-                    _, original_length_km = cari_rute_by_nama(self.G_awal, self.gdf_lokasi_awal, start_name, dest_name, show_preview=False)
-                except Exception as e:
-                    print(f"Gagal menghitung rute asli untuk perbandingan: {e}")
-                    original_length_km = None
-            else:
-                original_length_km = None # Tidak bisa membandingkan jika G_original tidak ada
+        # --- LOGIKA BARU: Cek apakah ada simulasi (simpul atau ruas ditutup) ---
+        if self._has_closures():
+            # Ada simulasi: jarak asli & detour sama-sama tersedia di SPT yang diperbaiki
+            original_length_km = None
+            node = self._routing.name_to_node.get(dest_name) if self._routing is not None else None
+            if self._closure is not None and node is not None:
+                original_m, _, _ = self._closure.detours([node])
+                if math.isfinite(original_m[0]):
+                    original_length_km = float(original_m[0]) / 1000
+            elif self._routing is not None:
+                _, original_length_km = self._routing.depot_route(dest_name)
 
             if current_edges is None: # Rute alternatif TIDAK ditemukan
-                reasons_str = self.desc_marker[0]
+                reasons_str = self._closure_reason()
                 analysis_str = (
                     f"Analisis:\n"
                     f"Rute normal dari '{start_name}' ke '{dest_name}' (jika ada) tidak dapat digunakan "
@@ -427,7 +568,7 @@ class DeliveryPreviewDialog(QDialog):
                 kecepatan_km_per_menit = 36 / 60
                 estimated_minutes_detour = current_length_km / kecepatan_km_per_menit
                 
-                reasons_str = self.desc_marker[0]
+                reasons_str = self._closure_reason()
                 analysis_str = (
                     f"Analisis:\n"
                     f"Rute terpendek normal adalah {original_length_km:.2f} km. "
@@ -443,7 +584,7 @@ class DeliveryPreviewDialog(QDialog):
                 kecepatan_km_per_menit = 36 / 60
                 estimated_minutes_detour = current_length_km / kecepatan_km_per_menit
                 
-                reasons_str = self.desc_marker[0]
+                reasons_str = self._closure_reason()
                 analysis_str = (
                     f"Analisis:\n"
                     f"Jaringan sedang dalam simulasi {reasons_str}. "
@@ -484,6 +625,22 @@ class DeliveryPreviewDialog(QDialog):
         else:
             return None, None, None
 
+    def _alternative_routes(self, dest_name: str) -> list:
+        """
+        Rute depot -> tujuan yang beragam (terpendek + alternatif) pada kondisi saat ini,
+        dari AlternativeRouter (logic/graph/alternative_routes.py). List kosong jika
+        data routing belum tersedia.
+        """
+        data = getattr(self, '_routing', None)
+        router = data.alternative_router if data is not None else None
+        node = data.name_to_node.get(dest_name) if data is not None else None
+        if router is None or node is None:
+            return []
+        result = router.routes(data.depot_node, node, closure=self._closure)
+        if result["truncated"]:
+            print(f"[INFO] Pencarian rute alternatif dihentikan setelah {result['elapsed_ms']:.0f} ms")
+        return result["routes"]
+
     def _on_show_fastest_route(self):
         path_nodes, length_km, dest_name = self._compute_route()
         if not path_nodes:
@@ -494,47 +651,62 @@ class DeliveryPreviewDialog(QDialog):
             start_name="Depot Air Pusat",
             end_name=dest_name,
             length_km=length_km,
-            title=f"Rute Tercepat: Depot Air Pusat → {dest_name} ({length_km:.2f} km)"
+            title=f"Rute Tercepat: Depot Air Pusat → {dest_name} ({length_km:.2f} km)",
+            alternatives=self._alternative_routes(dest_name),
         )
         dlg.exec()
 
+    def _on_show_route_on_map(self):
+        """Kirim rute ke peta Leaflet di halaman Simulasi (hanya koordinat polyline)."""
+        from UI.seller.UI_sl_route_overlay import find_route_host
+        host = find_route_host(self)
+        if host is None:
+            QMessageBox.information(self, "Peta Tidak Tersedia", "Halaman peta (Simulasi) tidak ditemukan.")
+            return
+        path_nodes, length_km, dest_name = self._compute_route()
+        if not path_nodes:
+            return
+
+        from logic.graph.route_geometry import route_polyline, node_latlon
+        markers = []
+        start = node_latlon(self.G, path_nodes[0])
+        end = node_latlon(self.G, path_nodes[-1])
+        if start:
+            markers.append({"lat": start[0], "lon": start[1], "label": "Depot Air Pusat", "kind": "start"})
+        if end:
+            customer = self.order.get('customer_name') or '-'
+            markers.append({"lat": end[0], "lon": end[1], "label": f"{customer} ({dest_name})", "kind": "end"})
+
+        route = {
+            "id": f"order-{self.order.get('id', dest_name)}",
+            "coords": route_polyline(self.G, path_nodes),
+            "color": "#E53935",
+            "label": f"Depot Air Pusat → {dest_name} ({length_km:.2f} km)",
+            "markers": markers,
+        }
+        host.show_routes_on_map([route])
+        # Tutup preview agar peta bisa langsung diinteraksikan (status pesanan tidak berubah)
+        self.reject()
+
     def _on_show_nodes_timeline(self):
         path_nodes, _, dest_name = self._compute_route()
         if not path_nodes:
             return
-        dlg = NodeTimelineDialog(self.gdf_lokasi, self.G, path_nodes, title=f"Timeline Dijkstra: Depot Air Pusat → {dest_name}")
+        node_names = self._routing.node_to_name if self._routing is not None else None
+        dlg = NodeTimelineDialog(self.gdf_lokasi, self.G, path_nodes, title=f"Timeline Dijkstra: Depot Air Pusat → {dest_name}",
+                                 node_names=node_names)
         dlg.exec()
 
     def get_tingkat_kemacetan(self, waktu_kirim: datetime) -> float:
-        jam = waktu_kirim.time()
-
-        if time(0,0) <= jam < time(6,0):
-            return 0
-        elif time(6,0) <= jam < time(8,0):
-            return 1
-        elif time(8,0) <= jam < time(10,0):
-            return 0.5
-        elif time(10,0) <= jam < time(15,30):
-            return 0.2
-        elif time(15,30) <= jam < time(18,0):
-            return 0.8
-        elif time(18,0) <= jam < time(20,0):
-            return 0.2
-        else:
-            return 0
+        # Tabel jam -> kemacetan dibagi dengan isokron depot (logic/graph/isochrone.py)
+        from logic.graph.isochrone import tingkat_kemacetan
+        return tingkat_kemacetan(waktu_kirim)
 
     def get_max_speed_from_kemacetan(self, kemacetan: float) -> float:
-        if kemacetan == 0:
-            return 60
-        elif kemacetan == 0.2:
-            return 48
-        elif kemacetan == 0.5:
-            return 30
-        elif kemacetan == 0.8:
-            return 20
-        elif kemacetan == 1.0:
-            return 15
+        from logic.graph.isochrone import kecepatan_maks
+        return kecepatan_maks(kemacetan)
 
+    @traced("eta.simulate")
     def hitung_simulasi_kecepatan(self, jarak_km: float, waktu_kirim: datetime, jumlah_tikungan: int):
         kemacetan = self.get_tingkat_kemacetan(waktu_kirim)
         max_speed = self.get_max_speed_from_kemacetan(kemacetan)
@@ -575,14 +747,22 @@ class DeliveryPreviewDialog(QDialog):
 
 
 class RoutePreviewDialog(QDialog):
-    def __init__(self, g: nx.Graph, path_nodes: list, start_name: str = "START", end_name: str = "FINISH", length_km: float | None = None, title: str = "Rute Tercepat", customer_node_ids: list = None, parent=None):
+    """
+    Preview rute di atas basemap. Jika `alternatives` (hasil AlternativeRouter.routes)
+    berisi lebih dari satu rute, semuanya digambar sekali dan tombol di atas peta
+    hanya mengganti rute yang disorot (tanpa menghitung/menggambar ulang basemap).
+    """
+
+    def __init__(self, g: "nx.Graph", path_nodes: list, start_name: str = "START", end_name: str = "FINISH", length_km: float | None = None, title: str = "Rute Tercepat", customer_node_ids: list = None, parent=None, alternatives: list | None = None):
         super().__init__(parent)
         self.G = g
         self.path_nodes = path_nodes
         self.start_name = start_name
         self.end_name = end_name
         self.length_km = length_km
-        self.customer_node_ids = customer_node_ids
+        self.customer_node_ids = set(customer_node_ids or [])
+        self.alternatives = [alt for alt in (alternatives or []) if alt.get("nodes")]
+        self._alt_lines = []
         self.setWindowTitle("Rute Tercepat")
         self.resize(900, 650)
         layout = QVBoxLayout(self)
@@ -591,9 +771,12 @@ class RoutePreviewDialog(QDialog):
         lbl_title.setObjectName("SectionTitle")
         layout.addWidget(lbl_title)
 
+        if len(self.alternatives) > 1:
+            layout.addLayout(self._build_alternative_bar())
+            self.path_nodes = self.alternatives[0]["nodes"]
+
         # Figure & Canvas dalam ScrollArea
-        self.fig, self.ax = plt.subplots(figsize=(12, 9))
-        self.canvas = FigureCanvas(self.fig)
+        self.fig, self.ax, self.canvas = _figure_canvas(figsize=(12, 9))
         scroll = QScrollArea()
         container = QWidget()
         container_layout = QVBoxLayout(container)
@@ -611,8 +794,50 @@ class RoutePreviewDialog(QDialog):
 
         self._draw_route()
 
+    def _build_alternative_bar(self):
+        from UI.seller.UI_sl_route_overlay import route_color
+        bar = QHBoxLayout()
+        self._alt_group = QButtonGroup(self)
+        self._alt_group.setExclusive(True)
+        for i, alt in enumerate(self.alternatives):
+            if i == 0:
+                text = f"Rute {i + 1}: {alt['length_km']:.2f} km (terpendek)"
+            else:
+                text = f"Rute {i + 1}: {alt['length_km']:.2f} km (+{alt['extra_km']:.2f} km)"
+            btn = QPushButton(text)
+            btn.setCheckable(True)
+            btn.setChecked(i == 0)
+            btn.setStyleSheet(f"QPushButton:checked {{ border: 2px solid {route_color(i)}; font-weight: bold; }}")
+            self._alt_group.addButton(btn, i)
+            bar.addWidget(btn)
+        bar.addStretch()
+        self._alt_group.idClicked.connect(self._select_alternative)
+        return bar
+
+    def _select_alternative(self, index: int):
+        """Sorot rute ke-`index`; rute lain tetap tampil tipis sebagai pembanding."""
+        from UI.seller.UI_sl_route_overlay import route_color
+        for i, line in enumerate(self._alt_lines):
+            selected = i == index
+            line.set_color(route_color(i) if selected else 'gray')
+            line.set_linewidth(4 if selected else 2)
+            line.set_alpha(1.0 if selected else 0.6)
+            line.set_zorder(4 if selected else 3)
+        self.canvas.draw_idle()
+
+    def _route_xy(self, nodes):
+        """(xs, ys) rute mengikuti bentuk jalan; titik yang jaraknya < setengah piksel dibuang."""
+        from logic.graph.route_geometry import extent_tolerance_m, route_polyline
+        x0, x1 = self.ax.get_xlim()
+        y0, y1 = self.ax.get_ylim()
+        width_px = self.fig.get_figwidth() * self.fig.dpi
+        tolerance_m = extent_tolerance_m(abs(x1 - x0), (y0 + y1) / 2, width_px)
+        coords = route_polyline(self.G, nodes, tolerance_m=tolerance_m)
+        return [c[1] for c in coords], [c[0] for c in coords]
+
     def _draw_route(self):
-        self.ax.clear()
+        if self.ax.has_data():
+            self.ax.clear()
 
         if not self.path_nodes:
             self.ax.text(0.5, 0.5, "Rute tidak valid.", ha='center', va='center')
@@ -622,27 +847,26 @@ class RoutePreviewDialog(QDialog):
         print(f"DEBUG: Graph stats before plotting: Nodes={self.G.number_of_nodes()}, Edges={self.G.number_of_edges()}")
 
         try:
-            # --- STEP 1: Plot the base graph ONLY ---
-            # Use ox.plot_graph to draw all streets in light gray
-            print("DEBUG: Plotting base graph...")
-            ox.plot_graph(
-                self.G,
-                ax=self.ax,
-                node_size=0,           # Don't draw nodes here
-                edge_color='lightgray', # Color for all streets
-                edge_linewidth=0.8,     # Thickness for all streets
-                bgcolor='#FFFFFF',
-                show=False, close=False
-            )
-            print("DEBUG: Base graph plotted.")
+            from logic.graph.basemap import draw_basemap
 
-            # --- STEP 2: Plot the route ON TOP ---
-            # Use ox.plot_route_folium needs coords, let's use networkx draw
-            # Get coordinates for the route nodes
-            route_coords_x = [self.G.nodes[node_id]['x'] for node_id in self.path_nodes if node_id in self.G.nodes]
-            route_coords_y = [self.G.nodes[node_id]['y'] for node_id in self.path_nodes if node_id in self.G.nodes]
+            # --- STEP 1: Basemap semua jalan ---
+            # Segmen jalan di-cache per snapshot graf; di sini hanya ditambahkan
+            # sebagai satu LineCollection (jauh lebih cepat dari ox.plot_graph)
+            draw_basemap(self.ax, self.G, color='lightgray', linewidth=0.8, bgcolor='#FFFFFF')
 
-            if len(route_coords_x) >= 2: # Need at least two points to draw a line
+            # --- STEP 2: Plot the route ON TOP ---
+            # Polyline mengikuti geometri ruas, disederhanakan sesuai resolusi kanvas
+            route_coords_x, route_coords_y = self._route_xy(self.path_nodes)
+
+            if len(self.alternatives) > 1:
+                # Semua alternatif digambar sekali; pemilihan hanya mengubah gaya garis
+                self._alt_lines = []
+                for alt in self.alternatives:
+                    xs, ys = self._route_xy(alt["nodes"])
+                    line, = self.ax.plot(xs, ys, solid_capstyle='round')
+                    self._alt_lines.append(line)
+                self._select_alternative(0)
+            elif len(route_coords_x) >= 2: # Need at least two points to draw a line
                 print("DEBUG: Plotting route line...")
                 # Draw the route line using Matplotlib's plot function
                 self.ax.plot(
@@ -694,9 +918,11 @@ class RoutePreviewDialog(QDialog):
             
 
 class NodeTimelineDialog(QDialog):
-    def __init__(self, gdf_lokasi: gpd.GeoDataFrame, G, path_nodes: list, title: str = "Timeline Dijkstra", parent=None):
+    def __init__(self, gdf_lokasi: "gpd.GeoDataFrame", G, path_nodes: list, title: str = "Timeline Dijkstra", parent=None,
+                 node_names: dict | None = None):
         super().__init__(parent)
         self.gdf_lokasi = gdf_lokasi
+        self.node_names = node_names
         self.path_nodes = path_nodes
         self.G = G
         self.setWindowTitle("Timeline Dijkstra")
@@ -707,8 +933,7 @@ class NodeTimelineDialog(QDialog):
         lbl_title.setObjectName("SectionTitle")
         layout.addWidget(lbl_title)
 
-        self.fig, self.ax = plt.subplots(figsize=(12, 9))
-        self.canvas = FigureCanvas(self.fig)
+        self.fig, self.ax, self.canvas = _figure_canvas(figsize=(12, 9))
         scroll = QScrollArea()
         container = QWidget()
         container_layout = QVBoxLayout(container)
@@ -732,7 +957,11 @@ class NodeTimelineDialog(QDialog):
         print("Membuat visualisasi timeline rute yang fleksibel...")
 
         # --- Langkah 1: Siapkan Informasi Label Simpul ---
-        nama_simpul_map = self.gdf_lokasi.set_index('osmid')['intersection_name'].to_dict()
+        # Simpul graf routing -> nama (RoutingData.node_to_name); fallback: osmid di GeoJSON
+        if self.node_names:
+            nama_simpul_map = self.node_names
+        else:
+            nama_simpul_map = self.gdf_lokasi.set_index('osmid')['intersection_name'].to_dict()
         node_labels = {}
         for node_id in self.path_nodes:
             nama = nama_simpul_map.get(node_id, str(node_id))
@@ -761,6 +990,7 @@ class NodeTimelineDialog(QDialog):
             edge_labels[(u, v)] = panjang_km
 
         # --- Langkah 4: Buat Graf Rute dan Gambar ---
+        import networkx as nx
         G_rute = nx.path_graph(self.path_nodes)
         
         # Gambar simpul
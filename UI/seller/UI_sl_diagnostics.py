@@ -0,0 +1,158 @@
+"""
+UI_sl_diagnostics.py
+Panel Diagnostik (PyQt6): statistik span dari logic/tracing.py di dalam aplikasi.
+
+Dibuka dari dashboard seller dengan Ctrl+Shift+D. Berisi:
+- Tabel ringkasan per span: jumlah, p50/p95/p99, max, total (ms)
+- Pohon aksi terakhir: span akar terbaru beserta span anaknya, mis. klik "Kirim"
+  -> ui.deliv.populate -> graph.routing_data / route.dijkstra / eta.simulate
+- Tombol Refresh, Reset dan Export JSONL (ke folder logs/)
+"""
+
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QCheckBox, QSplitter,
+    QTableWidget, QTableWidgetItem, QTreeWidget, QTreeWidgetItem, QHeaderView, QMessageBox
+)
+
+from logic import tracing
+
+STAT_COLUMNS = (
+    ("Span", "name"), ("Count", "count"), ("p50 (ms)", "p50_ms"), ("p95 (ms)", "p95_ms"),
+    ("p99 (ms)", "p99_ms"), ("Max (ms)", "max_ms"), ("Total (ms)", "total_ms"),
+)
+RECENT_ROOTS = 25          # jumlah aksi (span akar) terakhir di pohon
+RECENT_EVENTS = 2000       # event yang dipindai untuk menyusun pohon
+REFRESH_MS = 1000
+
+
+class DiagnosticsDialog(QDialog):
+    """Dialog non-modal; aman dibiarkan terbuka sambil memakai aplikasi."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Diagnostik Performa")
+        self.resize(900, 620)
+        self.setModal(False)
+        self._build_ui()
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(REFRESH_MS)
+        self._timer.timeout.connect(self.refresh)
+        self.chk_auto.toggled.connect(self._on_auto_toggled)
+        self.chk_auto.setChecked(True)
+        self.refresh()
+
+    def _build_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(12, 12, 12, 12)
+
+        self.lbl_status = QLabel()
+        self.lbl_status.setStyleSheet("color:#2C5F6F;")
+        layout.addWidget(self.lbl_status)
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        self.table = QTableWidget(0, len(STAT_COLUMNS))
+        self.table.setHorizontalHeaderLabels([c[0] for c in STAT_COLUMNS])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setSortingEnabled(True)
+        splitter.addWidget(self.table)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Aksi / span", "Durasi (ms)", "Atribut"])
+        self.tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        splitter.addWidget(self.tree)
+        layout.addWidget(splitter, 1)
+
+        btn_row = QHBoxLayout()
+        self.chk_auto = QCheckBox("Refresh otomatis")
+        self.btn_refresh = QPushButton("Refresh")
+        self.btn_reset = QPushButton("Reset")
+        self.btn_export = QPushButton("Export JSONL")
+        self.btn_close = QPushButton("Tutup")
+        btn_row.addWidget(self.chk_auto)
+        btn_row.addStretch(1)
+        for btn in (self.btn_refresh, self.btn_reset, self.btn_export, self.btn_close):
+            btn_row.addWidget(btn)
+        layout.addLayout(btn_row)
+
+        self.btn_refresh.clicked.connect(self.refresh)
+        self.btn_reset.clicked.connect(self._on_reset)
+        self.btn_export.clicked.connect(self._on_export)
+        self.btn_close.clicked.connect(self.close)
+
+    def _on_auto_toggled(self, checked: bool):
+        if checked:
+            self._timer.start()
+        else:
+            self._timer.stop()
+
+    def refresh(self):
+        stats = tracing.get_stats()
+        self._fill_table(stats)
+        self._fill_tree(tracing.recent_events(RECENT_EVENTS))
+        state = "aktif" if tracing.is_enabled() else "nonaktif (AQUA_TRACE=0)"
+        self.lbl_status.setText(f"Tracing {state} — {len(stats)} jenis span")
+
+    def _fill_table(self, stats):
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(stats))
+        for row, rec in enumerate(stats):
+            for col, (_, key) in enumerate(STAT_COLUMNS):
+                value = rec[key]
+                item = QTableWidgetItem()
+                if isinstance(value, (int, float)):
+                    item.setData(Qt.ItemDataRole.DisplayRole, value)
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                else:
+                    item.setText(str(value))
+                self.table.setItem(row, col, item)
+        self.table.setSortingEnabled(True)
+
+    def _fill_tree(self, events):
+        by_id = {e["id"]: e for e in events}
+        children = {}
+        roots = []
+        for e in events:
+            if e.get("parent") in by_id:
+                children.setdefault(e["parent"], []).append(e)
+            else:
+                roots.append(e)
+
+        def make_item(event):
+            attrs = event.get("attrs") or {}
+            attr_text = ", ".join(f"{k}={v}" for k, v in attrs.items())
+            if event.get("error"):
+                attr_text = f"ERROR {event['error']} " + attr_text
+            item = QTreeWidgetItem([event["name"], f"{event['dur_ms']:.1f}", attr_text])
+            item.setTextAlignment(1, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+            # Anak selesai lebih dulu dari induknya; urutkan menurut waktu mulai
+            for child in sorted(children.get(event["id"], []), key=lambda c: c["ts"]):
+                item.addChild(make_item(child))
+            return item
+
+        self.tree.clear()
+        for event in reversed(roots[-RECENT_ROOTS:]):
+            self.tree.addTopLevelItem(make_item(event))
+
+    def _on_reset(self):
+        tracing.reset()
+        self.refresh()
+
+    def _on_export(self):
+        try:
+            path = tracing.export_jsonl()
+        except OSError as e:
+            QMessageBox.warning(self, "Export Gagal", f"Gagal menulis file trace: {e}")
+            return
+        QMessageBox.information(self, "Export Berhasil", f"Trace disimpan ke:\n{path}")
+
+    def closeEvent(self, event):
+        self._timer.stop()
+        super().closeEvent(event)
+
+    def showEvent(self, event):
+        if self.chk_auto.isChecked():
+            self._timer.start()
+        super().showEvent(event)
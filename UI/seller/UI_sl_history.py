@@ -12,6 +12,8 @@ from PyQt6.QtWidgets import (
 )
 import os, json, datetime
 
+from logic.tracing import traced
+
 def _db_path(filename: str) -> str:
     base = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
     return os.path.join(base, 'Database', filename)
@@ -244,6 +246,7 @@ class CustomerHistory(QWidget):
             """
         )
 
+    @traced("ui.sl_history.reload_history")
     def reload_history(self):
         """Muat ulang record history (hanya diterima/ditolak/selesai), backfill timestamps, render."""
         records = _load_history_customer()
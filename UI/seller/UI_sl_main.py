@@ -16,7 +16,7 @@ from PyQt6.QtWidgets import (
     QSpacerItem, QGraphicsDropShadowEffect
 )
 from PyQt6.QtCore import Qt, pyqtSignal, QPropertyAnimation, QEasingCurve, QRect, QPoint, QTimer
-from PyQt6.QtGui import QFont, QPixmap, QPainter, QColor, QIcon
+from PyQt6.QtGui import QFont, QPixmap, QPainter, QColor, QIcon, QShortcut, QKeySequence
 
 try:
     from .UI_sl_dashboard import CustomerDashboard as SellerDashboard
@@ -423,10 +423,23 @@ class SellerMainWindow(QMainWindow):
         self.current_user = current_user or {}
         self.sidebar_visible = False
         self.marker_deleted = []
+        self.edge_deleted = []  # ruas jalan ditutup (mode Edge di Simulasi): [(u, v), ...]
         self.desc_marker = []
+        self._diagnostics_dialog = None
         self.init_ui()
         self.setup_animations()
-    
+        # Panel diagnostik performa (span tracing), tersembunyi di balik shortcut
+        QShortcut(QKeySequence("Ctrl+Shift+D"), self, activated=self.show_diagnostics)
+    
+    def show_diagnostics(self):
+        """Buka (atau munculkan kembali) panel Diagnostik Performa."""
+        if self._diagnostics_dialog is None:
+            from UI.seller.UI_sl_diagnostics import DiagnosticsDialog
+            self._diagnostics_dialog = DiagnosticsDialog(self)
+        self._diagnostics_dialog.show()
+        self._diagnostics_dialog.raise_()
+        self._diagnostics_dialog.activateWindow()
+
     def init_ui(self):
         """Initialize main UI"""
         self.setWindowTitle("AquaGalon - Seller Dashboard")
@@ -484,8 +497,8 @@ class SellerMainWindow(QMainWindow):
         # Initialize pages
         self.dashboard_page = SellerDashboard(current_user=self.current_user)
         self.history_page = SellerHistory(current_user=self.current_user)
-        self.simulation_page = SellerSimulation(current_user=self.current_user, marker_deleted=self.marker_deleted, desc_marker=self.desc_marker)
-        self.order_page = SellerDeliveryPage(current_user=self.current_user, marker_deleted=self.marker_deleted, desc_marker=self.desc_marker)  # Halaman Pengantaran
+        self.simulation_page = SellerSimulation(current_user=self.current_user, marker_deleted=self.marker_deleted, desc_marker=self.desc_marker, edge_deleted=self.edge_deleted)
+        self.order_page = SellerDeliveryPage(current_user=self.current_user, marker_deleted=self.marker_deleted, desc_marker=self.desc_marker, edge_deleted=self.edge_deleted)  # Halaman Pengantaran
         self.profile_page = SellerProfile(current_user=self.current_user)
         
         # Add pages to stack
@@ -614,7 +627,7 @@ class SellerMainWindow(QMainWindow):
         # 0=Dashboard, 1=Pengantaran, 2=Profil
         if index == 1:
             if self.order_page is None:
-                self.order_page = SellerDeliveryPage(current_user=self.current_user, marker_deleted=self.marker_deleted)
+                self.order_page = SellerDeliveryPage(current_user=self.current_user, marker_deleted=self.marker_deleted, edge_deleted=self.edge_deleted)
                 self.content_stack.addWidget(self.order_page)
             target_idx = self.content_stack.indexOf(self.order_page)
             self.content_stack.setCurrentIndex(target_idx)
@@ -699,6 +712,11 @@ class SellerMainWindow(QMainWindow):
         self.simulation_page.load_map_if_needed()
         self.bottom_nav.hide()
         self.sidebar.set_active("simulation")
+
+    def show_routes_on_map(self, routes: list, replace: bool = True):
+        """Pindah ke halaman Simulasi lalu tampilkan rute (lihat SellerSimulation.show_routes)"""
+        self.show_simulation()
+        self.simulation_page.show_routes(routes, replace=replace)
     
     def show_profile(self):
         """Show profile page"""
@@ -0,0 +1,97 @@
+"""
+UI_sl_map_scheme.py
+URL scheme lokal `aquamap://` untuk halaman peta tiled (logic/graph/map_tiles.py).
+
+Halaman peta mengambil tile z/x/y lewat fetch(); dari file:// hal itu diblokir
+Chromium, jadi tile dilayani oleh QWebEngineUrlSchemeHandler langsung dari disk.
+
+Komponen:
+- register_map_scheme(): daftarkan scheme (WAJIB sebelum QApplication dibuat)
+- MapTileSchemeHandler: layani aquamap://map/<path> dari folder tile
+- install_map_scheme_handler(profile, root_dir): pasang handler ke profil QWebEngine
+- tiled_map_url(): URL halaman peta tiled
+"""
+
+import mimetypes
+import os
+
+from PyQt6.QtCore import QBuffer, QByteArray, QIODevice, QUrl
+from PyQt6.QtWebEngineCore import QWebEngineUrlRequestJob, QWebEngineUrlScheme, QWebEngineUrlSchemeHandler
+
+SCHEME_NAME = b"aquamap"
+MAP_HOST = "map"
+
+_handlers = {}  # id(profile) -> handler (referensi harus tetap hidup)
+
+
+def register_map_scheme() -> None:
+    """Daftarkan scheme `aquamap`. Harus dipanggil sebelum QApplication dibuat."""
+    if QWebEngineUrlScheme.schemeByName(SCHEME_NAME).name() == SCHEME_NAME:
+        return
+    scheme = QWebEngineUrlScheme(SCHEME_NAME)
+    scheme.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+    flags = (QWebEngineUrlScheme.Flag.SecureScheme
+             | QWebEngineUrlScheme.Flag.LocalScheme
+             | QWebEngineUrlScheme.Flag.LocalAccessAllowed
+             | QWebEngineUrlScheme.Flag.CorsEnabled)
+    # FetchApiAllowed baru ada di Qt 6.6
+    fetch_flag = getattr(QWebEngineUrlScheme.Flag, "FetchApiAllowed", None)
+    if fetch_flag is not None:
+        flags |= fetch_flag
+    scheme.setFlags(flags)
+    QWebEngineUrlScheme.registerScheme(scheme)
+
+
+class MapTileSchemeHandler(QWebEngineUrlSchemeHandler):
+    """Layani aquamap://map/<path> dari `root_dir` (index.html, index.json, z/x/y.json)."""
+
+    def __init__(self, root_dir: str, parent=None):
+        super().__init__(parent)
+        self.root_dir = os.path.abspath(root_dir)
+
+    def _resolve(self, url: QUrl):
+        rel = url.path().lstrip("/") or "index.html"
+        full = os.path.normpath(os.path.join(self.root_dir, rel))
+        # Tolak path yang keluar dari folder tile (mis. ../../config.yaml)
+        if os.path.commonpath([full, self.root_dir]) != self.root_dir:
+            return None
+        return full if os.path.isfile(full) else None
+
+    def requestStarted(self, job: QWebEngineUrlRequestJob):
+        url = job.requestUrl()
+        path = self._resolve(url) if url.host() == MAP_HOST else None
+        if path is None:
+            job.fail(QWebEngineUrlRequestJob.Error.UrlNotFound)
+            return
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            print(f"[WARN] Gagal membaca {path}: {e}")
+            job.fail(QWebEngineUrlRequestJob.Error.RequestFailed)
+            return
+
+        mime = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        buf = QBuffer(job)  # ikut terhapus bersama job
+        buf.setData(QByteArray(data))
+        buf.open(QIODevice.OpenModeFlag.ReadOnly)
+        job.reply(mime.encode(), buf)
+
+
+def install_map_scheme_handler(profile, root_dir: str):
+    """Pasang handler ke profil (sekali per profil). Mengembalikan handler atau None."""
+    handler = _handlers.get(id(profile))
+    if handler is not None:
+        return handler
+    try:
+        handler = MapTileSchemeHandler(root_dir, profile)
+        profile.installUrlSchemeHandler(SCHEME_NAME, handler)
+    except Exception as e:
+        print(f"[WARN] Scheme {SCHEME_NAME.decode()} tidak bisa dipasang: {e}")
+        return None
+    _handlers[id(profile)] = handler
+    return handler
+
+
+def tiled_map_url() -> QUrl:
+    return QUrl(f"{SCHEME_NAME.decode()}://{MAP_HOST}/index.html")
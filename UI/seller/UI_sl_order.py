@@ -14,11 +14,13 @@ from PyQt6.QtWidgets import (
 )
 import os, json, datetime
 
+from logic.tracing import span, traced
+
 try:
     # Import fungsi logic untuk load/save data pesanan
+    # (Dialog preview pengiriman/orderan diimpor saat dibuka saja, karena
+    # keduanya menarik stack peta & plotting yang berat.)
     from logic.file.order_logic import load_orders, save_orders
-    from UI.seller.UI_sl_deliv import DeliveryPreviewDialog
-    from UI.seller.UI_sl_Gcoloring import OrderPreviewDialog
 except Exception:
     # Fallback jika modul belum tersedia saat dev
     def load_orders():
@@ -65,11 +67,12 @@ def _append_json_list(file_path: str, record: dict) -> bool:
 class OrderCard(QFrame):
     """Widget kartu pesanan satu baris."""
 
-    def __init__(self, order: dict, parent=None, marker_deleted=None, desc_marker=None):
+    def __init__(self, order: dict, parent=None, marker_deleted=None, desc_marker=None, edge_deleted=None):
         super().__init__(parent)
         self.order = order
         self.marker_deleted = marker_deleted
         self.desc_marker = desc_marker
+        self.edge_deleted = edge_deleted
         self.setObjectName("OrderCard")
         self.setFrameShape(QFrame.Shape.NoFrame)
         self._build_ui()
@@ -157,6 +160,7 @@ class OrderCard(QFrame):
             """
         )
 
+    @traced("ui.sl_order.update_status")
     def _update_order_status(self, new_status: str):
         """Update status order di order_data.json lalu refresh tampilan."""
         order_id = self.order.get("id")
@@ -189,7 +193,11 @@ class OrderCard(QFrame):
         """Set status menjadi 'dalam_perjalanan' (dalam pengantaran)."""
         # Tampilkan dialog preview terlebih dahulu
         try:
-            dlg = DeliveryPreviewDialog(self.order, marker_deleted=self.marker_deleted, parent=self, desc_marker=self.desc_marker)
+            from UI.seller.UI_sl_deliv import DeliveryPreviewDialog
+            # Waktu klik "Kirim" sampai dialog siap (routing + ETA + render), tanpa waktu tunggu user
+            with span("ui.order.open_delivery_preview", order=self.order.get("id")):
+                dlg = DeliveryPreviewDialog(self.order, marker_deleted=self.marker_deleted, parent=self,
+                                            desc_marker=self.desc_marker, edge_deleted=self.edge_deleted)
             res = dlg.exec()
             if res == QDialog.DialogCode.Accepted:
                 self._update_order_status("dalam_perjalanan")
@@ -355,12 +363,14 @@ class OrderCard(QFrame):
 class SellerDeliveryPage(QWidget):
     """Halaman Pengantaran seller: menampilkan list kartu pesanan terpilih."""
 
-    def __init__(self, parent=None, current_user: dict | None = None, marker_deleted=None, desc_marker=None):
+    def __init__(self, parent=None, current_user: dict | None = None, marker_deleted=None, desc_marker=None,
+                 edge_deleted=None):
         super().__init__(parent)
         self._orders = []
         self.current_user = current_user or {}
         self.marker_deleted=marker_deleted
         self.desc_marker = desc_marker
+        self.edge_deleted = edge_deleted
         self._build_ui()
         self.reload_orders()
 
@@ -420,6 +430,7 @@ class SellerDeliveryPage(QWidget):
         except Exception:
             pass
 
+    @traced("ui.sl_order.reload_orders")
     def reload_orders(self):
         """Muat ulang data pesanan dan tampilkan hanya status tertentu untuk pengantaran."""
         all_orders = load_orders() or []
@@ -434,7 +445,8 @@ class SellerDeliveryPage(QWidget):
 
         # Tambah kartu untuk tiap order
         for order in self._orders:
-            self.container_layout.addWidget(OrderCard(order, marker_deleted=self.marker_deleted, desc_marker=self.desc_marker))
+            self.container_layout.addWidget(OrderCard(order, marker_deleted=self.marker_deleted,
+                                                      desc_marker=self.desc_marker, edge_deleted=self.edge_deleted))
 
         # Tambah spacer agar list tidak terlalu rapat bawah
         self.container_layout.addStretch(1)
@@ -446,6 +458,7 @@ class SellerDeliveryPage(QWidget):
 
     def _on_open_order_preview_dialog(self):
         try:
+            from UI.seller.UI_sl_Gcoloring import OrderPreviewDialog
             dlg = OrderPreviewDialog(self)
             dlg.exec()
         except Exception:
@@ -0,0 +1,75 @@
+"""
+UI_sl_prefetch.py
+Prefetch data routing di background setelah seller login.
+
+Memuat snapshot graf peta, indeks nama -> simpul, tabel jarak dari depot
+(logic.graph.map_cache) dan segmen basemap preview rute di worker thread selagi
+dashboard dirender, sehingga klik "Kirim" pertama di SellerDeliveryPage langsung
+memakai data yang sudah hangat. Poligon isokron depot dan tabel ongkir dibangun
+ulang di thread yang sama jika belum ada atau dicap dengan versi graf lain.
+Kesiapan diumumkan lewat sinyal `ready(bool)` (dikirim di thread GUI).
+"""
+
+import os
+import threading
+import time
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+def _project_root() -> str:
+    return os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+
+# (path GeoJSON, nama depot) yang dipakai dialog pengiriman seller
+PREFETCH_TARGETS = [
+    (os.path.join(_project_root(), 'logic', 'graph', 'intersections_area.geojson'), "Depot Air Pusat"),
+]
+
+
+class RoutingPrefetcher(QObject):
+    """Menghangatkan cache routing di thread terpisah (sekali per proses)."""
+
+    ready = pyqtSignal(bool)
+
+    def __init__(self, targets=None, parent=None):
+        super().__init__(parent)
+        self.targets = list(targets or PREFETCH_TARGETS)
+        self._thread = None
+        self.is_ready = False
+
+    def start(self):
+        """Mulai prefetch; panggilan berikutnya diabaikan selama thread masih jalan."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="routing-prefetch", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        ok = True
+        t0 = time.perf_counter()
+        try:
+            from logic.graph.map_cache import get_routing_data
+            from logic.graph.basemap import get_basemap_segments
+            for path_geojson, depot_name in self.targets:
+                data = get_routing_data(path_geojson, depot_name=depot_name)
+                if data is None:
+                    ok = False
+                    continue
+                # Segmen basemap untuk preview rute ikut disiapkan
+                get_basemap_segments(data.G)
+            # Poligon isokron depot (dipakai dialog pemesanan pelanggan) & tabel ongkir jarak
+            # jalan (lookup pelanggan) dibangun ulang jika belum ada atau graf sudah berubah
+            from logic.graph.isochrone import DEFAULT_ISOCHRONES, isochrones_stale, write_isochrones
+            if isochrones_stale(DEFAULT_ISOCHRONES):
+                write_isochrones(DEFAULT_ISOCHRONES)
+            from logic.graph.ongkir import DEFAULT_ONGKIR_TABLE, ongkir_table_stale, write_ongkir_table
+            if ongkir_table_stale(DEFAULT_ONGKIR_TABLE):
+                write_ongkir_table(DEFAULT_ONGKIR_TABLE)
+        except Exception as e:
+            print(f"[ERROR] Prefetch data routing gagal: {e}")
+            ok = False
+        self.is_ready = ok
+        print(f"[OK] Prefetch data routing selesai dalam {time.perf_counter() - t0:.2f} detik (ok={ok})")
+        # Sinyal dari thread lain otomatis di-queue ke thread GUI
+        self.ready.emit(ok)
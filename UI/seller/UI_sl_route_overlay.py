@@ -0,0 +1,234 @@
+"""
+UI_sl_route_overlay.py
+Overlay rute interaktif di atas peta Leaflet (road_map_detailed.html) yang sudah
+termuat di QWebEngineView halaman Simulasi.
+
+Python hanya mengirim polyline rute (sudah disederhanakan, lihat
+route_geometry.route_polyline, lalu di-encode format Google polyline) + marker
+pelanggan lewat runJavaScript; basemap tidak dirender ulang. Beberapa rute (mis. satu per grup warna hasil
+graph coloring) bisa tampil bersamaan dan di-toggle satu per satu.
+
+Komponen:
+- ROUTE_OVERLAY_JS: API `window.aquaRoutes` (show/setVisible/remove/clear/fitAll)
+- RouteOverlay: jembatan Python -> JS; menyimpan rute & mengirim ulang saat halaman dimuat ulang
+- ROUTE_COLORS / route_color(i): palet warna rute per grup
+- find_route_host(widget): cari SellerMainWindow dari rantai parent sebuah widget
+"""
+
+import json
+
+ROUTE_COLORS = [
+    "#E53935", "#1E88E5", "#43A047", "#FB8C00", "#8E24AA",
+    "#00ACC1", "#6D4C41", "#D81B60", "#3949AB", "#7CB342",
+]
+
+
+def route_color(index: int) -> str:
+    return ROUTE_COLORS[index % len(ROUTE_COLORS)]
+
+
+# API JS yang di-inject setelah halaman peta selesai dimuat
+ROUTE_OVERLAY_JS = r"""
+(function () {
+    if (window.aquaRoutes) { return; }
+
+    var MARKER_STYLES = {
+        start:    {radius: 9, color: '#1B5E20', fillColor: '#66BB6A', fillOpacity: 1, weight: 2},
+        end:      {radius: 9, color: '#B71C1C', fillColor: '#EF5350', fillOpacity: 1, weight: 2},
+        customer: {radius: 7, color: '#E65100', fillColor: '#FFB74D', fillOpacity: 1, weight: 2}
+    };
+
+    function findMap() {
+        for (var key in window) {
+            try {
+                var val = window[key];
+                if (val && window.L && val instanceof L.Map) { return val; }
+            } catch (e) { /* properti window yang tidak bisa diakses */ }
+        }
+        return null;
+    }
+
+    // Google encoded polyline (presisi 1e-5) -> [[lat, lon], ...]
+    function decodePolyline(str) {
+        var coords = [], index = 0, lat = 0, lng = 0;
+        while (index < str.length) {
+            var deltas = [];
+            for (var n = 0; n < 2; n++) {
+                var result = 0, shift = 0, b;
+                do {
+                    b = str.charCodeAt(index++) - 63;
+                    result |= (b & 0x1f) << shift;
+                    shift += 5;
+                } while (b >= 0x20);
+                deltas.push((result & 1) ? ~(result >> 1) : (result >> 1));
+            }
+            lat += deltas[0];
+            lng += deltas[1];
+            coords.push([lat / 1e5, lng / 1e5]);
+        }
+        return coords;
+    }
+
+    var routes = {};
+    var api = {
+        map: null,
+
+        _getMap: function () {
+            if (!this.map) {
+                this.map = findMap();
+                if (this.map && !this.map.getPane('aquaRoutes')) {
+                    // Pane khusus agar rute selalu di atas layer jalan
+                    this.map.createPane('aquaRoutes');
+                    this.map.getPane('aquaRoutes').style.zIndex = 450;
+                }
+            }
+            return this.map;
+        },
+
+        show: function (id, spec) {
+            var map = this._getMap();
+            var coords = spec && (spec.coords || (spec.polyline ? decodePolyline(spec.polyline) : null));
+            if (!map || !coords || coords.length < 2) { return false; }
+            this.remove(id);
+            var group = L.featureGroup();
+            L.polyline(coords, {
+                pane: 'aquaRoutes',
+                color: spec.color || '#E53935',
+                weight: spec.weight || 5,
+                opacity: 0.85
+            }).bindTooltip(spec.label || id, {sticky: true}).addTo(group);
+
+            (spec.markers || []).forEach(function (m) {
+                var style = MARKER_STYLES[m.kind] || MARKER_STYLES.customer;
+                var opts = {pane: 'aquaRoutes'};
+                for (var k in style) { opts[k] = style[k]; }
+                L.circleMarker([m.lat, m.lon], opts).bindTooltip(m.label || '').addTo(group);
+            });
+
+            routes[id] = {group: group, visible: spec.visible !== false};
+            if (routes[id].visible) { group.addTo(map); }
+            if (spec.fit) { map.fitBounds(group.getBounds(), {padding: [24, 24]}); }
+            return true;
+        },
+
+        setVisible: function (id, visible) {
+            var map = this._getMap();
+            var r = routes[id];
+            if (!map || !r) { return false; }
+            if (visible && !r.visible) { r.group.addTo(map); }
+            if (!visible && r.visible) { map.removeLayer(r.group); }
+            r.visible = !!visible;
+            return true;
+        },
+
+        remove: function (id) {
+            var r = routes[id];
+            if (!r) { return false; }
+            if (this.map) { this.map.removeLayer(r.group); }
+            delete routes[id];
+            return true;
+        },
+
+        clear: function () {
+            for (var id in routes) { this.remove(id); }
+        },
+
+        fitAll: function () {
+            var map = this._getMap();
+            var bounds = null;
+            for (var id in routes) {
+                if (!routes[id].visible) { continue; }
+                var b = routes[id].group.getBounds();
+                bounds = bounds ? bounds.extend(b) : L.latLngBounds(b.getSouthWest(), b.getNorthEast());
+            }
+            if (map && bounds) { map.fitBounds(bounds, {padding: [24, 24]}); }
+        },
+
+        ids: function () { return Object.keys(routes); }
+    };
+
+    window.aquaRoutes = api;
+})();
+"""
+
+
+class RouteOverlay:
+    """
+    Jembatan Python -> `window.aquaRoutes`.
+
+    Rute disimpan di sisi Python (id -> spec) sehingga:
+    - rute yang dikirim sebelum halaman selesai dimuat tetap tampil setelah load;
+    - setelah peta dimuat ulang (Reset), semua rute otomatis dikirim ulang.
+    """
+
+    def __init__(self, web_view):
+        self.web_view = web_view
+        self.ready = False
+        self.routes = {}  # id -> spec (urut sesuai penambahan)
+
+    def on_load_finished(self, ok: bool):
+        """Panggil dari slot loadFinished QWebEngineView."""
+        self.ready = bool(ok)
+        if not self.ready:
+            return
+        self._run(ROUTE_OVERLAY_JS)
+        for route_id, spec in self.routes.items():
+            self._run(f"aquaRoutes.show({json.dumps(route_id)}, {json.dumps(spec)});")
+        if self.routes:
+            self.fit_all()
+
+    def on_load_started(self):
+        self.ready = False
+
+    def _run(self, js: str):
+        if self.ready:
+            self.web_view.page().runJavaScript(js)
+
+    def show_route(self, route_id: str, coords: list, color: str = "#E53935", label: str = "",
+                   markers: list | None = None, fit: bool = False, visible: bool = True):
+        """
+        Tampilkan/ganti rute.
+        coords: [[lat, lon], ...]; markers: [{"lat", "lon", "label", "kind": start|end|customer}]
+        Koordinat dikirim sebagai encoded polyline (jauh lebih kecil dari array JSON).
+        """
+        from logic.graph.route_geometry import encode_polyline
+
+        spec = {
+            "polyline": encode_polyline(coords),
+            "color": color,
+            "label": label or route_id,
+            "markers": markers or [],
+            "visible": visible,
+        }
+        self.routes[route_id] = spec
+        run_spec = dict(spec, fit=fit)
+        self._run(f"aquaRoutes.show({json.dumps(route_id)}, {json.dumps(run_spec)});")
+
+    def set_route_visible(self, route_id: str, visible: bool):
+        if route_id in self.routes:
+            self.routes[route_id]["visible"] = bool(visible)
+        self._run(f"aquaRoutes.setVisible({json.dumps(route_id)}, {json.dumps(bool(visible))});")
+
+    def remove_route(self, route_id: str):
+        self.routes.pop(route_id, None)
+        self._run(f"aquaRoutes.remove({json.dumps(route_id)});")
+
+    def clear(self):
+        self.routes.clear()
+        self._run("aquaRoutes.clear();")
+
+    def fit_all(self):
+        self._run("aquaRoutes.fitAll();")
+
+
+def find_route_host(widget):
+    """
+    Naik ke rantai parent sampai menemukan window yang punya `show_routes_on_map`
+    (SellerMainWindow). Mengembalikan None jika tidak ada (mis. dialog berdiri sendiri).
+    """
+    w = widget
+    while w is not None:
+        if hasattr(w, "show_routes_on_map"):
+            return w
+        w = w.parent()
+    return None
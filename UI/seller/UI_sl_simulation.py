@@ -2,30 +2,73 @@
 UI_sl_simulation.py
 Halaman Simulasi (PyQt6) – menampilkan peta dan kontrol untuk memanipulasi node/edge.
 Menggunakan pendekatan baru: Python hanya mengirim koordinat node.
+
+Mode "Edge": ruas jalan dipilih dengan klik di peta (JS -> simBridge.roadClicked),
+dipetakan ke ruas graf routing (RoutingData.road_segment_at) lalu disimpan di
+daftar bersama `edge_deleted` sebagai pasangan simpul (u, v). Dialog pengiriman
+memakai daftar itu sebagai mask penutupan sisi pada SPT depot (tanpa copy graf).
+Klik tidak pernah memuat data routing di thread GUI: selama prefetch belum selesai
+label menampilkan status memuat, dan klik terakhir diproses begitu data siap.
 """
 
 import os
 import json
-from PyQt6.QtCore import Qt, QUrl, pyqtSlot, QObject
+import threading
+from PyQt6.QtCore import Qt, QUrl, QTimer, pyqtSlot, pyqtSignal, QObject
+from PyQt6.QtGui import QColor
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QScrollArea, QFrame,
-    QComboBox, QPushButton, QSizePolicy, QSpacerItem, QLineEdit, QMessageBox
+    QComboBox, QPushButton, QSizePolicy, QSpacerItem, QLineEdit, QMessageBox,
+    QListWidget, QListWidgetItem
 )
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 from PyQt6.QtWebEngineCore import QWebEngineSettings
 from PyQt6.QtWebChannel import QWebChannel
 
+from UI.seller.UI_sl_route_overlay import RouteOverlay
+from UI.seller.UI_sl_map_scheme import install_map_scheme_handler, tiled_map_url
+from logic.graph.location_catalog import get_location_catalog
+from logic.graph.marker_store import get_marker_store
+from UI.common.UI_street_search import attach_street_search
+
+ROAD_HINT = "Klik ruas jalan di peta untuk memilihnya."
+ROUTING_POLL_MS = 250  # cek kesiapan data routing selama klik ruas menunggu
+
+class SimulationBridge(QObject):
+    """Objek QWebChannel `simBridge`: peta mengirim ruas jalan yang diklik (mode Edge)."""
+
+    road_clicked = pyqtSignal(dict)
+
+    @pyqtSlot(str)
+    def roadClicked(self, payload: str):
+        try:
+            data = json.loads(payload)
+        except json.JSONDecodeError:
+            return
+        if isinstance(data, dict):
+            self.road_clicked.emit(data)
+
+
 class SellerSimulation(QWidget):
-    def __init__(self, parent=None, current_user: dict | None = None, marker_deleted=None, desc_marker=None):
+    def __init__(self, parent=None, current_user: dict | None = None, marker_deleted=None, desc_marker=None,
+                 edge_deleted=None):
         super().__init__(parent)
         self.current_user = current_user or {}
         self.map_loaded = False
         self.desc_marker = desc_marker
 
         self.marker_deleted = marker_deleted
+        # Ruas yang ditutup: [(u, v), ...] simpul graf routing; dibagi dengan halaman Pengantaran
+        self.edge_deleted = edge_deleted if edge_deleted is not None else []
+        self._selected_road = None
+        self._pending_road = None  # klik ruas yang menunggu data routing siap
+        self._routing_wait = QTimer(self)
+        self._routing_wait.setInterval(ROUTING_POLL_MS)
+        self._routing_wait.timeout.connect(self._check_routing_ready)
+        self._routing_loader = None
 
         # --- Data Stores ---
-        self._all_nodes_data = [] # Dari intersections_area.geojson
+        self._locations = None # LocationCatalog dari output.geojson
         # self._all_roads_data TIDAK DIPERLUKAN LAGI
         self.region_to_nodes_map = {} 
         self.regions = []
@@ -33,8 +76,14 @@ class SellerSimulation(QWidget):
         # --- Setup Web View ---
         self.web_view = QWebEngineView()
         self.channel = QWebChannel()
+        self.sim_bridge = SimulationBridge(self)
+        self.channel.registerObject("simBridge", self.sim_bridge)
         self.web_view.page().setWebChannel(self.channel)
         self.web_view.loadFinished.connect(self.on_load_finished)
+        self.web_view.loadStarted.connect(self._on_load_started)
+
+        # Overlay rute (polyline per grup) di atas peta yang sudah termuat
+        self.route_overlay = RouteOverlay(self.web_view)
 
         # --- Inisialisasi UI dan Data ---
         self._init_ui()
@@ -45,6 +94,12 @@ class SellerSimulation(QWidget):
         self.cmb_region.currentIndexChanged.connect(self._on_region_changed)
         self.btn_cut.clicked.connect(self.on_cut_clicked)
         self.btn_reset.clicked.connect(self.on_reset_clicked)
+        self.list_routes.itemChanged.connect(self._on_route_item_changed)
+        self.btn_clear_routes.clicked.connect(self.clear_routes)
+        self.cmb_mode.currentTextChanged.connect(self._on_mode_changed)
+        self.sim_bridge.road_clicked.connect(self._on_road_clicked)
+        # Cari node dari semua daerah; daerah ikut berganti saat nama dipilih
+        self._street_search = attach_street_search(self.cmb_street, select_region=self._select_region)
 
     def set_current_user(self, user: dict | None):
         self.current_user = user or {}
@@ -64,11 +119,22 @@ class SellerSimulation(QWidget):
         input_box = QFrame(); input_box.setObjectName("InputBox")
         input_layout = QVBoxLayout(input_box); input_layout.setContentsMargins(16, 16, 16, 16); input_layout.setSpacing(12)
         row_mode = QHBoxLayout(); lbl_mode = QLabel("Mode"); lbl_mode.setObjectName("FieldLabel"); self.cmb_mode = QComboBox(); self.cmb_mode.setObjectName("Combo"); self.cmb_mode.addItems(["Node", "Edge"]); row_mode.addWidget(lbl_mode); row_mode.addWidget(self.cmb_mode); input_layout.addLayout(row_mode)
-        row_region = QHBoxLayout(); lbl_region = QLabel("Daerah"); lbl_region.setObjectName("FieldLabel"); self.cmb_region = QComboBox(); self.cmb_region.setObjectName("Combo"); row_region.addWidget(lbl_region); row_region.addWidget(self.cmb_region); input_layout.addLayout(row_region)
-        row_street = QHBoxLayout(); lbl_street = QLabel("Nama Node"); lbl_street.setObjectName("FieldLabel"); self.cmb_street = QComboBox(); self.cmb_street.setObjectName("Combo"); self.cmb_street.setEditable(False); self.cmb_street.setMinimumWidth(320); row_street.addWidget(lbl_street); row_street.addWidget(self.cmb_street, 1); input_layout.addLayout(row_street)
+        row_region = QHBoxLayout(); self.lbl_region = QLabel("Daerah"); self.lbl_region.setObjectName("FieldLabel"); self.cmb_region = QComboBox(); self.cmb_region.setObjectName("Combo"); row_region.addWidget(self.lbl_region); row_region.addWidget(self.cmb_region); input_layout.addLayout(row_region)
+        row_street = QHBoxLayout(); self.lbl_street = QLabel("Nama Node"); self.lbl_street.setObjectName("FieldLabel"); self.cmb_street = QComboBox(); self.cmb_street.setObjectName("Combo"); self.cmb_street.setMinimumWidth(320); row_street.addWidget(self.lbl_street); row_street.addWidget(self.cmb_street, 1); input_layout.addLayout(row_street)
+        row_road = QHBoxLayout(); self.lbl_road_title = QLabel("Ruas Jalan"); self.lbl_road_title.setObjectName("FieldLabel"); self.lbl_road = QLabel(ROAD_HINT); self.lbl_road.setWordWrap(True); row_road.addWidget(self.lbl_road_title); row_road.addWidget(self.lbl_road, 1); input_layout.addLayout(row_road)
+        self.lbl_road_title.setVisible(False); self.lbl_road.setVisible(False)
         row_desc = QHBoxLayout(); lbl_desc = QLabel("Deskripsi"); lbl_desc.setObjectName("FieldLabel"); self.input_desc = QLineEdit(); self.input_desc.setObjectName("Combo"); self.input_desc.setMinimumWidth(320); row_desc.addWidget(lbl_desc); row_desc.addWidget(self.input_desc, 1); input_layout.addLayout(row_desc)
         btn_row = QHBoxLayout(); btn_row.addStretch(1); self.btn_cut = QPushButton("Cut"); self.btn_cut.setObjectName("Primary"); self.btn_reset = QPushButton("Reset"); self.btn_reset.setObjectName("Secondary"); btn_row.addWidget(self.btn_cut); btn_row.addWidget(self.btn_reset); input_layout.addLayout(btn_row)
         v.addWidget(input_box)
+
+        # Daftar rute yang sedang ditampilkan di peta (centang = tampil)
+        self.routes_box = QFrame(); self.routes_box.setObjectName("InputBox")
+        routes_layout = QVBoxLayout(self.routes_box); routes_layout.setContentsMargins(16, 16, 16, 16); routes_layout.setSpacing(8)
+        lbl_routes = QLabel("Rute di Peta"); lbl_routes.setObjectName("MapTitle"); routes_layout.addWidget(lbl_routes)
+        self.list_routes = QListWidget(); self.list_routes.setMaximumHeight(140); routes_layout.addWidget(self.list_routes)
+        routes_btn_row = QHBoxLayout(); routes_btn_row.addStretch(1); self.btn_clear_routes = QPushButton("Hapus Rute"); self.btn_clear_routes.setObjectName("Secondary"); routes_btn_row.addWidget(self.btn_clear_routes); routes_layout.addLayout(routes_btn_row)
+        self.routes_box.setVisible(False)
+        v.addWidget(self.routes_box)
         v.addSpacerItem(QSpacerItem(20, 20, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding))
         
         self.setStyleSheet("""
@@ -88,11 +154,19 @@ class SellerSimulation(QWidget):
         if self.map_loaded: return
         print("--- LAZY LOADING MAP SEKARANG ---")
         filename = os.path.join(self.get_project_root(), "logic", "graph", "road_map_detailed.html")
-        
-        if os.path.exists(filename):
-            settings = self.web_view.settings()
-            settings.setAttribute(QWebEngineSettings.WebAttribute.LocalContentCanAccessFileUrls, True)
-            settings.setAttribute(QWebEngineSettings.WebAttribute.LocalContentCanAccessRemoteUrls, True)
+        tiles_dir = os.path.join(self.get_project_root(), "logic", "graph", "tiles")
+
+        settings = self.web_view.settings()
+        settings.setAttribute(QWebEngineSettings.WebAttribute.LocalContentCanAccessFileUrls, True)
+        settings.setAttribute(QWebEngineSettings.WebAttribute.LocalContentCanAccessRemoteUrls, True)
+
+        # Peta tiled (python -m logic.graph.map_tiles): hanya tile di viewport yang dimuat
+        if os.path.exists(os.path.join(tiles_dir, "index.html")) and \
+                install_map_scheme_handler(self.web_view.page().profile(), tiles_dir) is not None:
+            print("Memuat peta tiled via aquamap://")
+            self.web_view.load(tiled_map_url())
+            self.map_loaded = True
+        elif os.path.exists(filename):
             self.web_view.load(QUrl.fromLocalFile(filename))
             self.map_loaded = True
         else:
@@ -101,40 +175,85 @@ class SellerSimulation(QWidget):
 
     def on_load_finished(self, ok):
         print(f"Halaman simulasi selesai dimuat (Success: {ok})")
+        if ok:
+            self._apply_marker_edits()
+            self._sync_edge_mode()
+        self.route_overlay.on_load_finished(ok)
+
+    def _apply_marker_edits(self):
+        """Terapkan nama/ID marker hasil edit (sidecar SQLite) ke peta yang baru dimuat."""
+        try:
+            edits_json = get_marker_store().edits_json()
+        except Exception as e:
+            print(f"[WARN] Sidecar marker tidak bisa dibaca: {e}")
+            return
+        if edits_json != "{}":
+            self.web_view.page().runJavaScript(
+                f"if (typeof aquaApplyMarkerEdits === 'function') {{ aquaApplyMarkerEdits({edits_json}); }}"
+            )
+
+    def _on_load_started(self):
+        self.route_overlay.on_load_started()
+
+    # --- OVERLAY RUTE ---
+    def show_routes(self, routes: list, replace: bool = True):
+        """
+        Tampilkan satu atau beberapa rute di peta.
+        routes: list dict {id, coords [[lat, lon], ...], color, label, markers}
+        """
+        if replace:
+            self.clear_routes()
+        self.list_routes.blockSignals(True)
+        for r in routes:
+            route_id = str(r["id"])
+            self.route_overlay.show_route(
+                route_id, r["coords"], color=r.get("color", "#E53935"),
+                label=r.get("label", route_id), markers=r.get("markers")
+            )
+            item = QListWidgetItem(r.get("label", route_id))
+            item.setData(Qt.ItemDataRole.UserRole, route_id)
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Checked)
+            item.setForeground(QColor(r.get("color", "#E53935")))
+            self.list_routes.addItem(item)
+        self.list_routes.blockSignals(False)
+        self.routes_box.setVisible(self.list_routes.count() > 0)
+        self.route_overlay.fit_all()
+
+    def clear_routes(self):
+        self.route_overlay.clear()
+        self.list_routes.clear()
+        self.routes_box.setVisible(False)
+
+    def _on_route_item_changed(self, item: QListWidgetItem):
+        route_id = item.data(Qt.ItemDataRole.UserRole)
+        self.route_overlay.set_route_visible(route_id, item.checkState() == Qt.CheckState.Checked)
 
     # --- FUNGSI YANG DIPERBARUI ---
     def _load_geo_sources(self):
-        """HANYA memuat data Node (Intersections)."""
+        """HANYA memuat data Node (Intersections) dari katalog lokasi bersama."""
         project_root = self.get_project_root()
-        
+        area_path = os.path.join(project_root, "logic", "graph", "output.geojson")
+
         try:
-            area_path = os.path.join(project_root, "logic", "graph", "output.geojson")
-            if os.path.exists(area_path):
-                with open(area_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                self._all_nodes_data = data.get("features", [])
-            else:
-                 print(f"File node tidak ditemukan: {area_path}")
-                 self._all_nodes_data = []
-            print(f"Loaded {len(self._all_nodes_data)} nodes from intersections_area.geojson")
+            self._locations = get_location_catalog(area_path)
+            print(f"Loaded {len(self._locations)} nodes from output.geojson")
+        except FileNotFoundError:
+            print(f"File node tidak ditemukan: {area_path}")
+            self._locations = None
         except Exception as e:
-            print(f"Error memuat intersections_area.geojson: {e}")
-            self._all_nodes_data = []
-            
-        # Hapus bagian yang memuat roads_names.geojson
-        
+            print(f"Error memuat output.geojson: {e}")
+            self._locations = None
+
         self._map_region_to_streets()
 
     def _map_region_to_streets(self):
-        # (Fungsi ini sudah benar dari sebelumnya, tidak perlu diubah)
-        region_to_nodes = {}
-        for feature in self._all_nodes_data:
-            props = feature.get("properties", {})
-            region = (props.get("region_name") or "Daerah Tidak Dikenal").strip()
-            node_name = props.get("intersection_name", "") 
-            if node_name:
-                region_to_nodes.setdefault(region, set()).add(node_name)
-        self.region_to_nodes_map = {k: sorted(list(v)) for k, v in region_to_nodes.items()}
+        if self._locations is None:
+            self.region_to_nodes_map = {}
+        else:
+            self.region_to_nodes_map = dict(self._locations.region_to_streets)
+            if self._locations.unassigned_streets:
+                self.region_to_nodes_map["Daerah Tidak Dikenal"] = self._locations.unassigned_streets
         self.regions = sorted(self.region_to_nodes_map.keys())
 
     def _populate_dropdowns(self):
@@ -151,6 +270,11 @@ class SellerSimulation(QWidget):
         except Exception as e:
             print(f"Error mengisi dropdown daerah: {e}")
 
+    def _select_region(self, region: str):
+        idx = self.cmb_region.findText(region or "Daerah Tidak Dikenal")
+        if idx >= 0:
+            self.cmb_region.setCurrentIndex(idx)
+
     def _on_region_changed(self, index):
         # (Fungsi ini sudah benar dari sebelumnya, tidak perlu diubah)
         try:
@@ -182,6 +306,8 @@ class SellerSimulation(QWidget):
             
         print(self.desc_marker)
         mode = self.cmb_mode.currentText()
+        if mode == "Edge":
+            return self._cut_selected_road()
         if mode != "Node":
             print(f"Mode '{mode}' belum didukung untuk operasi Cut.")
             return
@@ -194,23 +320,11 @@ class SellerSimulation(QWidget):
 
         print(f"Tombol Cut diklik untuk node: '{selected_node_name}'")
 
-        # 1. Cari node di data intersection kita
-        target_node_feature = None
-        for feature in self._all_nodes_data:
-            if feature.get("properties", {}).get("intersection_name") == selected_node_name:
-                target_node_feature = feature
-                break
-        
-        if not target_node_feature:
-            print(f"Node '{selected_node_name}' tidak ditemukan di _all_nodes_data.")
-            return
+        # 1 & 2. Cari koordinat node di katalog lokasi (Format GeoJSON [lon, lat])
+        node_coords_lonlat = self._locations.coords_lonlat(selected_node_name) if self._locations else None
 
-        # 2. Dapatkan Koordinat
-        node_geom = target_node_feature.get("geometry", {})
-        node_coords_lonlat = node_geom.get("coordinates") # Format GeoJSON [lon, lat]
-        
         if not node_coords_lonlat:
-            print("Node tidak memiliki koordinat.")
+            print(f"Node '{selected_node_name}' tidak ditemukan di katalog lokasi.")
             return
             
         # Konversi ke [lat, lon] untuk menghapus marker di Leaflet
@@ -234,6 +348,83 @@ class SellerSimulation(QWidget):
         print(f"Mengirim perintah ke JavaScript: {js_command}")
         self.web_view.page().runJavaScript(js_command)
 
+    # --- MODE EDGE (penutupan ruas jalan) ---
+    def _on_mode_changed(self, mode: str):
+        edge = mode == "Edge"
+        for w in (self.lbl_region, self.cmb_region, self.lbl_street, self.cmb_street):
+            w.setVisible(not edge)
+        self.lbl_road_title.setVisible(edge)
+        self.lbl_road.setVisible(edge)
+        if not edge:
+            self._selected_road = None
+            self.lbl_road.setText(ROAD_HINT)
+        self._sync_edge_mode()
+
+    def _sync_edge_mode(self):
+        """Beri tahu peta apakah klik ruas jalan dipakai untuk memilih ruas."""
+        edge = "true" if self.cmb_mode.currentText() == "Edge" else "false"
+        self.web_view.page().runJavaScript(
+            f"if (typeof aquaSetEdgeMode === 'function') {{ aquaSetEdgeMode({edge}); }}"
+        )
+
+    def _on_road_clicked(self, payload: dict):
+        """Ruas diklik di peta: cocokkan geometry polyline ke ruas graf routing."""
+        from logic.graph.map_cache import peek_routing_data
+        name = payload.get("name") or "Jalan tanpa nama"
+        data = peek_routing_data()
+        if data is None:
+            # Jangan memuat graf di thread GUI; proses klik ini setelah data siap
+            self._selected_road = None
+            self._pending_road = payload
+            self.lbl_road.setText(f"{name}: memuat data routing...")
+            self._wait_for_routing()
+            return
+        self._pending_road = None
+        segment = data.road_segment_at(payload.get("coords"))
+        if segment is None:
+            self._selected_road = None
+            self.lbl_road.setText(f"{name}: ruas ini tidak ada di graf routing, tidak bisa ditutup.")
+            return
+        self._selected_road = {"u": segment[0], "v": segment[1], "name": name, "coords": payload["coords"]}
+        self.lbl_road.setText(f"{name} (simpul {segment[0]} – {segment[1]})")
+
+    def _wait_for_routing(self):
+        """Pastikan data routing sedang dimuat di background, lalu pantau kesiapannya."""
+        if self._routing_wait.isActive():
+            return
+        from logic.graph.map_cache import get_routing_data
+        # Jika prefetch sedang berjalan, thread ini hanya menunggu hasil yang sama
+        self._routing_loader = threading.Thread(target=get_routing_data, name="routing-load", daemon=True)
+        self._routing_loader.start()
+        self._routing_wait.start()
+
+    def _check_routing_ready(self):
+        from logic.graph.map_cache import is_routing_ready
+        if not is_routing_ready():
+            if self._routing_loader is not None and not self._routing_loader.is_alive():
+                # Pemuatan selesai tanpa hasil (lihat log [ERROR] map_cache)
+                self._routing_wait.stop()
+                self._pending_road = None
+                self.lbl_road.setText("Data routing gagal dimuat, ruas tidak bisa dipilih.")
+            return
+        self._routing_wait.stop()
+        payload, self._pending_road = self._pending_road, None
+        if payload is not None:
+            self._on_road_clicked(payload)
+
+    def _cut_selected_road(self):
+        road = self._selected_road
+        if road is None:
+            QMessageBox.information(self, "Pilih Ruas", ROAD_HINT)
+            return
+        segment = (road["u"], road["v"])
+        if segment not in self.edge_deleted and segment[::-1] not in self.edge_deleted:
+            self.edge_deleted.append(segment)
+        print(f"Ruas ditutup: {road['name']} {segment}")
+        self.web_view.page().runJavaScript(f"cutRoadByCoords({json.dumps({'coords': road['coords']})});")
+        self._selected_road = None
+        self.lbl_road.setText(ROAD_HINT)
+
     def on_reset_clicked(self):
         """Memuat ulang peta ke kondisi aslinya."""
         print("Tombol Reset diklik. Memuat ulang peta...")
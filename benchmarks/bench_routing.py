@@ -0,0 +1,381 @@
+"""
+bench_routing.py
+Benchmark routing, graph coloring, dan analisis cut untuk mendeteksi regresi performa.
+
+Yang diukur:
+- cari_rute_by_nama: rute satu segmen antar dua nama simpang acak
+- bin_route: rute multi-stop Depot -> 1..4 pelanggan (seperti OrderPreviewDialog._compute_bin_route)
+- analisis_titik_rawan: cut vertex + bridge seluruh graf
+- build_order_graph_from_json: graf konflik dari N order
+- color_graph_with_capacity: pewarnaan FFD graf order tersebut
+
+Dataset:
+- real: graf Ciwaruga/Sarijadi ter-cache (map_cache.get_routing_data, tanpa jaringan)
+- grid-1k / grid-10k / grid-100k: graf grid sintetis bergaya OSMnx (dengan jalan buntu)
+- orders-10 .. orders-10000: order sintetis (galon/kardus acak, seed tetap)
+
+Per kasus dilaporkan persentil latensi (p50/p90/p99), puncak memori (tracemalloc,
+satu eksekusi terpisah) dan throughput, sebagai JSON. Dengan --compare hasil
+dibandingkan dengan laporan sebelumnya; exit code 1 jika p50 atau puncak memori
+naik melebihi --threshold.
+
+Run lengkap memakan beberapa menit (grid-100k dan orders-10000 dominan; graf
+order 10000 butuh >1 GB memori). Gunakan --quick untuk pengecekan cepat.
+
+Pemakaian:
+    python benchmarks/bench_routing.py --json routing.json
+    python benchmarks/bench_routing.py --quick
+    python benchmarks/bench_routing.py --only coloring,order_graph --orders 10,100,1000
+    python benchmarks/bench_routing.py --compare routing.json --threshold 0.25
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+GRID_SIZES = (1000, 10000, 100000)
+ORDER_SIZES = (10, 100, 1000, 10000)
+QUICK_GRID_SIZES = (1000,)
+QUICK_ORDER_SIZES = (10, 100)
+
+BENCHMARKS = ("route", "bin_route", "cut_analysis", "order_graph", "coloring")
+
+ROUTE_QUERIES = 30        # sampel rute per graf
+BIN_QUERIES = 15          # sampel rute multi-stop per graf
+REPEAT = 5                # pengulangan untuk fungsi "sekali jalan" (cut, build, coloring)
+MAX_CASE_SECONDS = 20.0   # berhenti mengambil sampel setelah ini (minimal 1 sampel)
+REGRESSION_THRESHOLD = 0.20
+MIN_REGRESSION_MS = 0.5   # selisih p50 di bawah ini dianggap noise
+
+SEED = 42
+GRID_ORIGIN = (-6.880, 107.570)   # (lat, lon) sekitar area layanan
+GRID_SPACING_M = 80.0
+SPUR_FRACTION = 0.05              # porsi simpul yang berupa jalan buntu (bridge/cut vertex)
+
+
+# =============================================================================
+# DATASET
+# =============================================================================
+
+def synthetic_grid(n_nodes: int, seed: int = SEED):
+    """
+    MultiDiGraph grid ~n_nodes simpul dengan atribut x/y/length seperti OSMnx,
+    ditambah jalan buntu agar analisis cut punya hasil. Mengembalikan
+    (G, name_index, depot_name); setiap simpul diberi nama "Simpang <id>".
+    """
+    import networkx as nx
+
+    rng = random.Random(seed)
+    n_spurs = int(n_nodes * SPUR_FRACTION)
+    side = max(2, int(math.sqrt(n_nodes - n_spurs)))
+    dlat = GRID_SPACING_M / 111320.0
+    dlon = GRID_SPACING_M / (111320.0 * math.cos(math.radians(GRID_ORIGIN[0])))
+
+    G = nx.MultiDiGraph(crs="EPSG:4326")
+    G.add_nodes_from(
+        (r * side + c, {"y": GRID_ORIGIN[0] + r * dlat, "x": GRID_ORIGIN[1] + c * dlon, "street_count": 4})
+        for r in range(side) for c in range(side)
+    )
+    edges = []
+    for r in range(side):
+        for c in range(side):
+            u = r * side + c
+            for v in ((u + 1) if c + 1 < side else None, (u + side) if r + 1 < side else None):
+                if v is None:
+                    continue
+                length = GRID_SPACING_M * rng.uniform(0.9, 1.3)
+                edges.append((u, v, {"length": length, "highway": "residential"}))
+                edges.append((v, u, {"length": length, "highway": "residential"}))
+
+    next_id = side * side
+    for _ in range(n_spurs):
+        anchor = rng.randrange(side * side)
+        G.add_node(next_id, y=G.nodes[anchor]["y"] + dlat / 3, x=G.nodes[anchor]["x"] + dlon / 3, street_count=1)
+        length = GRID_SPACING_M * rng.uniform(0.3, 0.6)
+        edges.append((anchor, next_id, {"length": length, "highway": "service"}))
+        edges.append((next_id, anchor, {"length": length, "highway": "service"}))
+        next_id += 1
+    G.add_edges_from(edges)
+
+    name_index = {f"Simpang {n}": n for n in G.nodes}
+    return G, name_index, "Simpang 0"
+
+
+def real_graph():
+    """(G, gdf_lokasi, name_index, depot_name) graf asli ter-cache, atau None jika tidak tersedia."""
+    from logic.graph.map_cache import get_routing_data
+    data = get_routing_data()
+    if data is None:
+        return None
+    return data.G, data.gdf_lokasi, data.name_to_node, data.depot_name
+
+
+def synthetic_orders(n: int, seed: int = SEED) -> list:
+    """Order acak dengan distribusi mirip Database/order_data.json (kebanyakan 1-2 galon)."""
+    rng = random.Random(seed + n)
+    return [
+        {
+            "id": f"O{i}",
+            "galon": rng.choices((0, 1, 2, 3, 5), weights=(5, 50, 30, 12, 3))[0],
+            "kardus": rng.choices((0, 1, 2, 3), weights=(60, 25, 12, 3))[0],
+        }
+        for i in range(n)
+    ]
+
+
+# =============================================================================
+# PENGUKURAN
+# =============================================================================
+
+def _percentile(sorted_values, q: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    k = (len(sorted_values) - 1) * q
+    lo, hi = math.floor(k), math.ceil(k)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def _summary(samples_s, items_per_call: int) -> dict:
+    ms = sorted(s * 1000 for s in samples_s)
+    total_s = sum(samples_s)
+    return {
+        "samples": len(ms),
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "p50_ms": round(_percentile(ms, 0.50), 3),
+        "p90_ms": round(_percentile(ms, 0.90), 3),
+        "p99_ms": round(_percentile(ms, 0.99), 3),
+        "min_ms": round(ms[0], 3),
+        "max_ms": round(ms[-1], 3),
+        "throughput_per_s": round(len(ms) * items_per_call / total_s, 3) if total_s > 0 else None,
+    }
+
+
+def _peak_memory(fn, arg) -> int:
+    """Puncak alokasi Python (byte) untuk satu pemanggilan fn(arg)."""
+    tracemalloc.start()
+    try:
+        fn(arg)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def measure(name: str, fn, args, items_per_call: int = 1, max_seconds: float = MAX_CASE_SECONDS,
+            memory: bool = True, meta=None) -> dict:
+    """
+    Jalankan fn(arg) untuk setiap arg (urut) sampai habis atau max_seconds terlewati.
+    Output fungsi (print) dibuang agar tidak ikut terukur di terminal.
+    """
+    samples, failures = [], 0
+    sink = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(sink):
+        for arg in args:
+            t0 = time.perf_counter()
+            ok = fn(arg)
+            samples.append(time.perf_counter() - t0)
+            if ok is False:
+                failures += 1
+            sink.seek(0)
+            sink.truncate()
+            if time.perf_counter() - start > max_seconds:
+                break
+        peak = _peak_memory(fn, args[0]) if memory and args else None
+
+    result = {"name": name, "failures": failures, "peak_memory_bytes": peak}
+    result.update(_summary(samples, items_per_call) if samples else {"samples": 0})
+    if meta:
+        result.update(meta)
+    print(f"  {name:<45} p50 {result.get('p50_ms', float('nan')):>10.3f} ms  "
+          f"p99 {result.get('p99_ms', float('nan')):>10.3f} ms  n={result['samples']}", file=sys.stderr)
+    return result
+
+
+# =============================================================================
+# KASUS
+# =============================================================================
+
+def _route_cases(label, G, gdf, name_index, depot, args, rng) -> list:
+    from logic.graph.path_finder import cari_rute_by_nama
+
+    names = sorted(name_index)
+    cases = []
+
+    if "route" in args.only:
+        pairs = [tuple(rng.sample(names, 2)) for _ in range(args.route_queries)]
+
+        def one_route(pair):
+            edges, _ = cari_rute_by_nama(G, gdf, pair[0], pair[1], name_index=name_index)
+            return edges is not None
+
+        cases.append(measure(f"cari_rute_by_nama[{label}]", one_route, pairs,
+                             max_seconds=args.max_seconds, memory=args.memory,
+                             meta={"nodes": G.number_of_nodes(), "edges": G.number_of_edges()}))
+
+    if "bin_route" in args.only:
+        customers = [n for n in names if n != depot]
+        bins = [rng.sample(customers, rng.randint(1, 4)) for _ in range(args.bin_queries)]
+
+        def one_bin(stops):
+            # Sama seperti OrderPreviewDialog._compute_bin_route: Depot -> pelanggan berurutan
+            stops = [depot] + stops
+            for a, b in zip(stops, stops[1:]):
+                edges, _ = cari_rute_by_nama(G, gdf, a, b, name_index=name_index)
+                if edges is None:
+                    return False
+            return True
+
+        cases.append(measure(f"bin_route[{label}]", one_bin, bins,
+                             max_seconds=args.max_seconds, memory=args.memory,
+                             meta={"nodes": G.number_of_nodes(), "stops_per_bin": "1-4"}))
+
+    if "cut_analysis" in args.only:
+        from logic.graph.graph_cut import analisis_titik_rawan
+        cases.append(measure(f"analisis_titik_rawan[{label}]", analisis_titik_rawan, [G] * args.repeat,
+                             max_seconds=args.max_seconds, memory=args.memory,
+                             meta={"nodes": G.number_of_nodes(), "edges": G.number_of_edges()}))
+    return cases
+
+
+def _order_cases(n, args) -> list:
+    from logic.graph.graph_coloring import build_order_graph_from_json, color_graph_with_capacity
+
+    orders = synthetic_orders(n)
+    cases = []
+    if "order_graph" in args.only:
+        cases.append(measure(f"build_order_graph_from_json[orders-{n}]", build_order_graph_from_json,
+                             [orders] * args.repeat, items_per_call=n,
+                             max_seconds=args.max_seconds, memory=args.memory, meta={"orders": n}))
+    if "coloring" in args.only:
+        with contextlib.redirect_stdout(io.StringIO()):
+            G_orders = build_order_graph_from_json(orders)
+        cases.append(measure(f"color_graph_with_capacity[orders-{n}]", color_graph_with_capacity,
+                             [G_orders] * args.repeat, items_per_call=n,
+                             max_seconds=args.max_seconds, memory=args.memory,
+                             meta={"orders": n, "conflict_edges": G_orders.number_of_edges()}))
+    return cases
+
+
+def run(args) -> dict:
+    rng = random.Random(SEED)
+    cases, skipped = [], []
+
+    if args.only & {"route", "bin_route", "cut_analysis"}:
+        if args.real:
+            print("[real] memuat graf ter-cache...", file=sys.stderr)
+            with contextlib.redirect_stdout(io.StringIO()):
+                real = real_graph()
+            if real is None:
+                skipped.append({"dataset": "real", "reason": "graf ter-cache tidak tersedia"})
+            else:
+                cases += _route_cases("real", *real, args, rng)
+
+        for n in args.grids:
+            label = f"grid-{n // 1000}k" if n >= 1000 else f"grid-{n}"
+            print(f"[{label}] membangun graf sintetis...", file=sys.stderr)
+            G, name_index, depot = synthetic_grid(n)
+            cases += _route_cases(label, G, None, name_index, depot, args, rng)
+            del G, name_index
+
+    for n in args.orders:
+        print(f"[orders-{n}]", file=sys.stderr)
+        cases += _order_cases(n, args)
+
+    return {
+        "benchmark": "routing",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "seed": SEED,
+        "cases": cases,
+        "skipped": skipped,
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> dict:
+    """Bandingkan p50 & puncak memori per kasus dengan laporan sebelumnya."""
+    base_cases = {c["name"]: c for c in baseline.get("cases", [])}
+    rows, regressions = [], []
+    for case in report["cases"]:
+        base = base_cases.get(case["name"])
+        if not base or not case.get("samples") or not base.get("samples"):
+            continue
+        row = {"name": case["name"]}
+        for key in ("p50_ms", "peak_memory_bytes"):
+            old, new = base.get(key), case.get(key)
+            if not old or new is None:
+                continue
+            ratio = new / old
+            row[key.replace("_ms", "").replace("_bytes", "") + "_ratio"] = round(ratio, 3)
+            if key == "p50_ms" and new - old < MIN_REGRESSION_MS:
+                continue
+            if ratio > 1 + threshold:
+                regressions.append(f"{case['name']}: {key} {old} -> {new} (x{ratio:.2f})")
+        rows.append(row)
+    return {"baseline": baseline.get("timestamp"), "threshold": threshold, "cases": rows, "regressions": regressions}
+
+
+def _int_list(text: str):
+    return tuple(int(x) for x in text.split(",") if x.strip())
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark routing, coloring & analisis cut")
+    parser.add_argument("--only", default=",".join(BENCHMARKS), help=f"Subset dari: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--grids", type=_int_list, help="Ukuran grid sintetis, mis. 1000,10000")
+    parser.add_argument("--orders", type=_int_list, help="Ukuran set order, mis. 10,100,1000")
+    parser.add_argument("--no-real", dest="real", action="store_false", help="Lewati graf asli ter-cache")
+    parser.add_argument("--quick", action="store_true", help="Hanya dataset kecil (grid-1k, 10/100 order)")
+    parser.add_argument("--route-queries", type=int, default=ROUTE_QUERIES)
+    parser.add_argument("--bin-queries", type=int, default=BIN_QUERIES)
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--max-seconds", type=float, default=MAX_CASE_SECONDS, help="Batas waktu sampling per kasus")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="Lewati pengukuran puncak memori")
+    parser.add_argument("--json", dest="json_out", help="Simpan hasil ke file JSON")
+    parser.add_argument("--compare", help="Laporan JSON sebelumnya sebagai baseline")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="Kenaikan relatif yang dianggap regresi (default 0.20 = 20%%)")
+    args = parser.parse_args(argv)
+
+    args.only = {b.strip() for b in args.only.split(",") if b.strip()}
+    unknown = args.only - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"benchmark tidak dikenal: {', '.join(sorted(unknown))}")
+    if args.grids is None:
+        args.grids = QUICK_GRID_SIZES if args.quick else GRID_SIZES
+    if args.orders is None:
+        args.orders = QUICK_ORDER_SIZES if args.quick else ORDER_SIZES
+    args.repeat = max(1, args.repeat)
+
+    report = run(args)
+    ok = True
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            report["comparison"] = compare(report, json.load(f), args.threshold)
+        ok = not report["comparison"]["regressions"]
+    report["ok"] = ok
+
+    text = json.dumps(report, indent=2)
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
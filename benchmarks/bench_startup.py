@@ -0,0 +1,195 @@
+"""
+bench_startup.py
+Benchmark waktu startup dashboard seller (menjaga agar login seller tetap cepat).
+
+Yang diukur:
+- Waktu impor modul dashboard seller via `python -X importtime`, sekaligus
+  memastikan stack GIS/plotting (osmnx, geopandas, networkx, matplotlib, ...)
+  TIDAK ikut termuat sebelum routing benar-benar dipakai.
+- Wall-clock dari start proses hingga paint pertama SellerMainWindow.
+
+Pemakaian:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 5 --json startup.json
+    python benchmarks/bench_startup.py --import-budget-ms 800 --paint-budget-ms 3000
+
+Exit code 1 jika salah satu budget terlampaui atau modul berat ikut terimpor.
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_TARGET = "UI.seller.UI_sl_main"
+
+# Modul yang tidak boleh ikut termuat hanya karena dashboard seller dibuka
+HEAVY_MODULES = ("osmnx", "geopandas", "networkx", "matplotlib", "shapely", "pandas", "sklearn")
+
+# Budget default (ms). Naikkan hanya dengan alasan yang jelas.
+IMPORT_BUDGET_MS = 1500
+FIRST_PAINT_BUDGET_MS = 5000
+
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _child_env() -> dict:
+    env = dict(os.environ)
+    # Tanpa display (CI/server), gunakan platform offscreen
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    env["PYTHONPATH"] = PROJECT_ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+
+def measure_import_time(target: str = IMPORT_TARGET) -> dict:
+    """Jalankan `python -X importtime -c "import <target>"` dan ringkas hasilnya."""
+    code = (
+        f"import {target}, sys, json; "
+        f"print(json.dumps(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_ROOT, env=_child_env(), capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        return {"ok": False, "error": proc.stderr.strip().splitlines()[-1:] or ["unknown error"]}
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = _IMPORTTIME_RE.match(line)
+        if m:
+            self_us, cum_us, indent, name = m.groups()
+            rows.append((name, int(self_us), int(cum_us), len(indent)))
+
+    target_cum_us = next((cum for name, _, cum, _ in rows if name == target), None)
+    slowest = sorted(rows, key=lambda r: r[1], reverse=True)[:10]
+    heavy_loaded = json.loads(proc.stdout.strip().splitlines()[-1] or "[]")
+    return {
+        "ok": target_cum_us is not None,
+        "target": target,
+        "cumulative_ms": round((target_cum_us or 0) / 1000, 2),
+        "heavy_modules_loaded": heavy_loaded,
+        "slowest_self": [{"module": n, "self_ms": round(s / 1000, 2)} for n, s, _, _ in slowest],
+    }
+
+
+def _child_first_paint() -> None:
+    """Dijalankan di proses anak: bangun dashboard seller dan ukur paint pertama."""
+    t0 = time.perf_counter()
+    sys.path.insert(0, PROJECT_ROOT)
+    from PyQt6.QtCore import QObject, QEvent, QTimer, Qt, QCoreApplication
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtWebEngineWidgets import QWebEngineView  # noqa: F401  (sama seperti main.py)
+
+    QCoreApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
+    app = QApplication(sys.argv[:1])
+    result = {}
+
+    class _PaintWatcher(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Type.Paint and "first_paint_ms" not in result:
+                result["first_paint_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+                QTimer.singleShot(0, app.quit)
+            return False
+
+    from UI.seller.UI_sl_main import create_seller_dashboard
+    t_import = time.perf_counter()
+    window = create_seller_dashboard({"name": "Bench", "email": "bench@example.com", "role": "seller"})
+    t_built = time.perf_counter()
+    watcher = _PaintWatcher()
+    window.installEventFilter(watcher)
+    window.show()
+    QTimer.singleShot(30000, app.quit)  # pengaman jika paint tidak pernah terjadi
+    app.exec()
+
+    result["import_ms"] = round((t_import - t0) * 1000, 2)
+    result["build_ms"] = round((t_built - t_import) * 1000, 2)
+    result["heavy_modules_loaded"] = sorted(m for m in HEAVY_MODULES if m in sys.modules)
+    print(json.dumps(result))
+
+
+def measure_first_paint() -> dict:
+    """Wall-clock dari spawn proses hingga paint pertama dashboard seller."""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child-first-paint"],
+        cwd=PROJECT_ROOT, env=_child_env(), capture_output=True, text=True
+    )
+    wall_ms = round((time.perf_counter() - start) * 1000, 2)
+    if proc.returncode != 0 or not proc.stdout.strip():
+        return {"ok": False, "error": proc.stderr.strip().splitlines()[-1:] or ["unknown error"]}
+    data = json.loads(proc.stdout.strip().splitlines()[-1])
+    data["ok"] = "first_paint_ms" in data
+    data["process_wall_ms"] = wall_ms
+    return data
+
+
+def run(repeat: int, import_budget_ms: float, paint_budget_ms: float, skip_paint: bool) -> dict:
+    imports = [measure_import_time() for _ in range(repeat)]
+    paints = [] if skip_paint else [measure_first_paint() for _ in range(repeat)]
+
+    ok_imports = [r for r in imports if r.get("ok")]
+    ok_paints = [r for r in paints if r.get("ok")]
+    import_ms = statistics.median(r["cumulative_ms"] for r in ok_imports) if ok_imports else None
+    paint_ms = statistics.median(r["first_paint_ms"] for r in ok_paints) if ok_paints else None
+    heavy = sorted({m for r in ok_imports + ok_paints for m in r.get("heavy_modules_loaded", [])})
+
+    violations = []
+    if import_ms is None:
+        violations.append("import measurement failed")
+    elif import_ms > import_budget_ms:
+        violations.append(f"import {import_ms} ms > budget {import_budget_ms} ms")
+    if heavy:
+        violations.append(f"heavy modules loaded at startup: {heavy}")
+    if not skip_paint:
+        if paint_ms is None:
+            violations.append("first-paint measurement failed")
+        elif paint_ms > paint_budget_ms:
+            violations.append(f"first paint {paint_ms} ms > budget {paint_budget_ms} ms")
+
+    return {
+        "benchmark": "startup",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "repeat": repeat,
+        "import_ms_median": import_ms,
+        "first_paint_ms_median": paint_ms,
+        "budget": {"import_ms": import_budget_ms, "first_paint_ms": paint_budget_ms},
+        "import_runs": imports,
+        "first_paint_runs": paints,
+        "violations": violations,
+        "ok": not violations,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark startup dashboard seller")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--import-budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--paint-budget-ms", type=float, default=FIRST_PAINT_BUDGET_MS)
+    parser.add_argument("--skip-paint", action="store_true", help="Hanya ukur waktu impor")
+    parser.add_argument("--json", dest="json_out", help="Simpan hasil ke file JSON")
+    parser.add_argument("--child-first-paint", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child_first_paint:
+        _child_first_paint()
+        return 0
+
+    report = run(max(1, args.repeat), args.import_budget_ms, args.paint_budget_ms, args.skip_paint)
+    text = json.dumps(report, indent=2)
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,41 +1,25 @@
 import json
 
-def get_region_name(lat, lon):
-    if lon < 107.57550029969997 and lat < -6.854801002313785:
-        return "Ciwaruga"
-    if lat > -6.867635007095059 and lon > 107.57550029969997:
-        return "Gerlong"
-    if -6.873184306079369 <= lat <= -6.867635007095059 and lon > 107.57550029969997:
-        return "Sarijadi"
-    if -6.8750593479462285 <= lat < -6.873184306079369 and lon > 107.57550029969997:
-        return "Sariasih"
-    if lat < -6.8750593479462285 and lon > 107.57550029969997:
-        return "Sarimanah"
-    return "Unknown"
+from logic.graph.regions import tag_features, tag_geojson_file
 
 def process_feature(feature):
-    lat = feature['properties']['y']
-    lon = feature['properties']['x']
-    feature['properties']['region_name'] = get_region_name(lat, lon)
-    for key in ['street_count', 'ref', 'highway']:
-        feature['properties'].pop(key, None)
-    return feature
+    return tag_features([feature])[0]
 
 def convert_file(input_file, output_file):
     with open(input_file, 'r') as f:
-        data = json.load(f)
-    
-    # Asumsi data berupa FeatureCollection
-    if 'features' in data:
-        for i, feature in enumerate(data['features']):
-            data['features'][i] = process_feature(feature)
+        head = f.read(4096)
+
+    # FeatureCollection diproses streaming per batch; satu feature langsung ditandai
+    if '"features"' in head:
+        count = tag_geojson_file(input_file, output_file)
     else:
-        # Jika cuma 1 feature
-        data = process_feature(data)
-    
-    with open(output_file, 'w') as f:
-        json.dump(data, f, indent=4)
-    print(f"File berhasil dikonversi dan disimpan di {output_file}")
+        with open(input_file, 'r') as f:
+            data = process_feature(json.load(f))
+        with open(output_file, 'w') as f:
+            json.dump(data, f, indent=4)
+        count = 1
+    print(f"File berhasil dikonversi dan disimpan di {output_file} ({count} feature)")
 
 # Contoh pemanggilan
-convert_file('logic/graph/intersections_named_final.geojson', 'output.geojson')
+if __name__ == "__main__":
+    convert_file('logic/graph/intersections_named_final.geojson', 'output.geojson')
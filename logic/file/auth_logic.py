@@ -5,6 +5,8 @@ import re
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
+from logic.tracing import traced
+
 
 class AuthenticationError(Exception):
     """Custom exception untuk error autentikasi"""
@@ -42,6 +44,7 @@ class AuthManager:
             with open(self.db_path, 'w', encoding='utf-8') as f:
                 json.dump(initial_data, f, indent=4, ensure_ascii=False)
     
+    @traced("json.load_users")
     def load_database(self) -> Dict:
         """Load data dari file JSON"""
         try:
@@ -50,6 +53,7 @@ class AuthManager:
         except (FileNotFoundError, json.JSONDecodeError) as e:
             raise AuthenticationError(f"Error loading database: {e}")
     
+    @traced("json.save_users")
     def save_database(self, data: Dict):
         """Simpan data ke file JSON"""
         try:
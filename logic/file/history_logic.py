@@ -13,12 +13,15 @@ import json
 import os
 from typing import List, Dict
 
+from logic.tracing import traced
+
 
 def get_history_data_path() -> str:
     base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     return os.path.join(base_dir, "Database", "customer_history.json")
 
 
+@traced("json.load_history")
 def load_history() -> List[Dict]:
     path = get_history_data_path()
     try:
@@ -33,6 +36,7 @@ def load_history() -> List[Dict]:
         return []
 
 
+@traced("json.save_history")
 def save_history(records: List[Dict]) -> bool:
     path = get_history_data_path()
     try:
@@ -6,6 +6,7 @@ Fungsi utama:
 - get_order_data_path(): path file JSON
 - load_orders(): baca data pesanan dari JSON
 - save_orders(orders): simpan list pesanan ke JSON
+- update_order_route(order_id, route, eta): simpan rute & ETA hasil routing seller ke pesanan
 - ensure_dummy_data(): seed dummy data jika file kosong/tidak ada
 """
 
@@ -13,6 +14,8 @@ import json
 import os
 from typing import List, Dict
 
+from logic.tracing import traced
+
 
 def get_order_data_path() -> str:
     """Kembalikan path absolut ke file JSON order_data.json."""
@@ -21,6 +24,7 @@ def get_order_data_path() -> str:
     return os.path.join(base_dir, "Database", "order_data.json")
 
 
+@traced("json.load_orders")
 def load_orders() -> List[Dict]:
     """Membaca list pesanan dari file JSON. Jika tidak ada, kembalikan list kosong."""
     path = get_order_data_path()
@@ -36,6 +40,7 @@ def load_orders() -> List[Dict]:
         return []
 
 
+@traced("json.save_orders")
 def save_orders(orders: List[Dict]) -> bool:
     """Menyimpan list pesanan ke file JSON. Mengembalikan True jika berhasil."""
     path = get_order_data_path()
@@ -46,3 +51,21 @@ def save_orders(orders: List[Dict]) -> bool:
         return True
     except Exception:
         return False
+
+
+@traced("json.update_order_route")
+def update_order_route(order_id: str, route: Dict = None, eta: str = None) -> bool:
+    """
+    Simpan hasil routing (record rute ter-encode, lihat DeliveryPreviewDialog) dan/atau
+    ETA "HH:MM" ke pesanan `order_id`. Field yang None tidak diubah.
+    Mengembalikan True jika pesanan ditemukan dan berhasil disimpan.
+    """
+    orders = load_orders()
+    for order in orders:
+        if order.get("id") == order_id:
+            if route is not None:
+                order["route"] = route
+            if eta is not None:
+                order["eta"] = eta
+            return save_orders(orders)
+    return False
@@ -0,0 +1,268 @@
+"""
+alternative_routes.py
+Beberapa rute alternatif yang BERBEDA (bukan hanya satu detour) antara dua simpul,
+dengan atau tanpa simulasi penutupan simpul/ruas.
+
+Mesin: metode penalti (plateau/penalty routes) di atas CSR ShortestPathTree yang
+sudah ada (lihat shortest_path_tree.py), jadi graf tidak di-copy dan penutupan
+dipakai apa adanya sebagai mask (ClosureTree.removed / closed_edges).
+- Jarak ke tujuan h(v) dihitung sekali per kueri (Dijkstra mundur pada graf yang
+  sudah ditutup). Penalti hanya memperbesar bobot, jadi h tetap heuristik A* yang
+  admissible untuk semua putaran.
+- Tiap putaran: bobot sisi rute yang terakhir ditemukan (kedua arah) dikali
+  PENALTY_FACTOR lalu A* dijalankan lagi, sehingga pencarian berikutnya menjauhi
+  jalan yang sudah dipakai. Yen k-terpendek menghabiskan waktunya pada varian yang
+  hanya berbeda satu-dua simpang; penalti langsung melompat ke koridor lain.
+- Pruning: simpul dengan panjang ASLI + h(v) melebihi batas (max_stretch x rute
+  terpendek) tidak dikembangkan.
+- Keragaman: rute yang tumpang tindih panjangnya > max_overlap dengan rute yang
+  sudah diterima tidak ditampilkan (penaltinya tetap menumpuk).
+- Batas waktu per kueri (time_budget_ms) dan MAX_ROUNDS putaran; jika waktu habis,
+  rute yang sudah ditemukan dikembalikan dengan tanda "truncated".
+Hasil lengkap di-cache (LRU) per (awal, tujuan, k, himpunan penutupan); hasil yang
+terpotong batas waktu tidak di-cache agar kueri berikutnya bisa mencoba lagi.
+
+Fungsi/kelas utama:
+- AlternativeRouter(tree): mesin rute alternatif atas CSR sebuah ShortestPathTree
+- AlternativeRouter.routes(source, target, k, closure): daftar rute (dict) terurut panjang
+- route_overlap(a, b, lengths): porsi panjang rute a yang juga dilalui rute b
+"""
+
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List
+
+import numpy as np
+
+from logic.tracing import span
+
+ALT_CACHE_SIZE = 64          # kueri terakhir yang disimpan
+DEFAULT_K = 3                # rute yang ditampilkan (terpendek + 2 alternatif)
+DEFAULT_MAX_OVERLAP = 0.7    # maks. porsi panjang yang boleh sama dengan rute lain
+DEFAULT_MAX_STRETCH = 1.6    # maks. panjang relatif terhadap rute terpendek
+DEFAULT_TIME_BUDGET_MS = 150.0
+PENALTY_FACTOR = 1.4         # pengali bobot sisi yang sudah dipakai rute sebelumnya
+MAX_ROUNDS = 24              # batas putaran A* berpenalti per kueri
+
+
+def route_overlap(a: List[tuple], b_edges: set, lengths: Dict[tuple, float]) -> float:
+    """Porsi panjang rute `a` (daftar sisi) yang juga ada di `b_edges` (0..1)."""
+    total = sum(lengths[e] for e in a)
+    if total <= 0:
+        return 1.0
+    shared = sum(lengths[e] for e in a if e in b_edges or (e[1], e[0]) in b_edges)
+    return shared / total
+
+
+class AlternativeRouter:
+    """
+    Rute alternatif atas CSR `tree` (ShortestPathTree). Aman dipakai dari beberapa
+    thread; cache dibagi bersama.
+    """
+
+    def __init__(self, tree, cache_size: int = ALT_CACHE_SIZE):
+        self.tree = tree
+        self.cache_size = cache_size
+        # Bobot per pasangan indeks (u, v) untuk panjang & tumpang tindih, dan indeks
+        # sisi CSR per pasangan (dua arah dipenalti bersama)
+        self._w = {}
+        self._edge_ids: Dict[tuple, List[int]] = {}
+        for v in range(len(tree.nodes)):
+            for e in range(tree.out_ptr[v], tree.out_ptr[v + 1]):
+                x = tree.out_idx[e]
+                self._w[(v, x)] = tree.out_w[e]
+                self._edge_ids.setdefault((v, x), []).append(e)
+        self._cache: "OrderedDict[tuple, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # --- API ---
+
+    def routes(self, source, target, k: int = DEFAULT_K, closure=None,
+               max_overlap: float = DEFAULT_MAX_OVERLAP, max_stretch: float = DEFAULT_MAX_STRETCH,
+               time_budget_ms: float = DEFAULT_TIME_BUDGET_MS) -> dict:
+        """
+        Hingga `k` rute source -> target, terurut dari yang terpendek.
+        `closure` = ClosureTree dari tree.with_closures(...) (None = tanpa penutupan).
+
+        Return dict:
+        - "routes": list of {"nodes", "edges", "length_km", "extra_km", "overlap"}
+          (overlap = tumpang tindih maksimum dengan rute yang lebih pendek)
+        - "truncated": True jika batas waktu habis sebelum k rute ditemukan (tidak di-cache)
+        - "elapsed_ms": waktu hitung (0 jika dari cache)
+        """
+        tree = self.tree
+        s, t = tree.index.get(source), tree.index.get(target)
+        removed = closure.removed if closure is not None else None
+        closed = closure.closed_edges if closure is not None else None
+        key = (
+            s, t, int(k), float(max_overlap), float(max_stretch),
+            frozenset(np.flatnonzero(removed).tolist()) if removed is not None else frozenset(),
+            frozenset(np.flatnonzero(closed).tolist()) if closed is not None else frozenset(),
+        )
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None:
+                self._cache.move_to_end(key)
+                return dict(hit, elapsed_ms=0.0)
+
+        empty = {"routes": [], "truncated": False, "elapsed_ms": 0.0}
+        if s is None or t is None or k <= 0:
+            return empty
+        if removed is not None and (removed[s] or removed[t]):
+            return empty
+
+        with span("route.k_alternatives", k=int(k)) as sp:
+            started = time.perf_counter()
+            paths, truncated = self._penalty_routes(s, t, int(k), removed, closed, max_overlap,
+                                                    max_stretch, started + time_budget_ms / 1000.0)
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            sp["found"] = len(paths)
+            sp["truncated"] = truncated
+
+        result = {"routes": self._format(paths), "truncated": truncated, "elapsed_ms": elapsed_ms}
+        if truncated:
+            return result
+        with self._lock:
+            self._cache[key] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    # --- internal ---
+
+    def _edge_allowed(self, closed) -> List[bool]:
+        if closed is None:
+            return [True] * self.tree.edge_count
+        return (~closed).tolist()
+
+    def _dist_to_target(self, t: int, removed, allowed: List[bool]) -> List[float]:
+        """Dijkstra mundur dari t lewat CSR masuk, menghormati penutupan."""
+        tree = self.tree
+        n = len(tree.nodes)
+        in_ptr, in_idx, in_w = tree.in_ptr, tree.in_idx, tree.in_w
+        in_to_out = tree.in_to_out.tolist()
+        gone = removed.tolist() if removed is not None else [False] * n
+        dist = [np.inf] * n
+        dist[t] = 0.0
+        heap = [(0.0, t)]
+        while heap:
+            d, v = heapq.heappop(heap)
+            if d > dist[v]:
+                continue
+            for j in range(in_ptr[v], in_ptr[v + 1]):
+                u = in_idx[j]
+                if gone[u] or not allowed[in_to_out[j]]:
+                    continue
+                nd = d + in_w[j]
+                if nd < dist[u]:
+                    dist[u] = nd
+                    heapq.heappush(heap, (nd, u))
+        return dist
+
+    def _search(self, s: int, t: int, h: List[float], allowed: List[bool], penalty: Dict[int, float],
+                limit: float):
+        """
+        A* s -> t dengan bobot berpenalti (out_w[e] x penalty[e]); simpul yang panjang
+        aslinya + h sudah melewati `limit` tidak dikembangkan. (panjang asli, jalur) atau None.
+        """
+        tree = self.tree
+        out_ptr, out_idx, out_w = tree.out_ptr, tree.out_idx, tree.out_w
+        g = {s: 0.0}        # biaya berpenalti
+        real = {s: 0.0}     # panjang asli sepanjang jalur g
+        parent = {s: -1}
+        heap = [(h[s], s)]
+        while heap:
+            f, v = heapq.heappop(heap)
+            if v == t:
+                path = []
+                while v >= 0:
+                    path.append(v)
+                    v = parent[v]
+                path.reverse()
+                return real[t], path
+            gv = g[v]
+            if f > gv + h[v]:
+                continue
+            for e in range(out_ptr[v], out_ptr[v + 1]):
+                x = out_idx[e]
+                if not allowed[e] or h[x] == np.inf:
+                    continue
+                rx = real[v] + out_w[e]
+                if rx + h[x] > limit:
+                    continue
+                nd = gv + out_w[e] * penalty.get(e, 1.0)
+                if nd < g.get(x, np.inf):
+                    g[x] = nd
+                    real[x] = rx
+                    parent[x] = v
+                    heapq.heappush(heap, (nd + h[x], x))
+        return None
+
+    def _penalty_routes(self, s: int, t: int, k: int, removed, closed, max_overlap: float,
+                        max_stretch: float, deadline: float):
+        allowed = self._edge_allowed(closed)
+        h = self._dist_to_target(t, removed, allowed)
+        if h[s] == np.inf:
+            return [], False
+        limit = h[s] * max_stretch + 1e-9
+        w = self._w
+
+        penalty: Dict[int, float] = {}
+        first = self._search(s, t, h, allowed, penalty, limit)
+        if first is None:
+            return [], False
+        accepted = [first]
+        accepted_edges = [set(zip(first[1], first[1][1:]))]
+        seen = {tuple(first[1])}
+        last = first[1]
+        truncated = False
+
+        for _ in range(MAX_ROUNDS):
+            if len(accepted) >= k:
+                break
+            if time.perf_counter() > deadline:
+                truncated = True
+                break
+            for u, v in zip(last, last[1:]):
+                for e in self._edge_ids.get((u, v), []) + self._edge_ids.get((v, u), []):
+                    penalty[e] = penalty.get(e, 1.0) * PENALTY_FACTOR
+            found = self._search(s, t, h, allowed, penalty, limit)
+            if found is None:
+                break
+            last = found[1]
+            if tuple(last) in seen:
+                continue
+            seen.add(tuple(last))
+            edges = list(zip(last, last[1:]))
+            if all(route_overlap(edges, other, w) <= max_overlap for other in accepted_edges):
+                accepted.append(found)
+                accepted_edges.append(set(edges))
+        accepted.sort(key=lambda p: p[0])
+        return accepted, truncated
+
+    def _format(self, paths) -> List[Dict[str, Any]]:
+        nodes = self.tree.nodes
+        out = []
+        if not paths:
+            return out
+        best = paths[0][0]
+        seen_edges: List[set] = []
+        for cost, path in paths:
+            edges = list(zip(path, path[1:]))
+            overlap = max((route_overlap(edges, other, self._w) for other in seen_edges), default=0.0)
+            seen_edges.append(set(edges))
+            node_ids = [nodes[i] for i in path]
+            out.append({
+                "nodes": node_ids,
+                "edges": list(zip(node_ids, node_ids[1:])),
+                "length_km": cost / 1000,
+                "extra_km": (cost - best) / 1000,
+                "overlap": overlap,
+            })
+        return out
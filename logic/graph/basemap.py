@@ -0,0 +1,93 @@
+"""
+basemap.py
+Basemap statis (semua ruas jalan) untuk preview rute berbasis matplotlib.
+
+Menggambar ulang seluruh jaringan jalan dengan ox.plot_graph untuk setiap
+preview rute itu lambat. Modul ini menyiapkan segmen garis semua sisi graf
+SEKALI per snapshot graf (di-cache, dikunci pada objek graf + jumlah simpul/sisi),
+lalu setiap dialog cukup menambahkan satu LineCollection dari segmen tersebut
+dan menggambar polyline rute + marker di atasnya.
+
+Fungsi utama:
+- get_basemap_segments(G): (segments, bounds) ter-cache untuk graf G
+- draw_basemap(ax, G, color, linewidth): tambahkan basemap ke axes matplotlib
+- clear_basemap_cache(): kosongkan cache
+"""
+
+import threading
+import weakref
+from typing import Tuple
+
+import numpy as np
+
+_lock = threading.Lock()
+# graf -> (versi, segments, bounds). Weak key: entri hilang bersama grafnya.
+_cache = weakref.WeakKeyDictionary()
+
+
+def _graph_version(G) -> Tuple[int, int]:
+    return (G.number_of_nodes(), G.number_of_edges())
+
+
+def _build_segments(G):
+    """Kumpulkan koordinat semua ruas jalan (dua arah dihitung sekali)."""
+    segments = []
+    seen = set()
+    nodes = G.nodes
+    for u, v, k, data in G.edges(keys=True, data=True):
+        key = (min(u, v), max(u, v), k)
+        if key in seen:
+            continue
+        seen.add(key)
+        geom = data.get('geometry')
+        if geom is not None:
+            segments.append(np.asarray(geom.coords, dtype=float))
+        else:
+            segments.append(np.array([[nodes[u]['x'], nodes[u]['y']],
+                                      [nodes[v]['x'], nodes[v]['y']]], dtype=float))
+
+    if segments:
+        stacked = np.concatenate(segments)
+        bounds = (stacked[:, 0].min(), stacked[:, 1].min(), stacked[:, 0].max(), stacked[:, 1].max())
+    else:
+        bounds = (0.0, 0.0, 1.0, 1.0)
+    return segments, bounds
+
+
+def get_basemap_segments(G):
+    """
+    Segmen garis basemap untuk graf G beserta bounds (minx, miny, maxx, maxy).
+    Dihitung ulang hanya jika graf berbeda atau jumlah simpul/sisinya berubah.
+    """
+    version = _graph_version(G)
+    with _lock:
+        entry = _cache.get(G)
+        if entry is not None and entry[0] == version:
+            return entry[1], entry[2]
+        segments, bounds = _build_segments(G)
+        _cache[G] = (version, segments, bounds)
+        return segments, bounds
+
+
+def draw_basemap(ax, G, color: str = 'lightgray', linewidth: float = 0.8, bgcolor: str = '#FFFFFF'):
+    """Tambahkan seluruh ruas jalan ke `ax` sebagai satu LineCollection."""
+    from matplotlib.collections import LineCollection
+
+    segments, (minx, miny, maxx, maxy) = get_basemap_segments(G)
+    lc = LineCollection(segments, colors=color, linewidths=linewidth, zorder=1)
+    ax.add_collection(lc, autolim=False)
+    # Peta tidak butuh sumbu/tick; mematikannya juga menghemat waktu layout
+    ax.set_axis_off()
+    ax.figure.set_facecolor(bgcolor)
+
+    # Margin kecil seperti ox.plot_graph
+    pad_x = (maxx - minx) * 0.02
+    pad_y = (maxy - miny) * 0.02
+    ax.set_xlim(minx - pad_x, maxx + pad_x)
+    ax.set_ylim(miny - pad_y, maxy + pad_y)
+    return lc
+
+
+def clear_basemap_cache() -> None:
+    with _lock:
+        _cache.clear()
@@ -16,16 +16,9 @@ import os
 from typing import Tuple, Dict, List, Any, Union
 
 import networkx as nx
-import matplotlib.pyplot as plt
 
-# optional libs for map loading
-try:
-    import osmnx as ox
-    import geopandas as gpd
-except Exception:
-    ox = None
-    gpd = None
-    # Modul tetap berguna tanpa osmnx/geopandas untuk bagian graph order
+# matplotlib dan osmnx/geopandas (opsional) diimpor di dalam fungsi yang
+# membutuhkannya, agar build/coloring graf order tetap ringan diimpor.
 
 
 # ----------------------------
@@ -39,7 +32,11 @@ def muat_osm_dan_geojson(point: Tuple[float, float],
     Memuat graf peta dari OSMnx dan (opsional) GeoJSON. Mengembalikan tuple (G, gdf)
     Jika osmnx/gpd tidak terinstal, mengembalikan (None,None) dengan pesan.
     """
-    if ox is None or gpd is None:
+    try:
+        import osmnx as ox
+        import geopandas as gpd
+    except Exception:
+        # Modul tetap berguna tanpa osmnx/geopandas untuk bagian graph order
         print("Peringatan: osmnx atau geopandas tidak tersedia di environment Anda.")
         return None, None
 
@@ -71,6 +68,7 @@ def display_graph(G: nx.Graph,
     Menampilkan graf networkx dengan matplotlib.
     node_color_map: dict node -> color_id (int). Jika None, gunakan warna default.
     """
+    import matplotlib.pyplot as plt
     plt.figure(figsize=figsize)
 
     if pos is None:
@@ -4,6 +4,9 @@ import networkx as nx
 import geopandas as gpd
 import matplotlib.pyplot as plt
 
+from logic.graph.graph_simplify import location_nodes, simplify_routing_graph
+from logic.graph.graph_view import closure_view, connectivity
+
 # =============================================================================
 # BAGIAN SETUP AWAL (Cukup dijalankan sekali saat aplikasi pertama kali start)
 # =============================================================================
@@ -11,8 +14,10 @@ import matplotlib.pyplot as plt
 def muat_data_peta_dan_lokasi(point, distance=1000, network_type="drive", path_ke_geojson="intersections_named_final.geojson"):
     """
     Memuat graf peta dari OSMnx DAN data lokasi penting dari file GeoJSON.
+    Analisis dijalankan pada graf yang sudah disederhanakan (graph_simplify.py);
+    simpul lokasi di GeoJSON dipertahankan.
     Mengembalikan:
-        G (networkx.MultiDiGraph) -- graf peta dari osmnx
+        G (networkx.MultiDiGraph) -- graf peta yang disederhanakan
         gdf_lokasi (GeoDataFrame) -- isi geojson (bila ada)
     """
     print("Memuat graf jaringan jalan dari OpenStreetMap...")
@@ -31,6 +36,7 @@ def muat_data_peta_dan_lokasi(point, distance=1000, network_type="drive", path_k
         print(f"Peringatan: gagal memuat GeoJSON ({e}). Melanjutkan tanpa gdf_lokasi.")
         gdf_lokasi = None
 
+    G = simplify_routing_graph(G, keep=location_nodes(G, gdf_lokasi))
     return G, gdf_lokasi
 
 # =============================================================================
@@ -78,55 +84,39 @@ import networkx as nx
 
 def hapus_cut_vertex(G, nodes):
     """
-    Menghapus node cut vertex dari graph (copy-safe).
+    Menutup node cut vertex dari graph tanpa copy (graph asli tidak berubah).
 
     Parameter:
     - G : nx.Graph (graph jalan)
     - nodes : iterable atau single node id
 
     Return:
-    - G_mod : nx.Graph (graph baru tanpa node-node tersebut)
+    - G_mod : view read-only G tanpa node-node tersebut (lihat graph_view.py)
     """
-    # buat salinan graph dulu agar tidak mengubah graph asli
-    G_mod = G.copy()
-
     # jika single value, ubah menjadi list agar konsisten
     if not isinstance(nodes, (list, set, tuple)):
         nodes = [nodes]
 
-    for n in nodes:
-        if G_mod.has_node(n):
-            G_mod.remove_node(n)
-
-    return G_mod
+    return closure_view(G, nodes=nodes)
 
 
 def hapus_cut_edges(G, edges):
     """
-    Menghapus cut edges (bridge) dari graph (copy-safe).
+    Menutup cut edges (bridge) dari graph tanpa copy (graph asli tidak berubah).
 
     Parameter:
     - G : nx.Graph (graph jalan)
     - edges : iterable of tuples (u, v) atau single tuple (u, v)
 
     Return:
-    - G_mod : nx.Graph (graph baru tanpa edge-edge tersebut)
+    - G_mod : view read-only G tanpa edge-edge tersebut; jalan ditutup dua arah
+      (u->v dan v->u) beserta semua sisi paralelnya
     """
-    # buat salinan graph
-    G_mod = G.copy()
-
     # single edge -> jadi list
     if isinstance(edges, tuple):
         edges = [edges]
 
-    for (u, v) in edges:
-        # karena graph tidak berarah, bisa cek dua arah
-        if G_mod.has_edge(u, v):
-            G_mod.remove_edge(u, v)
-        elif G_mod.has_edge(v, u):
-            G_mod.remove_edge(v, u)
-
-    return G_mod
+    return closure_view(G, edges=edges)
 
 
 # =============================================================================
@@ -224,36 +214,32 @@ def simulasi_putus_jalur(G, elemen_diputus):
         return
 
     print(f"Mensimulasikan penghapusan elemen: {elemen_diputus}")
-    G_copy = G.copy()
 
+    # Penutupan diterapkan sebagai view (filter saat traversal), graf asli tidak di-copy
     if isinstance(elemen_diputus, (int, str)):
-        if elemen_diputus not in G_copy:
+        if elemen_diputus not in G:
             print(f"Simpul {elemen_diputus} tidak ditemukan.")
             return
-        G_copy.remove_node(elemen_diputus)
+        G_copy = closure_view(G, nodes=[elemen_diputus])
         tipe = "Simpul"
     elif isinstance(elemen_diputus, tuple) and len(elemen_diputus) == 2:
         u, v = elemen_diputus
-        if not G_copy.has_edge(u, v):
+        if not G.has_edge(u, v):
             print(f"Sisi {(u, v)} tidak ditemukan.")
             return
-        # remove only one edge: for multigraph, remove_edge(u,v,key) but here we remove all u-v edges
-        G_copy.remove_edges_from(list(G_copy.edges(u, data=True)))
+        # Semua sisi paralel u-v (dua arah) ikut ditutup
+        G_copy = closure_view(G, edges=[(u, v)])
         tipe = "Sisi"
     else:
         print("Input elemen tidak valid.")
         return
 
-    # Analisis dampak
-    G_und_copy = nx.Graph()
-    G_und_copy.add_nodes_from(G_copy.nodes(data=True))
-    for u, v, _ in G_copy.edges(keys=True):
-        G_und_copy.add_edge(u, v)
-
-    if nx.is_connected(G_und_copy):
+    # Analisis dampak (keterhubungan lemah untuk graf berarah OSMnx)
+    terhubung, jumlah_komponen = connectivity(G_copy)
+    if terhubung:
         status = "Jaringan TETAP TERHUBUNG."
     else:
-        status = f"Jaringan TERPUTUS menjadi {nx.number_connected_components(G_und_copy)} bagian."
+        status = f"Jaringan TERPUTUS menjadi {jumlah_komponen} bagian."
 
     print("Hasil simulasi:", status)
 
@@ -0,0 +1,215 @@
+"""
+graph_simplify.py
+Graf routing yang lebih kecil: rantai simpul berderajat 2 dikontraksi menjadi satu
+ruas berbobot, tanpa mengubah jarak antar simpul yang tersisa.
+
+Graf drive OSMnx masih menyisakan simpul "antara" berderajat 2 (mis. tempat jalan
+satu arah bertemu jalan dua arah, atau pergantian atribut jalan). Simpul itu ikut
+membengkakkan Dijkstra, articulation point, dan timeline simpul per simpul. Simpul
+dengan tepat dua tetangga dihapus dan sisi masuk/keluarnya disambung (panjang
+dijumlah, geometry disambung), hanya bila arah lalu lintas tetap sama persis.
+Karena itu jarak terpendek antar simpul yang tersisa identik dengan graf asli
+(diperiksa check_distances).
+
+Simpang yang berdekatan sengaja TIDAK digabung (ox.consolidate_intersections):
+penggabungan memindahkan ujung ruas ke titik tengah kluster sehingga jarak, ETA,
+dan ongkir ikut bergeser, dan beberapa simpang bernama akan berbagi satu simpul.
+
+Ruas hasil kontraksi menyimpan simpul antara yang dilewatinya (merged_nodes) dan
+jaraknya dari ujung awal ruas (merged_offsets). Pemetaan osmid asli -> simpul baru
+disimpan di G.graph["simplify"] agar osmid dari data peta (simpang, ujung polyline)
+tetap bisa di-resolve:
+- node_map: osmid asli -> simpul graf kecil (simpul antara -> ujung ruas terdekat)
+- interior_edge: osmid simpul antara yang dikontraksi -> (u, v) ruas yang memuatnya
+- original_xy: osmid asli -> (x, y), untuk mencocokkan polyline peta ke ruas
+
+Fungsi utama:
+- simplify_routing_graph(G, keep): graf kecil + pemetaan di G.graph
+- contract_degree2(G, keep): kontraksi (mengubah G di tempat), return simpul yang dihapus
+- check_distances(G, small, sources): pastikan jarak dari `sources` tidak berubah
+- location_nodes(G, gdf_lokasi): simpul yang harus dipertahankan untuk file lokasi
+- resolve_node(G, osmid): osmid asli -> simpul graf kecil, atau None
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+SIMPLIFY_VERSION = 2
+DISTANCE_TOLERANCE_M = 1e-3  # selisih penjumlahan float, bukan perubahan jarak
+
+
+# =============================================================================
+# KONTRAKSI RANTAI DERAJAT 2
+# =============================================================================
+
+def _flat(values) -> list:
+    out = []
+    for v in values:
+        for item in (v if isinstance(v, list) else [v]):
+            if item not in out:
+                out.append(item)
+    return out
+
+
+def _edge_coords(G, u, v, data) -> List[tuple]:
+    geom = data.get("geometry")
+    if geom is not None:
+        return list(geom.coords)
+    return [(G.nodes[u]["x"], G.nodes[u]["y"]), (G.nodes[v]["x"], G.nodes[v]["y"])]
+
+
+def _merge_edges(G, a, n, b, d_in: dict, d_out: dict) -> dict:
+    """Data sisi a->b hasil penyambungan a->n dan n->b."""
+    from shapely.geometry import LineString
+
+    merged = {}
+    for key in set(d_in) | set(d_out):
+        if key in ("length", "geometry", "merged_nodes", "merged_offsets"):
+            continue
+        values = [d[key] for d in (d_in, d_out) if key in d]
+        if all(v == values[0] for v in values):
+            merged[key] = values[0]
+        else:
+            merged[key] = _flat(values)
+    len_in = float(d_in.get("length", 0.0))
+    merged["length"] = len_in + float(d_out.get("length", 0.0))
+    coords = _edge_coords(G, a, n, d_in) + _edge_coords(G, n, b, d_out)[1:]
+    merged["geometry"] = LineString(coords)
+    merged["merged_nodes"] = d_in.get("merged_nodes", []) + [n] + d_out.get("merged_nodes", [])
+    # Jarak (meter) tiap simpul antara dari ujung a, urut sama dengan merged_nodes
+    merged["merged_offsets"] = (d_in.get("merged_offsets", []) + [len_in]
+                                + [len_in + o for o in d_out.get("merged_offsets", [])])
+    return merged
+
+
+def contract_degree2(G, keep: Iterable = ()) -> List[Any]:
+    """
+    Hapus simpul yang hanya punya dua tetangga (a, b) dan sambung sisinya. Simpul
+    dilewati jika ada sisi paralel/self-loop atau ada sisi yang tidak punya pasangan
+    lanjutan (arah lalu lintas akan berubah). Mengubah G di tempat.
+    Return daftar simpul yang dihapus.
+    """
+    keep = set(keep)
+    removed = []
+    for n in list(G.nodes):
+        if n in keep or G.has_edge(n, n):
+            continue
+        neighbours = set(G.predecessors(n)) | set(G.successors(n))
+        if len(neighbours) != 2:
+            continue
+        ins = list(G.in_edges(n, data=True))
+        outs = list(G.out_edges(n, data=True))
+        if len({u for u, _, _ in ins}) != len(ins) or len({v for _, v, _ in outs}) != len(outs):
+            continue
+        pairs = [(a, d_in, b, d_out) for a, _, d_in in ins for _, b, d_out in outs if a != b]
+        # Setiap sisi masuk harus bisa lanjut, dan setiap sisi keluar harus bisa dicapai
+        if not pairs or len(pairs) != len(ins) or len(pairs) != len(outs):
+            continue
+        for a, d_in, b, d_out in pairs:
+            G.add_edge(a, b, **_merge_edges(G, a, n, b, d_in, d_out))
+        G.remove_node(n)
+        removed.append(n)
+    return removed
+
+
+# =============================================================================
+# PIPELINE LENGKAP + PEMETAAN OSMID
+# =============================================================================
+
+def _nearest_end(G, u, v, x: float, y: float):
+    du = (G.nodes[u]["x"] - x) ** 2 + (G.nodes[u]["y"] - y) ** 2
+    dv = (G.nodes[v]["x"] - x) ** 2 + (G.nodes[v]["y"] - y) ** 2
+    return u if du <= dv else v
+
+
+def simplify_routing_graph(G, keep: Iterable = ()):
+    """
+    Graf routing kecil dari graf OSMnx `G` (tidak diubah). `keep` = osmid asli yang
+    tidak boleh hilang karena kontraksi (simpang bernama, simpul tujuan).
+    """
+    original_xy = {int(n): (float(d["x"]), float(d["y"])) for n, d in G.nodes(data=True)}
+    small = G.copy()
+    contract_degree2(small, keep={int(o) for o in keep})
+
+    # Simpul yang tersisa memakai osmid-nya sendiri; simpul antara dicatat ruas yang
+    # memuatnya lalu diarahkan ke ujung ruas terdekat
+    node_map: Dict[int, Any] = {int(n): n for n in small.nodes}
+    interior_edge: Dict[int, tuple] = {}
+    for u, v, data in small.edges(data=True):
+        for gone in data.get("merged_nodes", []):
+            if gone in interior_edge:
+                continue
+            interior_edge[gone] = (u, v)
+            x, y = original_xy[gone]
+            node_map[gone] = _nearest_end(small, u, v, x, y)
+
+    small.graph["simplify"] = {
+        "version": SIMPLIFY_VERSION,
+        "original_nodes": G.number_of_nodes(),
+        "original_edges": G.number_of_edges(),
+        "node_map": node_map,
+        "interior_edge": interior_edge,
+        "original_xy": original_xy,
+    }
+    return small
+
+
+def location_nodes(G, gdf_lokasi) -> set:
+    """
+    Simpul graf asli `G` yang dipakai lokasi di `gdf_lokasi`: osmid simpang yang ada
+    di graf + simpul terdekat tiap titik (seperti nearest_nodes saat mencari rute).
+    Dipakai sebagai `keep` agar nama lokasi tetap jatuh ke simpul yang sama.
+    """
+    import osmnx as ox
+
+    if gdf_lokasi is None or gdf_lokasi.empty:
+        return set()
+    keep = set()
+    for osmid in (gdf_lokasi["osmid"] if "osmid" in gdf_lokasi.columns else []):
+        try:
+            if int(osmid) in G:
+                keep.add(int(osmid))
+        except (TypeError, ValueError):
+            continue
+    nearest = ox.distance.nearest_nodes(G, X=gdf_lokasi.geometry.x.to_numpy(), Y=gdf_lokasi.geometry.y.to_numpy())
+    keep.update(int(n) for n in nearest)
+    return keep
+
+
+def check_distances(G, small, sources: Iterable) -> float:
+    """
+    Bandingkan jarak terpendek (atribut length) dari tiap simpul `sources` ke semua
+    simpul graf kecil dengan jarak di graf asli `G`. Raise ValueError jika ada yang
+    berubah lebih dari DISTANCE_TOLERANCE_M; return selisih terbesar (meter).
+    """
+    import networkx as nx
+
+    worst = 0.0
+    for source in sources:
+        if source not in small or source not in G:
+            continue
+        before = nx.single_source_dijkstra_path_length(G, source, weight="length")
+        after = nx.single_source_dijkstra_path_length(small, source, weight="length")
+        if set(after) != set(before) & set(small.nodes):
+            raise ValueError(f"Keterjangkauan dari {source} berubah setelah penyederhanaan graf")
+        for node, dist in after.items():
+            worst = max(worst, abs(dist - before[node]))
+        if worst > DISTANCE_TOLERANCE_M:
+            raise ValueError(f"Jarak dari {source} berubah {worst:.3f} m setelah penyederhanaan graf")
+    return worst
+
+
+def resolve_node(G, osmid) -> Optional[Any]:
+    """Simpul graf `G` untuk osmid asli (graf tanpa pemetaan: osmid itu sendiri jika ada)."""
+    if osmid is None:
+        return None
+    mapping = G.graph.get("simplify")
+    try:
+        osmid = int(osmid)
+    except (TypeError, ValueError):
+        return None
+    if mapping is not None:
+        node = mapping["node_map"].get(osmid)
+        if node is not None:
+            return node
+    return osmid if osmid in G else None
+
@@ -0,0 +1,89 @@
+"""
+graph_view.py
+Lapisan "what-if" tanpa copy graf: penutupan simpul/ruas diterapkan sebagai
+filter saat traversal (nx.subgraph_view), bukan G.copy() + remove_*.
+
+Memori yang dipakai sebanding jumlah penutupan (dua set kecil), bukan ukuran
+graf; graf asli (mis. RoutingData.G yang dipakai bersama) tidak pernah diubah.
+View bersifat read-only dan selalu mengikuti graf asli.
+
+Untuk routing dari depot, penutupan yang sama dipetakan ke mask array atas CSR
+lewat ShortestPathTree.edge_mask (lihat shortest_path_tree.py).
+
+Fungsi utama:
+- ClosureMask(nodes, edges, both_directions): kumpulan simpul/ruas yang ditutup
+- ClosureMask.view(G): subgraph view G tanpa elemen yang ditutup
+- closure_view(G, nodes, edges, both_directions): singkatan ClosureMask(...).view(G)
+- connectivity(G): (terhubung?, jumlah komponen) - lemah untuk graf berarah
+"""
+
+from typing import Any, Iterable, Set, Tuple
+
+import networkx as nx
+
+
+class ClosureMask:
+    """
+    Simpul & ruas yang ditutup. Ruas ditulis (u, v) atau (u, v, key); key diabaikan,
+    semua sisi paralel u->v ikut ditutup. Dengan both_directions=True (default,
+    seperti penutupan jalan) v->u juga ditutup.
+    """
+
+    def __init__(self, nodes: Iterable = (), edges: Iterable = (), both_directions: bool = True):
+        self.both_directions = both_directions
+        self.nodes: Set[Any] = set()
+        self.edges: Set[Tuple[Any, Any]] = set()
+        for n in nodes:
+            self.close_node(n)
+        for e in edges:
+            self.close_edge(e[0], e[1])
+
+    def close_node(self, node) -> None:
+        self.nodes.add(node)
+
+    def close_edge(self, u, v) -> None:
+        self.edges.add((u, v))
+        if self.both_directions:
+            self.edges.add((v, u))
+
+    def node_ok(self, node) -> bool:
+        return node not in self.nodes
+
+    def edge_ok(self, u, v, key=None) -> bool:
+        return (u, v) not in self.edges
+
+    def __bool__(self) -> bool:
+        return bool(self.nodes) or bool(self.edges)
+
+    def __len__(self) -> int:
+        return len(self.nodes) + len(self.edges)
+
+    def __repr__(self) -> str:
+        return f"ClosureMask(nodes={len(self.nodes)}, edges={len(self.edges)})"
+
+    def view(self, G):
+        """Subgraph view `G` tanpa simpul/ruas yang ditutup (tanpa copy; read-only)."""
+        if not self:
+            return G
+        if G.is_multigraph():
+            return nx.subgraph_view(G, filter_node=self.node_ok, filter_edge=self.edge_ok)
+        return nx.subgraph_view(G, filter_node=self.node_ok, filter_edge=lambda u, v: self.edge_ok(u, v))
+
+
+def closure_view(G, nodes: Iterable = (), edges: Iterable = (), both_directions: bool = True):
+    """View `G` dengan `nodes` dan ruas `edges` ditutup; lihat ClosureMask."""
+    return ClosureMask(nodes, edges, both_directions).view(G)
+
+
+def connectivity(G) -> Tuple[bool, int]:
+    """
+    (terhubung, jumlah_komponen). Graf berarah (OSMnx) dinilai terhubung lemah,
+    sama seperti analisis lama yang mengubahnya dulu ke nx.Graph tak berarah.
+    """
+    if G.number_of_nodes() == 0:
+        return False, 0
+    if G.is_directed():
+        count = nx.number_weakly_connected_components(G)
+    else:
+        count = nx.number_connected_components(G)
+    return count == 1, count
@@ -0,0 +1,314 @@
+"""
+isochrone.py
+Isokron depot: area yang bisa dijangkau truk dalam N menit dari "Depot Air Pusat",
+dihitung per tingkat kemacetan slot pengiriman, disimpan sebagai poligon GeoJSON.
+
+Build (sisi seller/pipeline, butuh graf):
+- SATU Dijkstra terbatas dari depot dengan cutoff = jarak terjauh yang mungkin
+  (menit terbesar x kecepatan tercepat); semua kombinasi (kemacetan, menit) cukup
+  memfilter hasilnya karena kecepatan per tingkat kemacetan seragam.
+- Titik poligon = simpul terjangkau (termasuk simpul antara di ruas hasil
+  kontraksi) + titik potong pada ruas yang melewati batas (interpolasi linear sisa
+  jarak), lalu concave hull (shapely) yang diperlebar LAST_MILE_M.
+- Hasil ditulis ke depot_isochrones.geojson di sebelah output.geojson, dicap dengan
+  map_cache.graph_version() graf yang dipakai; prefetch seller membangun ulang file
+  yang capnya tidak cocok lagi (graf berubah). File hanya ditulis ulang jika isinya
+  berubah, bukan karena capnya saja, agar file yang di-commit tidak ikut berubah.
+
+Pemakaian (sisi pelanggan, TANPA graf/geopandas/shapely): ServiceAreas hanya
+membaca GeoJSON lalu point-in-polygon (ray casting) untuk kelayakan pengiriman
+dan ongkir berbasis zona. Tidak ada routing saat pemesanan.
+
+Tabel kemacetan/kecepatan per jam di sini juga dipakai simulasi ETA seller
+(DeliveryPreviewDialog.get_tingkat_kemacetan / get_max_speed_from_kemacetan).
+
+Fungsi utama:
+- tingkat_kemacetan(waktu) / kecepatan_maks(kemacetan) / kemacetan_jadwal(schedule)
+- build_isochrones(G, depot_node, minutes, levels): FeatureCollection GeoJSON
+- write_isochrones(path, ...): build dari RoutingData lalu simpan (juga: python -m logic.graph.isochrone)
+- isochrones_stale(path): True jika file belum ada atau dibuat dari versi graf lain
+- get_service_areas(path): ServiceAreas (dimuat ulang otomatis jika file berubah)
+- ServiceAreas.zone_for(lat, lon, kemacetan): (menit, ongkir) zona terkecil, atau None
+"""
+
+import datetime
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+GRAPH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_ISOCHRONES = os.path.join(GRAPH_DIR, "depot_isochrones.geojson")
+
+ISOCHRONE_MINUTES = (5, 10, 15)
+# Ongkir per zona isokron (Rupiah); di luar zona terbesar = di luar jangkauan
+ZONE_FEES = {5: 3000, 10: 5000, 15: 8000}
+HULL_RATIO = 0.35  # shapely.concave_hull: 0 = paling cekung, 1 = convex hull
+# Toleransi "jalan kaki terakhir": lokasi katalog bisa berada hingga ~390 m di luar
+# graf yang diunduh tetapi tetap di-snap ke simpul tepi saat routing (name_to_node),
+# jadi poligon diperlebar sejauh ini agar kelayakan sama dengan hasil routing
+LAST_MILE_M = 400
+METER_PER_DERAJAT = 111320.0
+
+# Tingkat kemacetan per rentang jam: (jam mulai, jam selesai, tingkat)
+KEMACETAN_PER_JAM = [
+    (datetime.time(0, 0), datetime.time(6, 0), 0),
+    (datetime.time(6, 0), datetime.time(8, 0), 1.0),
+    (datetime.time(8, 0), datetime.time(10, 0), 0.5),
+    (datetime.time(10, 0), datetime.time(15, 30), 0.2),
+    (datetime.time(15, 30), datetime.time(18, 0), 0.8),
+    (datetime.time(18, 0), datetime.time(20, 0), 0.2),
+]
+# Kecepatan maksimum truk (km/jam) per tingkat kemacetan
+KECEPATAN_MAKS = {0: 60, 0.2: 48, 0.5: 30, 0.8: 20, 1.0: 15}
+
+
+# =============================================================================
+# KEMACETAN & KECEPATAN
+# =============================================================================
+
+def tingkat_kemacetan(waktu) -> float:
+    """Tingkat kemacetan (0..1) untuk datetime/time `waktu`."""
+    jam = waktu.time() if isinstance(waktu, datetime.datetime) else waktu
+    for mulai, selesai, tingkat in KEMACETAN_PER_JAM:
+        if mulai <= jam < selesai:
+            return tingkat
+    return 0
+
+
+def kecepatan_maks(kemacetan: float) -> Optional[float]:
+    """Kecepatan maksimum (km/jam) untuk tingkat kemacetan, None jika tidak dikenal."""
+    return KECEPATAN_MAKS.get(kemacetan)
+
+
+def kemacetan_jadwal(schedule: str, now: Optional[datetime.datetime] = None) -> float:
+    """Tingkat kemacetan slot pesanan: "Segera" = jam sekarang, selain itu "HH.MM"."""
+    now = now or datetime.datetime.now()
+    text = (schedule or "").strip()
+    try:
+        jam, menit = text.replace(":", ".").split(".")
+        return tingkat_kemacetan(datetime.time(int(jam), int(menit)))
+    except ValueError:
+        return tingkat_kemacetan(now)
+
+
+# =============================================================================
+# BUILD (butuh graf; dipanggil dari sisi seller / baris perintah)
+# =============================================================================
+
+def _reach_points(G, dist: Dict, cutoff_m: float) -> List[Tuple[float, float]]:
+    """
+    Simpul dengan jarak <= cutoff + titik batas pada ruas yang keluar dari area.
+    Ruas hasil kontraksi (graph_simplify) ditelusuri per simpul antara yang dilewatinya,
+    jadi titiknya sama dengan graf lengkap.
+    """
+    original_xy = (G.graph.get("simplify") or {}).get("original_xy", {})
+    points = []
+    for u, d_u in dist.items():
+        if d_u > cutoff_m:
+            continue
+        ux, uy = G.nodes[u]["x"], G.nodes[u]["y"]
+        points.append((ux, uy))
+        for _, v, data in G.out_edges(u, data=True):
+            length = data.get("length")
+            if not length:
+                continue
+            chain = [((ux, uy), 0.0)]
+            chain += [(original_xy[n], off) for n, off in zip(data.get("merged_nodes", []),
+                                                               data.get("merged_offsets", []))]
+            chain.append(((G.nodes[v]["x"], G.nodes[v]["y"]), float(length)))
+            for i in range(1, len(chain)):
+                (ax, ay), a_off = chain[i - 1]
+                (bx, by), b_off = chain[i]
+                is_end = i == len(chain) - 1
+                if d_u + b_off <= cutoff_m:
+                    if not is_end:
+                        points.append((bx, by))
+                    continue
+                if is_end and dist.get(v, float("inf")) <= cutoff_m:
+                    break
+                frac = (cutoff_m - d_u - a_off) / (b_off - a_off) if b_off > a_off else 0
+                if 0 < frac < 1:
+                    points.append((ax + (bx - ax) * frac, ay + (by - ay) * frac))
+                break
+    return points
+
+
+def build_isochrones(G, depot_node, minutes=ISOCHRONE_MINUTES, levels=None,
+                     hull_ratio: float = HULL_RATIO, buffer_m: float = LAST_MILE_M) -> dict:
+    """
+    FeatureCollection poligon isokron untuk setiap (tingkat kemacetan, menit).
+    Properti fitur: kemacetan, minutes, speed_kmh, cutoff_m, buffer_m, fee.
+    """
+    import networkx as nx
+    import shapely
+    from shapely.geometry import MultiPoint, mapping
+
+    levels = sorted(KECEPATAN_MAKS) if levels is None else list(levels)
+    minutes = sorted(minutes)
+    max_cutoff = max(kecepatan_maks(k) for k in levels) * 1000 / 60 * minutes[-1]
+    # Satu Dijkstra terbatas untuk semua cutoff
+    dist = nx.single_source_dijkstra_path_length(G, depot_node, cutoff=max_cutoff, weight="length")
+
+    features = []
+    for level in levels:
+        speed = kecepatan_maks(level)
+        for m in minutes:
+            cutoff_m = speed * 1000 / 60 * m
+            points = _reach_points(G, dist, cutoff_m)
+            if len(points) < 3:
+                continue
+            hull = shapely.concave_hull(MultiPoint(points), ratio=hull_ratio)
+            if buffer_m:
+                hull = hull.buffer(buffer_m / METER_PER_DERAJAT, quad_segs=4)
+            if hull.geom_type not in ("Polygon", "MultiPolygon"):
+                continue
+            features.append({
+                "type": "Feature",
+                "properties": {
+                    "kemacetan": level,
+                    "minutes": m,
+                    "speed_kmh": speed,
+                    "cutoff_m": round(cutoff_m, 1),
+                    "buffer_m": buffer_m,
+                    "fee": ZONE_FEES.get(m),
+                },
+                "geometry": mapping(shapely.set_precision(hull, 1e-7)),
+            })
+    return {"type": "FeatureCollection", "depot_node": int(depot_node), "features": features}
+
+
+def _same_except_stamp(path: str, data: dict) -> bool:
+    """True jika isi `path` sama dengan `data` kecuali graph_version (tidak perlu ditulis ulang)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            old = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if not isinstance(old, dict):
+        return False
+    new = json.loads(json.dumps(data))
+    old.pop("graph_version", None)
+    new.pop("graph_version", None)
+    return old == new
+
+
+def write_isochrones(path: str = DEFAULT_ISOCHRONES, minutes=ISOCHRONE_MINUTES, levels=None) -> int:
+    """Build isokron dari data routing (snapshot graf) lalu tulis ke `path`. Return jumlah poligon."""
+    from logic.graph.map_cache import get_routing_data, graph_version
+
+    data = get_routing_data()
+    if data is None or data.depot_node is None:
+        print("⚠️ Data routing/depot tidak tersedia, isokron tidak dibuat.")
+        return 0
+    collection = build_isochrones(data.G, data.depot_node, minutes=minutes, levels=levels)
+    collection["depot_name"] = data.depot_name
+    collection["graph_version"] = graph_version()
+    if _same_except_stamp(path, collection):
+        print(f"[OK] Isokron tidak berubah, {path} tidak ditulis ulang")
+        return len(collection["features"])
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(collection, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    print(f"✅ {len(collection['features'])} poligon isokron ditulis ke {path}")
+    return len(collection["features"])
+
+
+def isochrones_stale(path: str = DEFAULT_ISOCHRONES) -> bool:
+    """True jika `path` belum ada, rusak, atau capnya bukan graph_version() saat ini."""
+    from logic.graph.map_cache import graph_version
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            stamp = json.load(f).get("graph_version")
+    except (OSError, ValueError, AttributeError):
+        return True
+    return stamp != graph_version()
+
+
+# =============================================================================
+# PEMAKAIAN (sisi pelanggan; hanya json, tanpa graf)
+# =============================================================================
+
+def _in_ring(x: float, y: float, ring) -> bool:
+    inside = False
+    j = len(ring) - 1
+    for i in range(len(ring)):
+        xi, yi = ring[i][0], ring[i][1]
+        xj, yj = ring[j][0], ring[j][1]
+        if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+def _in_polygon(x: float, y: float, rings) -> bool:
+    """rings[0] = batas luar, sisanya lubang (format koordinat GeoJSON)."""
+    if not rings or not _in_ring(x, y, rings[0]):
+        return False
+    return not any(_in_ring(x, y, hole) for hole in rings[1:])
+
+
+class ServiceAreas:
+    """Poligon isokron dari file GeoJSON. READ-ONLY, dibagikan ke semua pemakai."""
+
+    def __init__(self, path: str, stamp: Tuple[int, int], collection: dict):
+        self.path = path
+        self.stamp = stamp
+        # kemacetan -> [(menit, ongkir, [polygon rings...], bbox)] urut menit
+        self.zones: Dict[float, list] = {}
+        for feature in collection.get("features", []):
+            props = feature.get("properties") or {}
+            geom = feature.get("geometry") or {}
+            if geom.get("type") == "Polygon":
+                polygons = [geom["coordinates"]]
+            elif geom.get("type") == "MultiPolygon":
+                polygons = geom["coordinates"]
+            else:
+                continue
+            xs = [p[0] for poly in polygons for p in poly[0]]
+            ys = [p[1] for poly in polygons for p in poly[0]]
+            bbox = (min(xs), min(ys), max(xs), max(ys))
+            self.zones.setdefault(props.get("kemacetan"), []).append(
+                (props.get("minutes"), props.get("fee"), polygons, bbox))
+        for zones in self.zones.values():
+            zones.sort(key=lambda z: z[0])
+
+    def zone_for(self, lat: float, lon: float, kemacetan: float) -> Optional[Tuple[int, Optional[int]]]:
+        """(menit, ongkir) zona terkecil yang memuat titik, atau None jika di luar jangkauan."""
+        for minutes, fee, polygons, (x0, y0, x1, y1) in self.zones.get(kemacetan, []):
+            if not (x0 <= lon <= x1 and y0 <= lat <= y1):
+                continue
+            if any(_in_polygon(lon, lat, rings) for rings in polygons):
+                return minutes, fee
+        return None
+
+    def has_level(self, kemacetan: float) -> bool:
+        return bool(self.zones.get(kemacetan))
+
+
+_lock = threading.Lock()
+_areas: Dict[str, ServiceAreas] = {}
+
+
+def get_service_areas(path: str = DEFAULT_ISOCHRONES) -> Optional[ServiceAreas]:
+    """ServiceAreas untuk `path` (dimuat ulang jika file berubah); None jika file tidak ada."""
+    path = os.path.abspath(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _lock:
+        areas = _areas.get(path)
+        if areas is not None and areas.stamp == stamp:
+            return areas
+        with open(path, "r", encoding="utf-8") as f:
+            areas = ServiceAreas(path, stamp, json.load(f))
+        _areas[path] = areas
+        return areas
+
+
+if __name__ == "__main__":
+    write_isochrones()
@@ -0,0 +1,183 @@
+"""
+location_catalog.py
+Katalog lokasi (simpang) dari GeoJSON seperti output.geojson, di-parse SEKALI
+dan dipakai bersama oleh semua halaman (pemesanan & profil pelanggan, simulasi,
+preview rute seller).
+
+Katalog di memori dikunci pada (path, mtime, ukuran) sehingga otomatis dimuat
+ulang bila file GeoJSON berubah. Hasil parse juga disimpan sebagai pickle di
+logic/graph/cache/ agar start berikutnya tidak perlu mem-parse JSON lagi.
+
+Isi katalog:
+- region_to_streets: region_name -> [intersection_name] (urut, unik)
+- unassigned_streets: nama simpang tanpa region_name
+- name_to_coords: intersection_name -> (lat, lon)
+- name_to_osmid: intersection_name -> osmid
+- name_to_region: intersection_name -> region_name
+- columns: tabel atribut lengkap (kolom -> list) untuk to_gdf()
+
+Fungsi utama:
+- get_location_catalog(path): katalog untuk file GeoJSON (default output.geojson)
+- LocationCatalog.to_gdf(): GeoDataFrame setara gpd.read_file(path), tanpa parse ulang
+- clear_location_cache(): kosongkan cache di memori
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from logic.tracing import traced
+
+GRAPH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_LOCATIONS = os.path.join(GRAPH_DIR, "output.geojson")
+CATALOG_CACHE_DIR = os.path.join(GRAPH_DIR, "cache")
+CATALOG_FORMAT = 1  # naikkan jika struktur pickle berubah
+
+_lock = threading.Lock()
+_catalogs: Dict[str, "LocationCatalog"] = {}
+
+
+class LocationCatalog:
+    """
+    Hasil parse satu file GeoJSON simpang. READ-ONLY: dibagikan ke semua pemakai.
+    Untuk nama simpang yang muncul lebih dari sekali, kemunculan pertama yang dipakai.
+    """
+
+    def __init__(self, path: str, stamp: Tuple[int, int], columns: Dict[str, list],
+                 lats: List[float], lons: List[float]):
+        self.path = path
+        self.stamp = stamp  # (mtime_ns, ukuran)
+        self.columns = columns
+        self.lats = lats
+        self.lons = lons
+
+        names = columns.get("intersection_name", [None] * len(lats))
+        regions = columns.get("region_name", [None] * len(lats))
+        osmids = columns.get("osmid", [None] * len(lats))
+
+        self.name_to_coords: Dict[str, Tuple[float, float]] = {}
+        self.name_to_osmid: Dict[str, object] = {}
+        self.name_to_region: Dict[str, str] = {}
+        by_region: Dict[str, set] = {}
+        unassigned = set()
+        for name, region, osmid, lat, lon in zip(names, regions, osmids, lats, lons):
+            if not isinstance(name, str) or not name.strip():
+                continue
+            name = name.strip()
+            region = region.strip() if isinstance(region, str) else ""
+            if name not in self.name_to_coords:
+                self.name_to_coords[name] = (lat, lon)
+                self.name_to_osmid[name] = osmid
+                self.name_to_region[name] = region
+            if region:
+                by_region.setdefault(region, set()).add(name)
+            else:
+                unassigned.add(name)
+
+        self.region_to_streets: Dict[str, List[str]] = {k: sorted(v) for k, v in sorted(by_region.items())}
+        self.unassigned_streets: List[str] = sorted(unassigned)
+        self._gdf = None
+
+    def __len__(self):
+        return len(self.lats)
+
+    @property
+    def regions(self) -> List[str]:
+        return list(self.region_to_streets.keys())
+
+    def coords_lonlat(self, name: str) -> Optional[List[float]]:
+        """Koordinat [lon, lat] (urutan GeoJSON) untuk nama simpang, atau None."""
+        latlon = self.name_to_coords.get(name)
+        return [latlon[1], latlon[0]] if latlon else None
+
+    def to_gdf(self):
+        """GeoDataFrame (EPSG:4326) semua fitur, dibuat sekali dari tabel atribut."""
+        if self._gdf is None:
+            import geopandas as gpd
+            self._gdf = gpd.GeoDataFrame(
+                dict(self.columns),
+                geometry=gpd.points_from_xy(self.lons, self.lats),
+                crs="EPSG:4326",
+            )
+        return self._gdf
+
+
+def _file_stamp(path: str) -> Tuple[int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _pickle_path(path: str) -> str:
+    digest = hashlib.sha1(path.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(CATALOG_CACHE_DIR, f"locations_{digest}.pkl")
+
+
+def _parse_geojson(path: str):
+    """Baca GeoJSON titik menjadi (kolom atribut, lats, lons)."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    features = data.get("features", []) if "features" in data else [data]
+
+    keys = []
+    for feat in features:
+        for key in (feat.get("properties") or {}):
+            if key not in keys:
+                keys.append(key)
+    columns = {key: [] for key in keys}
+    lats, lons = [], []
+    for feat in features:
+        props = feat.get("properties") or {}
+        coords = (feat.get("geometry") or {}).get("coordinates") or [props.get("x"), props.get("y")]
+        lons.append(float(coords[0]) if coords[0] is not None else float("nan"))
+        lats.append(float(coords[1]) if coords[1] is not None else float("nan"))
+        for key in keys:
+            columns[key].append(props.get(key))
+    return columns, lats, lons
+
+
+@traced("geojson.catalog_load")
+def _load_catalog(path: str, stamp) -> LocationCatalog:
+    cache_path = _pickle_path(path)
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, "rb") as f:
+                cached = pickle.load(f)
+            if cached.get("format") == CATALOG_FORMAT and tuple(cached.get("stamp", ())) == stamp:
+                return LocationCatalog(path, stamp, cached["columns"], cached["lats"], cached["lons"])
+        except Exception as e:
+            print(f"Peringatan: cache katalog lokasi rusak ({e}), parse ulang GeoJSON.")
+
+    columns, lats, lons = _parse_geojson(path)
+    try:
+        os.makedirs(CATALOG_CACHE_DIR, exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"format": CATALOG_FORMAT, "stamp": stamp, "columns": columns,
+                         "lats": lats, "lons": lons}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Peringatan: gagal menyimpan cache katalog lokasi: {e}")
+    return LocationCatalog(path, stamp, columns, lats, lons)
+
+
+def get_location_catalog(path: str = DEFAULT_LOCATIONS) -> LocationCatalog:
+    """
+    Katalog untuk `path`. Dimuat ulang hanya jika mtime/ukuran file berubah.
+    FileNotFoundError / json.JSONDecodeError diteruskan ke pemanggil.
+    """
+    path = os.path.abspath(path)
+    stamp = _file_stamp(path)
+    with _lock:
+        catalog = _catalogs.get(path)
+        if catalog is None or catalog.stamp != stamp:
+            catalog = _load_catalog(path, stamp)
+            _catalogs[path] = catalog
+        return catalog
+
+
+def clear_location_cache() -> None:
+    with _lock:
+        _catalogs.clear()
@@ -0,0 +1,543 @@
+"""
+map_cache.py
+Cache data routing per proses: snapshot graf peta, indeks nama -> simpul,
+dan tabel jarak/rute dari depot.
+
+Routing & analisis memakai graf yang sudah disederhanakan (rantai derajat 2
+dikontraksi, jarak antar simpul tersisa tidak berubah; lihat graph_simplify.py).
+Simpang bernama di GeoJSON lokasi dan simpul terdekat tiap lokasi tidak dikontraksi,
+dan pemetaan osmid asli -> simpul graf kecil ikut disimpan di snapshot sehingga
+osmid dari data peta tetap bisa di-resolve (RoutingData.resolve_node).
+
+Data ini mahal dibuat (impor osmnx/geopandas, unduh/parse graf, nearest-node,
+Dijkstra dari depot) tetapi tidak berubah selama aplikasi berjalan, sehingga
+cukup dibuat SEKALI lalu dipakai bersama oleh semua dialog seller. Semua fungsi
+aman dipanggil dari thread lain (prefetch di background setelah login).
+
+Fungsi utama:
+- get_routing_data(path_geojson, depot_name): muat (sekali) lalu kembalikan RoutingData
+- peek_routing_data(path_geojson): RoutingData jika sudah siap, tanpa memuat
+- is_routing_ready(path_geojson): True jika data sudah hangat
+- load_graph_snapshot(point, distance, network_type): graf peta ASLI dari snapshot disk/OSMnx
+- load_routing_graph(point, distance, network_type, keep, keep_points, check_from):
+  graf routing kecil (snapshot sendiri)
+- graph_version(point, distance, network_type, path_geojson): versi graf routing dari isi graf
+  (tanpa memuat graf setelah dihitung sekali), None jika snapshot belum ada
+- clear_routing_cache(): kosongkan cache di memori
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from logic.tracing import span, traced
+
+# Pusat area & parameter graf yang dipakai seluruh aplikasi
+DEFAULT_POINT = (-6.872, 107.578)
+DEFAULT_DISTANCE = 1000
+DEFAULT_NETWORK_TYPE = "drive"
+DEFAULT_DEPOT_NAME = "Depot Air Pusat"
+SEGMENT_SNAP_M = 15      # rata-rata jarak polyline peta ke geometry ruas graf
+METER_PER_DERAJAT = 111320.0
+
+GRAPH_DIR = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_DIR = os.path.join(GRAPH_DIR, "cache")
+DEFAULT_GEOJSON = os.path.join(GRAPH_DIR, "intersections_area.geojson")
+
+# _lock hanya menjaga dict di bawah (dipegang sebentar). Pemuatan yang lama memakai
+# kunci per kunci-cache (_key_lock): pemanggil lain untuk data yang SAMA menunggu
+# hasilnya, sedangkan thread GUI yang hanya membaca cache (peek_*) tidak pernah ikut
+# tertahan. Hasil dipublikasikan dengan satu assignment dict (atomik).
+_lock = threading.RLock()
+_key_locks: Dict[tuple, threading.Lock] = {}
+_graph_cache: Dict[tuple, Any] = {}
+_routing_cache: Dict[tuple, "RoutingData"] = {}
+_digest_cache: Dict[str, Tuple[tuple, str]] = {}  # path snapshot -> ((mtime_ns, ukuran), sha1 kanonik)
+
+
+def _key_lock(key: tuple) -> threading.Lock:
+    with _lock:
+        return _key_locks.setdefault(key, threading.Lock())
+
+
+class RoutingData:
+    """
+    Paket data routing yang sudah "hangat".
+
+    Atribut:
+    - G: graf routing yang disederhanakan (MultiDiGraph, geometry ruas tetap ada).
+      READ-ONLY, jangan dimodifikasi langsung. Pemetaan osmid asli ada di G.graph["simplify"].
+    - gdf_lokasi: GeoDataFrame lokasi (intersection_name, osmid, geometry)
+    - locations: LocationCatalog file GeoJSON yang sama (nama -> koordinat/osmid/region)
+    - name_to_node: intersection_name -> simpul graf routing (simpul asli terdekat, dipertahankan)
+    - node_to_name: simpul graf -> intersection_name (simpang di simpul itu bila ada)
+    - depot_name / depot_node
+    - depot_dist: simpul -> jarak (meter) dari depot
+    - depot_paths: simpul -> daftar simpul rute terpendek dari depot
+    - depot_tree: ShortestPathTree dari depot (dibuat saat pertama dipakai); simulasi
+      penutupan memakai depot_tree.with_closures(...) alih-alih copy graf + Dijkstra ulang
+    - alternative_router: AlternativeRouter atas CSR depot_tree (rute alternatif k-terpendek
+      yang beragam, di-cache per awal/tujuan/penutupan)
+    """
+
+    def __init__(self, G, gdf_lokasi, name_to_node: Dict[str, Any], depot_name: str,
+                 depot_node, depot_dist: Dict[Any, float], depot_paths: Dict[Any, list],
+                 path_geojson: str, locations=None):
+        self.G = G
+        self.gdf_lokasi = gdf_lokasi
+        self.name_to_node = name_to_node
+        # Beberapa lokasi di luar graf drive bisa jatuh ke simpul yang sama: label simpul
+        # memakai simpang yang osmid-nya memang simpul itu, selain itu nama pertama
+        osmids = locations.name_to_osmid if locations is not None else {}
+        self.node_to_name = {}
+        for name, node in name_to_node.items():
+            if node not in self.node_to_name or str(osmids.get(name)) == str(node):
+                self.node_to_name[node] = name
+        self.depot_name = depot_name
+        self.depot_node = depot_node
+        self.depot_dist = depot_dist
+        self.depot_paths = depot_paths
+        self.path_geojson = path_geojson
+        self.locations = locations
+        self._depot_tree = None
+        self._alternative_router = None
+        self._edge_index = None
+        self._lazy_lock = threading.Lock()
+
+    @property
+    def depot_tree(self):
+        """SPT berakar di depot (dari depot_dist/depot_paths, tanpa Dijkstra ulang) atau None."""
+        if self._depot_tree is None and self.depot_node is not None:
+            with self._lazy_lock:
+                if self._depot_tree is None:
+                    from logic.graph.shortest_path_tree import ShortestPathTree
+                    with span("route.spt_build"):
+                        self._depot_tree = ShortestPathTree(self.G, self.depot_node, dist=self.depot_dist,
+                                                            paths=self.depot_paths)
+        return self._depot_tree
+
+    @property
+    def alternative_router(self):
+        """AlternativeRouter yang memakai CSR depot_tree (None jika depot tidak ada)."""
+        if self._alternative_router is None:
+            tree = self.depot_tree
+            if tree is None:
+                return None
+            with self._lazy_lock:
+                if self._alternative_router is None:
+                    from logic.graph.alternative_routes import AlternativeRouter
+                    self._alternative_router = AlternativeRouter(tree)
+        return self._alternative_router
+
+    def resolve_node(self, osmid) -> Optional[Any]:
+        """Simpul graf routing untuk osmid asli dari data peta, atau None."""
+        from logic.graph.graph_simplify import resolve_node
+        return resolve_node(self.G, osmid)
+
+    def _edge_geometries(self):
+        """(STRtree geometry ruas, daftar (u, v)) graf routing, dibuat sekali."""
+        if self._edge_index is None:
+            with self._lazy_lock:
+                if self._edge_index is None:
+                    from shapely.geometry import LineString
+                    from shapely.strtree import STRtree
+                    pairs, geoms = [], []
+                    for u, v, data in self.G.edges(data=True):
+                        geom = data.get("geometry")
+                        if geom is None:
+                            geom = LineString([(self.G.nodes[u]["x"], self.G.nodes[u]["y"]),
+                                               (self.G.nodes[v]["x"], self.G.nodes[v]["y"])])
+                        pairs.append((u, v))
+                        geoms.append(geom)
+                    self._edge_index = (STRtree(geoms), geoms, pairs)
+        return self._edge_index
+
+    def road_segment_at(self, coords, tolerance_m: float = SEGMENT_SNAP_M) -> Optional[Tuple[Any, Any]]:
+        """
+        Ruas graf (u, v) untuk polyline jalan di peta ([[lon, lat], ...], mis. ruas yang
+        diklik di halaman Simulasi). Geometry polyline dicocokkan ke geometry ruas graf
+        routing terdekat: titik-titik di sepanjang polyline (tanpa ujungnya, yang juga
+        menyentuh ruas lain di simpang) harus rata-rata berjarak <= tolerance_m.
+        Potongan jalan di dalam ruas hasil kontraksi menjadi ruas itu sendiri.
+        None jika tidak ada ruas graf di sepanjang polyline (mis. jalan di luar graf drive).
+        """
+        from shapely.geometry import LineString
+        if not coords or len(coords) < 2:
+            return None
+        line = LineString([(float(lon), float(lat)) for lon, lat in coords])
+        if line.length == 0:
+            return None
+        tree, geoms, pairs = self._edge_geometries()
+        tolerance_deg = tolerance_m / METER_PER_DERAJAT
+        samples = [line.interpolate(f, normalized=True) for f in (0.1, 0.3, 0.5, 0.7, 0.9)]
+        best, best_score = None, tolerance_deg
+        for i in tree.query(line, predicate="dwithin", distance=tolerance_deg):
+            score = sum(geoms[i].distance(p) for p in samples) / len(samples)
+            if score <= best_score:
+                best, best_score = pairs[i], score
+        return best
+
+    def depot_route(self, nama_tujuan: str) -> Tuple[Optional[List[tuple]], Optional[float]]:
+        """
+        Rute terpendek depot -> nama_tujuan dari tabel yang sudah dihitung.
+        Format sama dengan cari_rute_by_nama: (daftar_sisi_rute, panjang_km) atau (None, None).
+        """
+        node = self.name_to_node.get(nama_tujuan)
+        if node is None or node not in self.depot_paths:
+            return None, None
+        path = self.depot_paths[node]
+        return list(zip(path, path[1:])), float(self.depot_dist[node]) / 1000
+
+
+def _osmnx_version() -> str:
+    """Versi osmnx dari metadata paket (tanpa mengimpor osmnx yang berat)."""
+    try:
+        from importlib.metadata import version
+        return version("osmnx")
+    except Exception:
+        import osmnx as ox
+        return ox.__version__
+
+
+def _snapshot_path(point, distance, network_type) -> str:
+    key = f"{point[0]:.6f},{point[1]:.6f}|{distance}|{network_type}|osmnx-{_osmnx_version()}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return os.path.join(SNAPSHOT_DIR, f"graph_{digest}.pkl")
+
+
+def _point_key(lon, lat) -> Tuple[float, float]:
+    return round(float(lon), 7), round(float(lat), 7)
+
+
+def _routing_keep(path_geojson: str) -> Tuple[Tuple[int, ...], Tuple[Tuple[float, float], ...]]:
+    """
+    (osmid simpang bernama, titik (lon, lat) tiap nama lokasi) dari file lokasi.
+    Simpul osmid tersebut dan simpul asli terdekat tiap titik tidak boleh dikontraksi.
+    """
+    from logic.graph.location_catalog import get_location_catalog
+    catalog = get_location_catalog(path_geojson)
+    keep = set()
+    for osmid in catalog.name_to_osmid.values():
+        try:
+            keep.add(int(osmid))
+        except (TypeError, ValueError):
+            continue
+    points = {_point_key(lon, lat) for lat, lon in catalog.name_to_coords.values()}
+    return tuple(sorted(keep)), tuple(sorted(points))
+
+
+def _keep_digest(keep, keep_points=()) -> str:
+    keep_parts = [",".join(map(str, keep))] + [f"{lon:.7f},{lat:.7f}" for lon, lat in keep_points]
+    return hashlib.sha1("|".join(keep_parts).encode("utf-8")).hexdigest()
+
+
+def _routing_snapshot_path(point, distance, network_type, keep, keep_points=()) -> str:
+    from logic.graph.graph_simplify import SIMPLIFY_VERSION
+    base = os.path.basename(_snapshot_path(point, distance, network_type))
+    key = f"{base}|simplify-{SIMPLIFY_VERSION}|{_keep_digest(keep, keep_points)}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return os.path.join(SNAPSHOT_DIR, f"routing_{digest}.pkl")
+
+
+def _graph_digest(G) -> str:
+    """
+    sha1 bentuk kanonik graf: simpul urut (osmid, x, y) + sisi urut (u, v, k, length).
+    Atribut graf (created_date, versi osmnx) dan urutan penyisipan tidak ikut dihitung,
+    jadi graf yang sama memberi nilai yang sama walaupun snapshot-nya ditulis ulang.
+    """
+    h = hashlib.sha1()
+    for n, d in sorted(G.nodes(data=True), key=lambda item: item[0]):
+        h.update(f"n{n},{float(d['x']):.7f},{float(d['y']):.7f};".encode("utf-8"))
+    edges = sorted((u, v, k, float(d.get("length", 0.0))) for u, v, k, d in G.edges(keys=True, data=True))
+    for u, v, k, length in edges:
+        h.update(f"e{u},{v},{k},{length:.3f};".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _store_digest(path: str, digest: str):
+    """Catat sha1 kanonik snapshot `path` di memori dan di file pendamping <snapshot>.sha1."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return
+    stamp = (st.st_mtime_ns, st.st_size)
+    _digest_cache[path] = (stamp, digest)
+    try:
+        tmp_path = path + ".sha1.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"stamp": list(stamp), "sha1": digest}, f)
+        os.replace(tmp_path, path + ".sha1")
+    except OSError as e:
+        print(f"Peringatan: gagal menyimpan versi snapshot graf: {e}")
+
+
+def _snapshot_digest(path: str) -> Optional[str]:
+    """
+    sha1 kanonik (_graph_digest) snapshot graf `path`; None jika snapshot belum ada.
+    Nilainya dibaca dari file pendamping selama mtime/ukuran snapshot sama, sehingga
+    graf hanya dimuat sekali per penulisan snapshot; selebihnya cukup os.stat.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _digest_cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    try:
+        with open(path + ".sha1", "r", encoding="utf-8") as f:
+            record = json.load(f)
+        if tuple(record["stamp"]) == stamp:
+            _digest_cache[path] = (stamp, record["sha1"])
+            return record["sha1"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    try:
+        with open(path, "rb") as f:
+            G = pickle.load(f)
+    except Exception as e:
+        print(f"Peringatan: snapshot graf tidak bisa dibaca untuk versi ({e})")
+        return None
+    digest = _graph_digest(G)
+    _store_digest(path, digest)
+    return digest
+
+
+def graph_version(point=DEFAULT_POINT, distance: int = DEFAULT_DISTANCE,
+                  network_type: str = DEFAULT_NETWORK_TYPE,
+                  path_geojson: str = DEFAULT_GEOJSON) -> Optional[str]:
+    """
+    Versi graf routing (12 hex): isi kanonik graf asli (_graph_digest) + versi
+    penyederhanaan + simpang bernama yang dipertahankan. Graf yang sama memberi versi
+    yang sama di mesin mana pun dan setelah cache/ dihapus lalu dibangun ulang.
+    None jika snapshot graf belum ada (versi belum diketahui).
+    Dipakai untuk memvalidasi rute tersimpan di pesanan serta isokron & tabel ongkir.
+    """
+    from logic.graph.graph_simplify import SIMPLIFY_VERSION
+    digest = _snapshot_digest(_snapshot_path(point, distance, network_type))
+    if digest is None:
+        return None
+    key = f"simplify-{SIMPLIFY_VERSION}|{_keep_digest(*_routing_keep(path_geojson))}|{digest}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+
+
+def load_graph_snapshot(point=DEFAULT_POINT, distance: int = DEFAULT_DISTANCE,
+                        network_type: str = DEFAULT_NETWORK_TYPE):
+    """
+    Muat graf peta. Urutan: cache memori -> snapshot pickle di disk -> rakit dari
+    respons Overpass ter-cache (overpass_cache, tanpa jaringan) -> unduh via OSMnx.
+    Snapshot disk ditulis setelah graf berhasil dibuat sehingga start berikutnya
+    jauh lebih cepat.
+    """
+    key = (tuple(point), distance, network_type)
+    with _key_lock(("graph",) + key):
+        if key in _graph_cache:
+            return _graph_cache[key]
+
+        with span("graph.load") as sp:
+            path = _snapshot_path(point, distance, network_type)
+            G = None
+            from_snapshot = False
+            if os.path.exists(path):
+                try:
+                    with open(path, "rb") as f:
+                        G = pickle.load(f)
+                    from_snapshot = True
+                    sp["source"] = "snapshot"
+                    print(f"[OK] Snapshot graf dimuat dari {path}")
+                except Exception as e:
+                    print(f"Peringatan: snapshot graf rusak ({e}), memuat ulang dari OSMnx.")
+                    G = None
+
+            if G is None:
+                # Tanpa jaringan: rakit dari respons Overpass yang sudah ada di cache/
+                from logic.graph.overpass_cache import OverpassCacheError, graph_from_cache
+                try:
+                    G = graph_from_cache(point, distance, network_type)
+                    sp["source"] = "overpass_cache"
+                except OverpassCacheError as e:
+                    print(f"{e} Mengunduh dari OpenStreetMap...")
+
+            if G is None:
+                import osmnx as ox
+                print("Memuat graf jaringan jalan dari OpenStreetMap...")
+                G = ox.graph_from_point(point, dist=distance, network_type=network_type)
+                sp["source"] = "osmnx"
+
+            if not from_snapshot:
+                try:
+                    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+                    tmp_path = path + ".tmp"
+                    with open(tmp_path, "wb") as f:
+                        pickle.dump(G, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    os.replace(tmp_path, path)
+                    _store_digest(path, _graph_digest(G))
+                except Exception as e:
+                    print(f"Peringatan: gagal menyimpan snapshot graf: {e}")
+
+        _graph_cache[key] = G
+        return G
+
+
+def load_routing_graph(point=DEFAULT_POINT, distance: int = DEFAULT_DISTANCE,
+                       network_type: str = DEFAULT_NETWORK_TYPE, keep=(), keep_points=(),
+                       check_from=None):
+    """
+    Graf routing yang disederhanakan (graph_simplify.simplify_routing_graph) dari graf
+    asli. Urutan: cache memori -> snapshot routing di disk -> bangun dari
+    load_graph_snapshot lalu simpan.
+    - keep: osmid yang tidak boleh dikontraksi
+    - keep_points: titik (lon, lat); simpul asli terdekatnya juga dipertahankan dan
+      dicatat di G.graph["simplify"]["point_node"] (dipakai _build_name_index)
+    - check_from: titik (lon, lat), mis. depot; saat graf dibangun, jarak dari simpul
+      terdekatnya ke semua simpul dicek sama dengan graf asli (check_distances)
+    """
+    keep = tuple(sorted(int(o) for o in keep))
+    keep_points = tuple(sorted(_point_key(lon, lat) for lon, lat in keep_points))
+    path = _routing_snapshot_path(point, distance, network_type, keep, keep_points)
+    key = (tuple(point), distance, network_type, "routing", os.path.basename(path))
+    with _key_lock(key):
+        if key in _graph_cache:
+            return _graph_cache[key]
+
+        G = None
+        with span("graph.routing_load") as sp:
+            if os.path.exists(path):
+                try:
+                    with open(path, "rb") as f:
+                        G = pickle.load(f)
+                    sp["source"] = "snapshot"
+                except Exception as e:
+                    print(f"Peringatan: snapshot graf routing rusak ({e}), dibangun ulang.")
+                    G = None
+
+            if G is None:
+                import osmnx as ox
+                from logic.graph.graph_simplify import check_distances, simplify_routing_graph
+                base = load_graph_snapshot(point, distance, network_type)
+                anchors = list(keep_points) + ([_point_key(*check_from)] if check_from else [])
+                nearest = ox.distance.nearest_nodes(base, X=[p[0] for p in anchors],
+                                                    Y=[p[1] for p in anchors]) if anchors else []
+                point_node = dict(zip(anchors, (int(n) for n in nearest)))
+                G = simplify_routing_graph(base, keep=set(keep) | set(point_node.values()))
+                G.graph["simplify"]["point_node"] = point_node
+                sp["source"] = "simplify"
+                print(f"[OK] Graf routing disederhanakan: {base.number_of_nodes()} -> "
+                      f"{G.number_of_nodes()} simpul, {base.number_of_edges()} -> {G.number_of_edges()} ruas")
+                if check_from:
+                    # Jarak harus identik; graf yang salah tidak boleh sampai ke snapshot
+                    worst = check_distances(base, G, [point_node[_point_key(*check_from)]])
+                    print(f"[OK] Jarak dari depot tidak berubah (selisih maks {worst:.2e} m)")
+                try:
+                    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+                    tmp_path = path + ".tmp"
+                    with open(tmp_path, "wb") as f:
+                        pickle.dump(G, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    os.replace(tmp_path, path)
+                except Exception as e:
+                    print(f"Peringatan: gagal menyimpan snapshot graf routing: {e}")
+            sp["nodes"] = G.number_of_nodes()
+
+        _graph_cache[key] = G
+        return G
+
+
+def _build_name_index(G, gdf_lokasi) -> Dict[str, Any]:
+    """
+    Petakan semua intersection_name ke simpul ASLI terdekat, seperti pada graf
+    lengkap. Simpul itu dicatat & dipertahankan saat graf routing dibangun
+    (point_node), jadi jarak per nama sama persis; titik yang tidak tercatat jatuh ke
+    simpul terdekat graf routing (satu panggilan nearest_nodes).
+    """
+    import osmnx as ox
+    if gdf_lokasi is None or gdf_lokasi.empty:
+        return {}
+    gdf = gdf_lokasi[gdf_lokasi["intersection_name"].notna()]
+    gdf = gdf.drop_duplicates(subset="intersection_name", keep="first")
+    names = gdf["intersection_name"].tolist()
+    point_node = (G.graph.get("simplify") or {}).get("point_node", {})
+    index = {}
+    for name, x, y in zip(names, gdf.geometry.x.tolist(), gdf.geometry.y.tolist()):
+        node = point_node.get(_point_key(x, y))
+        index[name] = node if node in G else None
+    missing = [i for i, name in enumerate(names) if index[name] is None]
+    if missing:
+        rows = gdf.iloc[missing]
+        nodes = ox.distance.nearest_nodes(G, X=rows.geometry.x.to_numpy(), Y=rows.geometry.y.to_numpy())
+        index.update(zip(rows["intersection_name"].tolist(), list(nodes)))
+    return index
+
+
+@traced("graph.routing_data")
+def _build_routing_data(path_geojson: str, depot_name: str, point, distance, network_type) -> RoutingData:
+    import networkx as nx
+    from logic.graph.location_catalog import get_location_catalog
+
+    locations = get_location_catalog(path_geojson)
+    keep, keep_points = _routing_keep(path_geojson)
+    G = load_routing_graph(point, distance, network_type, keep=keep, keep_points=keep_points,
+                           check_from=locations.coords_lonlat(depot_name))
+    gdf_lokasi = locations.to_gdf()
+    with span("route.name_index", names=len(locations)):
+        name_to_node = _build_name_index(G, gdf_lokasi)
+
+    depot_node = name_to_node.get(depot_name)
+    depot_dist, depot_paths = {}, {}
+    if depot_node is not None:
+        with span("route.depot_sssp"):
+            depot_dist, depot_paths = nx.single_source_dijkstra(G, depot_node, weight="length")
+    else:
+        print(f"Peringatan: depot '{depot_name}' tidak ditemukan di {path_geojson}.")
+
+    return RoutingData(G, gdf_lokasi, name_to_node, depot_name, depot_node,
+                       depot_dist, depot_paths, path_geojson, locations)
+
+
+def get_routing_data(path_geojson: str = DEFAULT_GEOJSON, depot_name: str = DEFAULT_DEPOT_NAME,
+                     point=DEFAULT_POINT, distance: int = DEFAULT_DISTANCE,
+                     network_type: str = DEFAULT_NETWORK_TYPE) -> Optional[RoutingData]:
+    """
+    Kembalikan RoutingData untuk file GeoJSON lokasi tertentu, memuatnya bila belum ada.
+    Jika prefetch sedang berjalan di thread lain, panggilan ini menunggu hasilnya
+    (tidak memuat dua kali); hanya pemanggil untuk data yang sama yang menunggu.
+    Thread GUI yang tidak boleh tertahan memakai peek_routing_data. None jika gagal.
+    """
+    key = (os.path.abspath(path_geojson), depot_name, tuple(point), distance, network_type)
+    data = _routing_cache.get(key)
+    if data is not None:
+        return data
+    with _key_lock(("routing",) + key):
+        data = _routing_cache.get(key)
+        if data is not None:
+            return data
+        try:
+            data = _build_routing_data(key[0], depot_name, point, distance, network_type)
+        except Exception as e:
+            print(f"[ERROR] Gagal memuat data routing: {e}")
+            return None
+        _routing_cache[key] = data
+        return data
+
+
+def peek_routing_data(path_geojson: str = DEFAULT_GEOJSON, depot_name: str = DEFAULT_DEPOT_NAME,
+                      point=DEFAULT_POINT, distance: int = DEFAULT_DISTANCE,
+                      network_type: str = DEFAULT_NETWORK_TYPE) -> Optional[RoutingData]:
+    """RoutingData jika sudah dimuat, atau None (tidak pernah memblokir untuk memuat)."""
+    key = (os.path.abspath(path_geojson), depot_name, tuple(point), distance, network_type)
+    return _routing_cache.get(key)
+
+
+def is_routing_ready(path_geojson: str = DEFAULT_GEOJSON, depot_name: str = DEFAULT_DEPOT_NAME) -> bool:
+    return peek_routing_data(path_geojson, depot_name) is not None
+
+
+def clear_routing_cache() -> None:
+    """Kosongkan cache di memori (snapshot disk tetap dipertahankan)."""
+    with _lock:
+        _graph_cache.clear()
+        _routing_cache.clear()
+        _key_locks.clear()
@@ -0,0 +1,841 @@
+"""
+map_render.py
+Generator peta interaktif (road_map_detailed.html) yang ramping & berbasis data.
+
+Versi lama (folium) menulis satu layer GeoJson + tooltip per ruas jalan dan satu
+CircleMarker + <script> tambahan per simpang, sehingga HTML mencapai puluhan ribu
+baris dan lambat di-parse QWebEngine. Di sini semua ruas jalan dikirim sebagai
+SATU FeatureCollection dan semua simpang sebagai SATU array ringkas; gaya &
+tooltip dibuat oleh fungsi JS. Data bisa di-inline atau ditulis ke file .js terpisah.
+
+JS kustom halaman (markerList, cutLayersByCoord, editMarker, exportGeoJSON, dst.)
+dipertahankan apa adanya dan nama variabel peta (MAP_VAR) tetap sama, sehingga
+halaman Simulasi & testgui tetap bekerja tanpa perubahan.
+
+Fungsi utama:
+- road_features_from_edges(edges_gdf): fitur LineString ringkas dari GeoDataFrame edge OSMnx
+- road_features_from_graph(G): sama, langsung dari graf OSMnx
+- road_features_from_folium_html(path): migrasi ruas jalan dari HTML folium lama
+- load_map_data(path): baca kembali blob data dari HTML/.js hasil generator ini
+- intersection_rows_from_geojson(path) / intersection_rows_from_gdf(gdf): [lat, lon, nama, osmid]
+- intersection_rows_from_folium_html(path): baris simpang dari HTML folium lama (migrasi)
+- build_map_data(road_features, intersection_rows): blob data peta
+- render_map_html(data, center, zoom, data_src): string HTML
+- write_road_map(path, road_features, intersection_rows, center, zoom, external_data): tulis HTML (+ .js)
+- collect_map_sources(...): sumber data (ruas jalan & simpang) untuk CLI peta/tile
+
+Pemakaian (regenerasi peta bawaan aplikasi dari snapshot graf & output.geojson):
+    python -m logic.graph.map_render
+    python -m logic.graph.map_render --from-folium-html lama.html   # migrasi dari HTML folium
+"""
+
+import json
+import os
+
+from logic.graph.naming import UNNAMED_ROAD, first_road_name, unique_road_names
+
+# Nama variabel peta Leaflet; dirujuk langsung oleh JS kustom (cutLayersByCoord, dll.)
+MAP_VAR = "map_4325a5f18c9e89067a7ebd47c8b97130"
+
+DEFAULT_CENTER = (-6.8713141, 107.5804271)
+DEFAULT_ZOOM = 15
+COORD_PRECISION = 7  # sama dengan presisi output.geojson (toleransi cut = 1e-6)
+
+GRAPH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_HTML = os.path.join(GRAPH_DIR, "road_map_detailed.html")
+DEFAULT_INTERSECTIONS = os.path.join(GRAPH_DIR, "output.geojson")
+
+
+# =============================================================================
+# DATA
+# =============================================================================
+
+def _round_coords(coords) -> list:
+    return [[round(float(x), COORD_PRECISION), round(float(y), COORD_PRECISION)] for x, y in coords]
+
+
+def road_features_from_edges(edges_gdf, name_col: str = "unique_name") -> list:
+    """
+    Fitur LineString ringkas dari GeoDataFrame edge OSMnx.
+    Properti dipendekkan: n = nama jalan, l = panjang (meter).
+    Ruas dua arah (u->v & v->u) cukup digambar sekali.
+    """
+    if name_col in edges_gdf.columns:
+        names = edges_gdf[name_col].tolist()
+    else:
+        names = unique_road_names(edges_gdf["name"].tolist() if "name" in edges_gdf.columns else [None] * len(edges_gdf))
+
+    features = []
+    seen = set()
+    index = edges_gdf.index
+    has_uvk = getattr(index, "nlevels", 1) == 3
+    for i, (geom, length) in enumerate(zip(edges_gdf.geometry, edges_gdf["length"])):
+        if has_uvk:
+            u, v, k = index[i]
+            key = (min(u, v), max(u, v), k)
+            if key in seen:
+                continue
+            seen.add(key)
+        features.append({
+            "type": "Feature",
+            "geometry": {"type": "LineString", "coordinates": _round_coords(geom.coords)},
+            "properties": {"n": first_road_name(names[i]), "l": round(float(length), 2)},
+        })
+    return features
+
+
+def road_features_from_graph(G) -> list:
+    """Fitur jalan langsung dari graf OSMnx (nama unik dibuat seperti scrape_roads)."""
+    import osmnx as ox
+    edges = ox.graph_to_gdfs(G, nodes=False)
+    edges["unique_name"] = unique_road_names(edges["name"].tolist() if "name" in edges.columns else [None] * len(edges))
+    return road_features_from_edges(edges)
+
+
+def road_features_from_folium_html(path: str) -> list:
+    """
+    Migrasi: ambil ruas jalan (geometri + nama + panjang) dari road_map_detailed.html
+    versi folium lama, yang berisi satu layer `geo_json_<hash>` + tooltip per ruas.
+    """
+    import html as html_lib
+    import re
+
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    geoms = re.findall(r"\n\s*(geo_json_[0-9a-f]+)_add\((\{.*?\})\);\n", text)
+    tips = {
+        var: (html_lib.unescape(name), float(length))
+        for var, name, length in re.findall(
+            r"(geo_json_[0-9a-f]+)\.bindTooltip\(\s*`<div>\s*<b>(.*?)</b><br>Panjang: ([\d.]+) m", text
+        )
+    }
+
+    features = []
+    seen = set()
+    for var, blob in geoms:
+        name, length = tips.get(var, (UNNAMED_ROAD, 0.0))
+        for feat in json.loads(blob).get("features", []):
+            coords = _round_coords(feat["geometry"]["coordinates"])
+            # Ruas dua arah tersimpan dua kali dengan urutan titik terbalik
+            key = min(tuple(map(tuple, coords)), tuple(map(tuple, reversed(coords))))
+            if key in seen:
+                continue
+            seen.add(key)
+            features.append({
+                "type": "Feature",
+                "geometry": {"type": "LineString", "coordinates": coords},
+                "properties": {"n": name, "l": round(length, 2)},
+            })
+    return features
+
+
+def load_map_data(path: str) -> dict | None:
+    """Ambil kembali blob data dari HTML (atau file _data.js) hasil generator ini."""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    marker = "window.AQUA_MAP_DATA = "
+    start = text.find(marker)
+    if start < 0:
+        return None
+    data, _ = json.JSONDecoder().raw_decode(text, start + len(marker))
+    return data
+
+
+def intersection_rows_from_geojson(path: str) -> list:
+    """Baca GeoJSON simpang (output.geojson) menjadi baris [lat, lon, nama, osmid]."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    rows = []
+    for feat in data.get("features", []):
+        coords = (feat.get("geometry") or {}).get("coordinates")
+        if not coords:
+            continue
+        props = feat.get("properties") or {}
+        rows.append([
+            round(float(coords[1]), COORD_PRECISION),
+            round(float(coords[0]), COORD_PRECISION),
+            props.get("intersection_name") or "",
+            props.get("osmid"),
+        ])
+    return rows
+
+
+def intersection_rows_from_folium_html(path: str) -> list:
+    """
+    Migrasi: baris [lat, lon, nama, osmid] dari marker `circle_marker_<hash>` + tooltip
+    "<b>nama</b><br>ID: osmid" di road_map_detailed.html versi folium lama.
+    """
+    import html as html_lib
+    import re
+
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    points = re.findall(r"var (circle_marker_[0-9a-f]+) = L\.circleMarker\(\s*\[([-\d.]+),\s*([-\d.]+)\]", text)
+    tips = {
+        var: (html_lib.unescape(name), osmid)
+        for var, name, osmid in re.findall(
+            r"(circle_marker_[0-9a-f]+)\.bindTooltip\(\s*`<div>\s*<b>(.*?)</b><br>ID: (\w*)", text
+        )
+    }
+    rows = []
+    for var, lat, lon in points:
+        name, osmid = tips.get(var, ("", ""))
+        rows.append([
+            round(float(lat), COORD_PRECISION),
+            round(float(lon), COORD_PRECISION),
+            name,
+            int(osmid) if osmid.isdigit() else (osmid or None),
+        ])
+    return rows
+
+
+def intersection_rows_from_gdf(gdf) -> list:
+    """Sama seperti intersection_rows_from_geojson, dari GeoDataFrame (index = osmid)."""
+    rows = []
+    for osmid, geom, name in zip(gdf.index, gdf.geometry, gdf["intersection_name"]):
+        rows.append([
+            round(float(geom.y), COORD_PRECISION),
+            round(float(geom.x), COORD_PRECISION),
+            "" if name is None else str(name),
+            int(osmid) if str(osmid).isdigit() else str(osmid),
+        ])
+    return rows
+
+
+def build_map_data(road_features: list, intersection_rows: list) -> dict:
+    return {
+        "roads": {"type": "FeatureCollection", "features": road_features},
+        "nodes": intersection_rows,  # [lat, lon, intersection_name, osmid]
+    }
+
+
+# =============================================================================
+# HTML
+# =============================================================================
+
+# Jembatan QWebChannel (dipakai testgui: geoBackend.saveGeoJSON, graphHandler.saveGraphHTML
+# & graphHandler.loadMarkerEdits). Hasil edit marker disimpan di sidecar (marker_store.py),
+# bukan di HTML ini; aquaApplyMarkerEdits menerapkannya saat runtime.
+CHANNEL_JS = r"""
+            var backend;
+            var graphHandler;
+            // {key: {nama, id}} dari sidecar; juga diterapkan ke marker tile yang dimuat belakangan
+            var aquaMarkerEdits = {};
+
+            function aquaApplyMarkerEdits(edits) {
+                Object.assign(aquaMarkerEdits, edits || {});
+                if (typeof intersections_layer === "undefined") { return; }
+                intersections_layer.eachLayer(function (marker) {
+                    const e = aquaMarkerEdits[marker._key];
+                    if (!e) { return; }
+                    if (e.nama) { marker._intersection = e.nama; }
+                    if (e.id) { marker._nodeId = e.id; }
+                    if (marker._data) {
+                        marker._data.nama = marker._intersection;
+                        marker._data.id = marker._nodeId;
+                    }
+                });
+            }
+
+            // Mode pilih ruas (halaman Simulasi, mode "Edge"): klik jalan -> simBridge.roadClicked
+            var aquaEdgeMode = false, aquaSelectedRoad = null;
+            // Ruas yang sudah di-cut ([[lon, lat], [lon, lat]]); tile yang dimuat belakangan ikut disaring
+            var aquaCutRoads = [];
+
+            function aquaSetEdgeMode(on) {
+                aquaEdgeMode = !!on;
+                if (!aquaEdgeMode) { aquaSelectRoad(null); }
+            }
+
+            function aquaSelectRoad(layer) {
+                if (aquaSelectedRoad && roads_layer.hasLayer(aquaSelectedRoad)) { roads_layer.resetStyle(aquaSelectedRoad); }
+                aquaSelectedRoad = layer;
+                if (layer) { layer.setStyle({color: "#FB8C00", weight: 6}); }
+            }
+
+            function aquaRoadClicked(feature, layer) {
+                if (!aquaEdgeMode || !window.simBridge) { return; }
+                aquaSelectRoad(layer);
+                const c = feature.geometry.coordinates;
+                simBridge.roadClicked(JSON.stringify({
+                    name: (feature.properties || {}).n || "",
+                    coords: [c[0], c[c.length - 1]]
+                }));
+            }
+
+            function aquaRoadMatches(coords, ends) {
+                const tol = 0.000001;
+                const a = coords[0], b = coords[coords.length - 1];
+                const same = (p, q) => Math.abs(p[0] - q[0]) < tol && Math.abs(p[1] - q[1]) < tol;
+                return (same(a, ends[0]) && same(b, ends[1])) || (same(a, ends[1]) && same(b, ends[0]));
+            }
+
+            function cutRoadByCoords(payload) {
+                aquaCutRoads.push(payload.coords);
+                let removed = 0;
+                roads_layer.eachLayer(function (layer) {
+                    if (aquaRoadMatches(layer.feature.geometry.coordinates, payload.coords)) {
+                        roads_layer.removeLayer(layer);
+                        removed++;
+                    }
+                });
+                if (removed === 0) { console.warn("Ruas untuk di-cut tidak ditemukan:", payload); }
+                aquaSelectRoad(null);
+            }
+
+            new QWebChannel(qt.webChannelTransport, function(channel) {
+                window.backend = channel.objects.geoBackend;      // untuk saveGeoJSON
+                window.graphHandler = channel.objects.graphHandler; // untuk saveGraphHTML
+                window.simBridge = channel.objects.simBridge;     // halaman Simulasi (pilih ruas)
+                if (window.graphHandler && graphHandler.loadMarkerEdits) {
+                    graphHandler.loadMarkerEdits(function (text) {
+                        aquaApplyMarkerEdits(JSON.parse(text || "{}"));
+                    });
+                }
+            });
+
+            function exportGeoJSON() {
+                if (!Array.isArray(markerList) || markerList.length === 0) {
+                    alert("Tidak ada marker untuk diekspor.");
+                    return;
+                }
+
+                const features = markerList.map(marker => {
+                    const data = marker._data || {};
+                    const lat = data.lat ?? marker.getLatLng().lat;
+                    const lng = data.lng ?? marker.getLatLng().lng;
+                    const osmid = data.id ?? null;
+                    const street_count = data.street_count ?? 0;
+
+                    // --- logika utama: jika nama diubah manual, gunakan nama baru ---
+                    let intersectionName = marker._intersection;
+                    if (data.nama && data.nama.trim() !== "" && data.nama !== marker._intersection) {
+                        intersectionName = data.nama.trim();
+                    }
+
+                    return {
+                        type: "Feature",
+                        properties: {
+                            osmid: osmid,
+                            y: lat,
+                            x: lng,
+                            street_count: street_count,
+                            intersection_name: intersectionName
+                        },
+                        geometry: {
+                            type: "Point",
+                            coordinates: [lng, lat]
+                        }
+                    };
+                });
+
+                const geojson = {
+                    type: "FeatureCollection",
+                    name: "intersections_named",
+                    crs: {
+                        type: "name",
+                        properties: { name: "urn:ogc:def:crs:OGC:1.3:CRS84" }
+                    },
+                    features: features
+                };
+
+                // 🔽 Ini yang disebut geojsonStr
+                const geojsonStr = JSON.stringify(geojson, null, 2);
+
+                // Kirim ke Python lewat QWebChannel
+                if (typeof backend !== 'undefined' && backend.saveGeoJSON) {
+                    backend.saveGeoJSON(geojsonStr);
+                } else {
+                    alert("Backend PyQt tidak tersedia.");
+                }
+            }
+
+            function exportGraphHTML() {
+                const markersData = markerList.map(marker => ({
+                    key: marker._data.key,
+                    lat: marker._data.lat,
+                    lng: marker._data.lng,
+                    nama: marker._data.nama || null,
+                    id: marker._data.id || null
+                }));
+
+                const graphData = {
+                    nodes: markersData
+                };
+
+                if (window.graphHandler && graphHandler.saveGraphHTML) {
+                    graphHandler.saveGraphHTML(JSON.stringify(graphData));
+                } else {
+                    alert("graphHandler tidak tersedia!");
+                }
+            }
+"""
+
+# Fungsi kustom halaman peta (cut, edit/hapus marker, simpan perubahan)
+CUSTOM_JS = r"""
+    let editedMarkers = [];
+    var markerList = [];
+
+    function cutLayersByCoord(payload) {
+
+        console.log("Menerima perintah Cut berdasarkan koordinat:", payload);
+
+        const markerLat = payload.marker_coords[0];
+        const markerLon = payload.marker_coords[1];
+        const nodeLon = payload.node_coords[0];
+        const nodeLat = payload.node_coords[1];
+
+        // Ganti ini dengan nama variabel peta Anda yang benar
+        const map_var = map_4325a5f18c9e89067a7ebd47c8b97130; 
+        const tolerance = 0.000001; // Toleransi untuk perbandingan float
+        
+        let layersToDelete = [];
+
+        // Pindai SEMUA layer di peta
+        map_var.eachLayer(function(layer) {
+
+            // --- Cek 1: Apakah layer ini MARKER yang cocok? ---
+            if (layer instanceof L.CircleMarker || layer instanceof L.Marker) {
+                const m_lat = layer.getLatLng().lat;
+                const m_lon = layer.getLatLng().lng;
+
+                if (Math.abs(m_lat - markerLat) < tolerance && Math.abs(m_lon - markerLon) < tolerance) {
+                    layersToDelete.push(layer);
+                    console.log("Menandai MARKER untuk dihapus.");
+                }
+            }
+
+            // --- Cek 2: Apakah layer ini EDGE (GeoJSON LineString) yang terhubung? ---
+            if (layer.feature && layer.feature.geometry && layer.feature.geometry.type === 'LineString') {
+                const coords = layer.feature.geometry.coordinates;
+                if (!coords || coords.length < 2) return; // Skip jika tidak valid
+
+                // Ambil titik awal [lon, lat]
+                const start_lon = coords[0][0];
+                const start_lat = coords[0][1];
+
+                // Ambil titik akhir [lon, lat]
+                const end_lon = coords[coords.length - 1][0];
+                const end_lat = coords[coords.length - 1][1];
+
+                // Cek titik awal
+                const start_matches = (Math.abs(start_lon - nodeLon) < tolerance && 
+                                       Math.abs(start_lat - nodeLat) < tolerance);
+                                     
+                // Cek titik akhir
+                const end_matches = (Math.abs(end_lon - nodeLon) < tolerance && 
+                                     Math.abs(end_lat - nodeLat) < tolerance);
+
+                if (start_matches || end_matches) {
+                    layersToDelete.push(layer);
+                    console.log("Menandai EDGE untuk dihapus.");
+                }
+            }
+        });
+
+        // --- Hapus semua layer yang ditandai ---
+        if (layersToDelete.length > 0) {
+            console.log(`Menghapus ${layersToDelete.length} layer...`);
+            layersToDelete.forEach(layer => {
+                map_var.removeLayer(layer);
+                
+                // Hapus dari array internal juga (jika ada)
+                let markerIndex = markerList.indexOf(layer);
+                if (markerIndex > -1) markerList.splice(markerIndex, 1);
+                
+                let edgeIndex = (typeof edgeList !== 'undefined') ? edgeList.indexOf(layer) : -1;
+                if (edgeIndex > -1) edgeList.splice(edgeIndex, 1);
+            });
+        } else {
+            console.warn("Tidak ada layer yang cocok ditemukan untuk dihapus.");
+        }
+    }
+    
+    // --- TAMBAHKAN FUNGSI BARU INI ---
+    function removeMarkerByCoords(lat, lon) {
+        console.log(`Menerima perintah untuk menghapus marker di: Lat=${lat}, Lon=${lon}`);
+        
+        // Toleransi presisi. Angka di Python dan JS bisa berbeda sangat tipis.
+        const tolerance = 0.000001; 
+        
+        let markerToDelete = null;
+
+        // --- PERUBAHAN UTAMA: Pindai SEMUA layer di peta ---
+        // Ganti 'map_4325a5f18c9e89067a7ebd47c8b97130' 
+        // dengan nama variabel peta Anda yang benar jika berbeda.
+        map_4325a5f18c9e89067a7ebd47c8b97130.eachLayer(function(layer) {
+            
+            // Cek apakah layer ini adalah marker (CircleMarker atau Marker biasa)
+            if (layer instanceof L.CircleMarker || layer instanceof L.Marker) {
+                
+                const markerLat = layer.getLatLng().lat;
+                const markerLng = layer.getLatLng().lng;
+
+                // Cek apakah koordinatnya cocok dalam batas toleransi
+                if (Math.abs(markerLat - lat) < tolerance && Math.abs(markerLng - lon) < tolerance) {
+                    markerToDelete = layer;
+                    // Log ini untuk konfirmasi internal
+                    console.log("Marker ditemukan!", layer);
+                }
+            }
+        });
+        // --- SELESAI PERUBAHAN ---
+
+        if (markerToDelete) {
+            console.log("Menghapus marker dari peta.");
+            
+            // Hapus layer marker dari peta
+            map_4325a5f18c9e89067a7ebd47c8b97130.removeLayer(markerToDelete);
+            
+            // Opsional: Hapus juga dari markerList jika ada
+            const index = markerList.indexOf(markerToDelete);
+            if (index > -1) {
+                markerList.splice(index, 1);
+            }
+        } else {
+            // Ini pesan error yang Anda lihat sebelumnya
+            console.warn(`Marker dengan koordinat ${lat}, ${lon} tidak ditemukan di peta.`);
+        }
+    }
+
+function aktifkanInteraksiSemuaMarker() {
+    map_4325a5f18c9e89067a7ebd47c8b97130.eachLayer(function(layer) {
+        if (layer instanceof L.Marker || layer instanceof L.CircleMarker) {
+            if (!layer._data) {
+                const lat = layer.getLatLng().lat;
+                const lng = layer.getLatLng().lng;
+                // nama default; key = kunci sidecar marker (osmid asli atau "lat,lng")
+                layer._data = { key: layer._key, lat: lat, lng: lng, nama: layer._intersection || "", id: layer._nodeId ?? "" };
+                markerList.push(layer);
+                layer.on('click', function () {
+                    layer.bindPopup(`
+                        <b>${layer._data.nama}</b><br>
+                        Lat: ${lat.toFixed(5)}<br>
+                        Lng: ${lng.toFixed(5)}<br>
+                        <div class="btn btn-sm btn-warning mt-2" onclick="editMarker(${lat}, ${lng})">✏️ Edit Nama</div>
+                        <div class="btn btn-sm btn-warning mt-2" onclick="editIdMarker(${lat}, ${lng})">✏️ Edit ID</div>
+                        <div class="btn btn-sm btn-danger mt-1" onclick="hapusMarker(${lat}, ${lng})">🗑️ Hapus</div>
+                        <div id="saveMarkersBtn" class="btn btn-primary" onclick="passEditedMarker()">💾 Save Markers</div>
+                    `).openPopup();
+                });
+
+            }
+        }
+    });
+}
+
+
+
+function saveEditedMarker(marker) {
+    const key = marker._data.key;
+
+    const existingIndex = editedMarkers.findIndex(m => m.key === key);
+    const data = {
+        key: key,
+        lat: marker.getLatLng().lat,
+        lng: marker.getLatLng().lng,
+        nama: marker._data.nama,
+        id: marker._data.id || ""
+    };
+
+    if (existingIndex >= 0) {
+        editedMarkers[existingIndex] = data; // update jika sudah ada
+    } else {
+        editedMarkers.push(data); // tambahkan baru
+    }
+}
+
+function passEditedMarker() {
+    if (editedMarkers.length === 0) return alert("Tidak ada marker yang diedit.");
+
+    const jsonStr = JSON.stringify(editedMarkers);
+    if (graphHandler && graphHandler.saveGraphHTML) {
+        graphHandler.saveGraphHTML(jsonStr);
+        aquaApplyMarkerEdits(Object.fromEntries(editedMarkers.map(m => [m.key, {nama: m.nama, id: m.id}])));
+        editedMarkers = [];
+        alert("✅ Marker berhasil disimpan.");
+    } else {
+        console.warn("Python handler tidak ditemukan!");
+    }
+}
+
+function editMarker(lat, lng) {
+    const marker = cariMarker(lat, lng);
+    if (marker) {
+        const newName = prompt("Masukkan nama baru:", marker._data.nama);
+        if (newName) {
+            marker._data.nama = newName;
+            marker._intersection = newName;
+            marker._data.edited = true;
+
+            // Update tooltip supaya sinkron
+            updateTooltip(marker, newName, marker._data.id || "ID Tidak Ada");
+
+            // Update popup dengan tombol edit nama dan edit ID
+            marker.setPopupContent(`
+                <b>${newName}</b><br>
+                Lat: ${lat.toFixed(5)}<br>
+                Lng: ${lng.toFixed(5)}<br>
+                <div class="btn btn-sm btn-warning mt-2" onclick="editMarker(${lat}, ${lng})">✏️ Edit Nama</div>
+                <div class="btn btn-sm btn-warning mt-2" onclick="editIdMarker(${lat}, ${lng})">✏️ Edit ID</div>
+                <div class="btn btn-sm btn-danger mt-1" onclick="hapusMarker(${lat}, ${lng})">🗑️ Hapus</div>
+                <div id="saveMarkersBtn" class="btn btn-primary" onclick="passEditedMarker()">💾 Save Markers</div>
+            `);
+
+            saveEditedMarker(marker); // simpan ke list
+        }
+    }
+}
+
+function editIdMarker(lat, lng) {
+    const marker = cariMarker(lat, lng);
+    if (marker) {
+        const newId = prompt("Masukkan ID baru:", marker._data.id || "");
+        if (newId) {
+            marker._data.id = newId;
+            marker._nodeId = newId;
+
+            // Update tooltip supaya sinkron
+            updateTooltip(marker, marker._data.nama, newId);
+
+            // Update popup agar tombol tetap muncul
+            marker.setPopupContent(`
+                <b>${marker._data.nama}</b><br>
+                Lat: ${lat.toFixed(5)}<br>
+                Lng: ${lng.toFixed(5)}<br>
+                <div class="btn btn-sm btn-warning mt-2" onclick="editMarker(${lat}, ${lng})">✏️ Edit Nama</div>
+                <div class="btn btn-sm btn-warning mt-2" onclick="editIdMarker(${lat}, ${lng})">✏️ Edit ID</div>
+                <div class="btn btn-sm btn-danger mt-1" onclick="hapusMarker(${lat}, ${lng})">🗑️ Hapus</div>
+                <div id="saveMarkersBtn" class="btn btn-primary" onclick="passEditedMarker()">💾 Save Markers</div>
+            `);
+
+            saveEditedMarker(marker); // simpan ke list
+        }
+    }
+}
+
+// Fungsi hapus marker
+function hapusMarker(lat, lng) {
+    const marker = cariMarker(lat, lng);
+    if (marker) {
+        map_4325a5f18c9e89067a7ebd47c8b97130.removeLayer(marker);
+        markerList = markerList.filter(m => m !== marker);
+    }
+}
+
+// Cari marker berdasarkan koordinat
+function cariMarker(lat, lng) {
+    return markerList.find(m => m._data.lat === lat && m._data.lng === lng);
+}
+
+// Update Tool Tip
+function updateTooltip(marker, newName, newId) {
+    marker.unbindTooltip();  // hapus tooltip lama
+
+    const newContent = `
+        <div>
+            <b>${newName}</b><br>ID: ${newId}
+        </div>
+    `;
+
+    marker.bindTooltip(newContent, { sticky: true });
+}
+"""
+
+# Pembentuk layer: satu layer jalan + satu layer simpang. Data ditambahkan lewat
+# aquaAddRoads/aquaAddNodes, baik sekaligus (blob) maupun per tile (lihat map_tiles).
+LAYERS_JS = r"""
+var roads_layer, intersections_layer, aquaAddRoads, aquaAddNodes;
+(function () {
+    function esc(s) {
+        return String(s).replace(/[&<>"']/g, function (c) {
+            return {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"}[c];
+        });
+    }
+
+    roads_layer = L.geoJson(null, {
+        style: function () { return {color: "grey", weight: 3}; },
+        onEachFeature: function (feature, layer) {
+            var p = feature.properties || {};
+            // Tooltip dibuat saat dibutuhkan saja
+            layer.bindTooltip(function () {
+                return "<div><b>" + esc(p.n) + "</b><br>Panjang: " + Number(p.l).toFixed(2) + " m</div>";
+            }, {sticky: true});
+            layer.on("click", function () { aquaRoadClicked(feature, layer); });
+        }
+    }).addTo(@@MAP_VAR@@);
+
+    var NODE_STYLE = {color: "#1f78b4", fill: true, fillColor: "#1f78b4", fillOpacity: 0.8, radius: 5, weight: 3};
+    intersections_layer = L.featureGroup().addTo(@@MAP_VAR@@);
+
+    aquaAddRoads = function (features) {
+        roads_layer.addData({type: "FeatureCollection", features: features});
+    };
+
+    aquaAddNodes = function (rows) {
+        rows.forEach(function (row) {
+            var marker = L.circleMarker([row[0], row[1]], NODE_STYLE);
+            // Sama dengan marker_key() di marker_store.py
+            marker._key = (row[3] !== null && row[3] !== undefined && row[3] !== "")
+                ? String(row[3]) : row[0].toFixed(7) + "," + row[1].toFixed(7);
+            var edit = aquaMarkerEdits[marker._key] || {};
+            marker._intersection = edit.nama || row[2];
+            marker._nodeId = edit.id || row[3];
+            marker.bindTooltip(function () {
+                return "<div><b>" + esc(marker._intersection) + "</b><br>ID: " + esc(marker._nodeId) + "</div>";
+            }, {sticky: true});
+            intersections_layer.addLayer(marker);
+        });
+    };
+})();
+"""
+
+# Mode blob: semua data sudah ada di window.AQUA_MAP_DATA
+STATIC_LOAD_JS = r"""
+(function () {
+    var data = window.AQUA_MAP_DATA || {roads: {features: []}, nodes: []};
+    aquaAddRoads(data.roads.features);
+    aquaAddNodes(data.nodes);
+})();
+"""
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+    <meta http-equiv="content-type" content="text/html; charset=UTF-8" />
+    <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no" />
+    <script src="https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.js"></script>
+    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.css"/>
+    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap@5.2.2/dist/css/bootstrap.min.css"/>
+    <style>
+        html, body {{ width: 100%; height: 100%; margin: 0; padding: 0; }}
+        #{map_var} {{ position: relative; width: 100%; height: 100%; left: 0; top: 0; }}
+        .leaflet-container {{ font-size: 1rem; }}
+    </style>
+    <script src="qrc:///qtwebchannel/qwebchannel.js"></script>
+    <script>
+{channel_js}
+    </script>
+</head>
+<body>
+    <div class="folium-map" id="{map_var}"></div>
+</body>
+{data_script}
+<script>
+{custom_js}
+
+    var {map_var} = L.map("{map_var}", {{
+        center: [{center_lat}, {center_lon}],
+        crs: L.CRS.EPSG3857,
+        zoom: {zoom},
+        zoomControl: true,
+        preferCanvas: true
+    }});
+
+    L.tileLayer("https://{{s}}.basemaps.cartocdn.com/light_all/{{z}}/{{x}}/{{y}}{{r}}.png", {{
+        minZoom: 0, maxZoom: 20, maxNativeZoom: 20, subdomains: "abcd",
+        attribution: "&copy; <a href=\\"https://www.openstreetmap.org/copyright\\">OpenStreetMap</a> contributors &copy; <a href=\\"https://carto.com/attributions\\">CARTO</a>"
+    }}).addTo({map_var});
+{layers_js}
+{load_js}
+    aktifkanInteraksiSemuaMarker();
+</script>
+</html>
+"""
+
+
+def _dump_data(data: dict) -> str:
+    # Tanpa spasi agar blob sekecil mungkin; "</" di-escape supaya aman di dalam <script>
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+
+
+def render_map_html(data: dict | None, center=DEFAULT_CENTER, zoom: int = DEFAULT_ZOOM, data_src: str | None = None,
+                    load_js: str | None = None) -> str:
+    """
+    Bangun HTML peta. Jika `data_src` diberikan (mis. "road_map_data.js"), data dimuat
+    dari file tersebut; selain itu blob data di-inline dalam halaman.
+    `load_js` mengganti cara data dimuat (mis. loader tile dari map_tiles); data boleh None.
+    """
+    if load_js is not None:
+        data_script = ""
+    elif data_src:
+        data_script = f'<script src="{data_src}"></script>'
+    else:
+        data_script = f"<script>window.AQUA_MAP_DATA = {_dump_data(data)};</script>"
+    return HTML_TEMPLATE.format(
+        load_js=STATIC_LOAD_JS if load_js is None else load_js,
+        map_var=MAP_VAR,
+        channel_js=CHANNEL_JS,
+        custom_js=CUSTOM_JS,
+        layers_js=LAYERS_JS.replace("@@MAP_VAR@@", MAP_VAR),
+        data_script=data_script,
+        center_lat=center[0],
+        center_lon=center[1],
+        zoom=int(zoom),
+    )
+
+
+def write_road_map(path: str, road_features: list, intersection_rows: list, center=DEFAULT_CENTER,
+                   zoom: int = DEFAULT_ZOOM, external_data: bool = False) -> str:
+    """
+    Tulis HTML peta ke `path`. Dengan external_data=True, blob data ditulis ke
+    `<nama>_data.js` di folder yang sama dan HTML hanya berisi template.
+    Mengembalikan path HTML.
+    """
+    data = build_map_data(road_features, intersection_rows)
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok=True)
+
+    data_src = None
+    if external_data:
+        data_name = os.path.splitext(os.path.basename(path))[0] + "_data.js"
+        with open(os.path.join(folder, data_name), "w", encoding="utf-8") as f:
+            f.write(f"window.AQUA_MAP_DATA = {_dump_data(data)};\n")
+        data_src = data_name
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(render_map_html(data, center=center, zoom=zoom, data_src=data_src))
+    return path
+
+
+def collect_map_sources(from_folium_html: str | None = None, from_map_html: str | None = None,
+                        intersections: str = DEFAULT_INTERSECTIONS):
+    """
+    Kumpulkan (road_features, intersection_rows) untuk generator peta/tile.
+    Ruas jalan & simpang diambil dari SATU sumber yang sama: HTML folium lama, HTML
+    hasil generator, atau (default) snapshot graf + GeoJSON simpang `intersections`.
+    """
+    if from_folium_html:
+        return road_features_from_folium_html(from_folium_html), intersection_rows_from_folium_html(from_folium_html)
+    if from_map_html:
+        data = load_map_data(from_map_html) or {}
+        nodes = data.get("nodes")
+        if nodes is None:
+            nodes = intersection_rows_from_geojson(intersections)
+        return data.get("roads", {}).get("features", []), nodes
+    from logic.graph.map_cache import load_graph_snapshot
+    roads = road_features_from_graph(load_graph_snapshot())
+    return roads, intersection_rows_from_geojson(intersections)
+
+
+def main(argv=None) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate road_map_detailed.html dari snapshot graf")
+    parser.add_argument("--out", default=DEFAULT_HTML)
+    parser.add_argument("--intersections", default=DEFAULT_INTERSECTIONS, help="GeoJSON simpang (output.geojson)")
+    parser.add_argument("--external-data", action="store_true", help="Tulis data ke file .js terpisah")
+    parser.add_argument("--from-folium-html", metavar="PATH",
+                        help="Ambil ruas jalan & simpang dari HTML folium lama, bukan dari snapshot graf")
+    parser.add_argument("--from-map-html", metavar="PATH",
+                        help="Ambil ruas jalan & simpang dari HTML hasil generator ini (mis. setelah template berubah)")
+    args = parser.parse_args(argv)
+
+    roads, nodes = collect_map_sources(args.from_folium_html, args.from_map_html, args.intersections)
+    path = write_road_map(args.out, roads, nodes, external_data=args.external_data)
+    print(f"[OK] Peta ditulis ke {path} ({len(roads)} ruas jalan, {len(nodes)} simpang, "
+          f"{os.path.getsize(path) / 1024:.0f} KB)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,225 @@
+"""
+map_tiles.py
+Pipeline tile peta (z/x/y GeoJSON) untuk area layanan yang luas.
+
+Ruas jalan & simpang dipotong ke dalam tile Web Mercator pada satu level zoom
+(TILE_ZOOM). Halaman peta tiled hanya memuat tile yang terlihat di viewport,
+lewat URL scheme lokal QWebEngine (lihat UI/seller/UI_sl_map_scheme.py), sehingga
+ukuran halaman tidak tumbuh bersama `distance` di config.yaml.
+
+Struktur output (default logic/graph/tiles/):
+    index.html          halaman peta (template map_render + loader tile)
+    index.json          metadata: zoom, bounds, center, jumlah tile
+    <z>/<x>/<y>.json    {"roads": [Feature...], "nodes": [[lat, lon, nama, osmid], ...]}
+
+Fungsi utama:
+- lonlat_to_tile(lon, lat, z) / tile_bounds(x, y, z)
+- build_tiles(road_features, intersection_rows, out_dir, zoom, center): tulis semua tile + halaman
+- read_tile(out_dir, z, x, y): isi tile (bytes) atau None
+
+Pemakaian:
+    python -m logic.graph.map_tiles
+    python -m logic.graph.map_tiles --from-map-html logic/graph/road_map_detailed.html --zoom 16
+"""
+
+import json
+import math
+import os
+import shutil
+
+from logic.graph.map_render import (
+    DEFAULT_CENTER, DEFAULT_INTERSECTIONS, DEFAULT_ZOOM, MAP_VAR, collect_map_sources, render_map_html
+)
+
+TILE_ZOOM = 16          # ~600 m per tile di sekitar Bandung
+MAX_TILES_PER_VIEW = 64 # di atas ini (zoom terlalu jauh) tile tidak dimuat
+TILES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tiles")
+
+
+def lonlat_to_tile(lon: float, lat: float, z: int):
+    n = 2 ** z
+    x = int((lon + 180.0) / 360.0 * n)
+    lat_r = math.radians(lat)
+    y = int((1.0 - math.log(math.tan(lat_r) + 1.0 / math.cos(lat_r)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tile_bounds(x: int, y: int, z: int):
+    """(west, south, east, north) dalam derajat."""
+    n = 2 ** z
+
+    def lat_of(yy):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * yy / n))))
+
+    return x / n * 360.0 - 180.0, lat_of(y + 1), (x + 1) / n * 360.0 - 180.0, lat_of(y)
+
+
+def _tiles_for_bbox(minx, miny, maxx, maxy, z):
+    x0, y0 = lonlat_to_tile(minx, maxy, z)
+    x1, y1 = lonlat_to_tile(maxx, miny, z)
+    for x in range(x0, x1 + 1):
+        for y in range(y0, y1 + 1):
+            yield x, y
+
+
+def _assign_to_tiles(road_features: list, intersection_rows: list, zoom: int) -> dict:
+    tiles = {}
+    for i, feat in enumerate(road_features):
+        coords = feat["geometry"]["coordinates"]
+        xs = [c[0] for c in coords]
+        ys = [c[1] for c in coords]
+        # Ruas yang melintasi batas tile masuk ke semua tile yang disentuh bbox-nya;
+        # id dipakai klien untuk mencegah duplikasi
+        tagged = dict(feat, id=i)
+        for key in _tiles_for_bbox(min(xs), min(ys), max(xs), max(ys), zoom):
+            tiles.setdefault(key, {"roads": [], "nodes": []})["roads"].append(tagged)
+    for row in intersection_rows:
+        key = lonlat_to_tile(row[1], row[0], zoom)
+        tiles.setdefault(key, {"roads": [], "nodes": []})["nodes"].append(row)
+    return tiles
+
+
+# Loader tile di halaman: muat tile di viewport saat peta digeser/di-zoom
+TILE_LOADER_JS = r"""
+(function () {
+    var TILE_ZOOM = @@TILE_ZOOM@@, MAX_TILES = @@MAX_TILES@@;
+    var map = @@MAP_VAR@@;
+    var requested = {}, roadIds = {}, nodeKeys = {}, cutCoords = [];
+    var TOL = 0.000001;
+
+    function tileX(lon) { return Math.floor((lon + 180) / 360 * Math.pow(2, TILE_ZOOM)); }
+    function tileY(lat) {
+        var r = lat * Math.PI / 180;
+        return Math.floor((1 - Math.log(Math.tan(r) + 1 / Math.cos(r)) / Math.PI) / 2 * Math.pow(2, TILE_ZOOM));
+    }
+    function isCut(lon, lat) {
+        return cutCoords.some(function (c) { return Math.abs(c[0] - lon) < TOL && Math.abs(c[1] - lat) < TOL; });
+    }
+    function roadIsCut(f) {
+        var c = f.geometry.coordinates;
+        return isCut(c[0][0], c[0][1]) || isCut(c[c.length - 1][0], c[c.length - 1][1])
+            || aquaCutRoads.some(function (ends) { return aquaRoadMatches(c, ends); });
+    }
+
+    function loadTile(x, y) {
+        var key = x + "/" + y;
+        if (requested[key]) { return; }
+        requested[key] = true;
+        fetch(TILE_ZOOM + "/" + key + ".json")
+            .then(function (r) { return r.ok ? r.json() : null; })
+            .then(function (tile) {
+                if (!tile) { return; }
+                var roads = tile.roads.filter(function (f) {
+                    if (roadIds[f.id] || roadIsCut(f)) { return false; }
+                    roadIds[f.id] = true;
+                    return true;
+                });
+                var nodes = tile.nodes.filter(function (row) {
+                    var k = row[0] + "," + row[1];
+                    if (nodeKeys[k] || isCut(row[1], row[0])) { return false; }
+                    nodeKeys[k] = true;
+                    return true;
+                });
+                aquaAddRoads(roads);
+                aquaAddNodes(nodes);
+                aktifkanInteraksiSemuaMarker();
+            })
+            .catch(function (e) { console.warn("Gagal memuat tile " + key, e); delete requested[key]; });
+    }
+
+    function loadViewport() {
+        var b = map.getBounds();
+        var x0 = tileX(b.getWest()), x1 = tileX(b.getEast());
+        var y0 = tileY(b.getNorth()), y1 = tileY(b.getSouth());
+        if ((x1 - x0 + 1) * (y1 - y0 + 1) > MAX_TILES) { return; }
+        for (var x = x0; x <= x1; x++) {
+            for (var y = y0; y <= y1; y++) { loadTile(x, y); }
+        }
+    }
+
+    // Simpul yang sudah di-cut tidak boleh muncul lagi saat tile-nya dimuat belakangan
+    var cutOriginal = window.cutLayersByCoord;
+    window.cutLayersByCoord = function (payload) {
+        cutCoords.push(payload.node_coords);
+        return cutOriginal(payload);
+    };
+
+    map.on("moveend", loadViewport);
+    loadViewport();
+})();
+"""
+
+
+def render_tiled_html(center=DEFAULT_CENTER, zoom: int = DEFAULT_ZOOM, tile_zoom: int = TILE_ZOOM) -> str:
+    loader = (TILE_LOADER_JS.replace("@@TILE_ZOOM@@", str(int(tile_zoom)))
+              .replace("@@MAX_TILES@@", str(MAX_TILES_PER_VIEW))
+              .replace("@@MAP_VAR@@", MAP_VAR))
+    return render_map_html(None, center=center, zoom=zoom, load_js=loader)
+
+
+def build_tiles(road_features: list, intersection_rows: list, out_dir: str = TILES_DIR,
+                zoom: int = TILE_ZOOM, center=None, map_zoom: int = DEFAULT_ZOOM) -> dict:
+    """
+    Potong data peta menjadi tile dan tulis halaman peta tiled ke `out_dir`.
+    Isi `out_dir` yang lama (tile level zoom ini) dihapus lebih dulu.
+    Mengembalikan metadata (juga disimpan sebagai index.json).
+    """
+    tiles = _assign_to_tiles(road_features, intersection_rows, zoom)
+
+    zoom_dir = os.path.join(out_dir, str(zoom))
+    if os.path.isdir(zoom_dir):
+        shutil.rmtree(zoom_dir)
+    for (x, y), content in tiles.items():
+        tile_dir = os.path.join(zoom_dir, str(x))
+        os.makedirs(tile_dir, exist_ok=True)
+        with open(os.path.join(tile_dir, f"{y}.json"), "w", encoding="utf-8") as f:
+            json.dump(content, f, ensure_ascii=False, separators=(",", ":"))
+
+    all_x = [c[0] for feat in road_features for c in feat["geometry"]["coordinates"]] + [r[1] for r in intersection_rows]
+    all_y = [c[1] for feat in road_features for c in feat["geometry"]["coordinates"]] + [r[0] for r in intersection_rows]
+    bounds = [min(all_x), min(all_y), max(all_x), max(all_y)] if all_x else None
+    if center is None:
+        center = ((bounds[1] + bounds[3]) / 2, (bounds[0] + bounds[2]) / 2) if bounds else DEFAULT_CENTER
+
+    with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(render_tiled_html(center=center, zoom=map_zoom, tile_zoom=zoom))
+
+    meta = {
+        "tile_zoom": zoom,
+        "bounds": bounds,
+        "center": list(center),
+        "tiles": len(tiles),
+        "roads": len(road_features),
+        "nodes": len(intersection_rows),
+    }
+    with open(os.path.join(out_dir, "index.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+def read_tile(out_dir: str, z: int, x: int, y: int) -> bytes | None:
+    path = os.path.join(out_dir, str(z), str(x), f"{y}.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def main(argv=None) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(description="Potong data peta menjadi tile z/x/y GeoJSON")
+    parser.add_argument("--out", default=TILES_DIR)
+    parser.add_argument("--zoom", type=int, default=TILE_ZOOM, help="Level zoom tile")
+    parser.add_argument("--intersections", default=DEFAULT_INTERSECTIONS)
+    parser.add_argument("--from-map-html", metavar="PATH", help="Ambil ruas jalan dari HTML hasil map_render")
+    args = parser.parse_args(argv)
+
+    roads, nodes = collect_map_sources(from_map_html=args.from_map_html, intersections=args.intersections)
+    os.makedirs(args.out, exist_ok=True)
+    meta = build_tiles(roads, nodes, out_dir=args.out, zoom=args.zoom)
+    print(f"[OK] {meta['tiles']} tile (z={meta['tile_zoom']}) ditulis ke {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
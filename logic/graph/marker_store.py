@@ -0,0 +1,220 @@
+"""
+marker_store.py
+Sidecar SQLite untuk metadata marker simpang (nama & ID hasil edit di peta).
+
+Dulu setiap "Save Markers" di testgui membaca seluruh road_map_detailed.html lalu
+menjalankan satu regex multiline per marker yang diedit, kemudian menulis ulang
+HTML-nya: O(marker x ukuran dokumen) per simpan. Sekarang HTML peta tidak pernah
+ditulis ulang; hasil edit disimpan sebagai upsert berkunci di file SQLite di
+sebelah HTML, dan halaman peta memuatnya saat runtime (lihat aquaApplyMarkerEdits
+di map_render.py) lewat QWebChannel (graphHandler.loadMarkerEdits) atau
+runJavaScript dari halaman Simulasi.
+
+File SQLite-nya lokal (WAL, di-.gitignore); setiap upsert/delete juga mengekspor
+semua edit ke road_map_markers.json di sebelahnya (teks, urut per kunci, ikut
+di-commit). Store yang masih kosong mengimpor file JSON itu saat dibuka, jadi edit
+nama marker ikut terbawa ke mesin lain lewat repo.
+
+Kunci marker = osmid asli dari data peta (kolom ke-4 baris simpang); marker tanpa
+osmid memakai koordinat "lat,lng" (7 desimal, sama dengan COORD_PRECISION).
+
+Fungsi utama:
+- marker_key(osmid, lat, lng): kunci marker, identik dengan marker._key di JS
+- MarkerStore(path).upsert(edits) / delete(keys) / edits() / edits_json()
+- MarkerStore.export_json(path) / import_json(path): sinkron dengan file JSON yang di-commit
+- get_marker_store(path): instance bersama per file
+- parse_edit_payload(payload): normalisasi payload JSON dari halaman peta
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+GRAPH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB = os.path.join(GRAPH_DIR, "road_map_markers.sqlite")
+EXPORT_FORMAT_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS markers (
+    key        TEXT PRIMARY KEY,
+    nama       TEXT,
+    node_id    TEXT,
+    lat        REAL,
+    lng        REAL,
+    updated_at REAL NOT NULL
+)
+"""
+
+_UPSERT = """
+INSERT INTO markers (key, nama, node_id, lat, lng, updated_at)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(key) DO UPDATE SET
+    nama = COALESCE(excluded.nama, markers.nama),
+    node_id = COALESCE(excluded.node_id, markers.node_id),
+    lat = COALESCE(excluded.lat, markers.lat),
+    lng = COALESCE(excluded.lng, markers.lng),
+    updated_at = excluded.updated_at
+"""
+
+
+def marker_key(osmid, lat=None, lng=None) -> Optional[str]:
+    """osmid asli jika ada, selain itu "lat,lng" 7 desimal; None jika keduanya tidak ada."""
+    if osmid is not None and str(osmid).strip() != "":
+        return str(osmid)
+    if lat is None or lng is None:
+        return None
+    return f"{float(lat):.7f},{float(lng):.7f}"
+
+
+def _clean_text(value) -> Optional[str]:
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+class MarkerStore:
+    """Satu koneksi SQLite per file; aman dipanggil dari beberapa thread (dikunci)."""
+
+    def __init__(self, path: str = DEFAULT_DB, export_path: Optional[str] = None):
+        self.path = path
+        # None -> road_map_markers.json di sebelah file SQLite; "" -> tanpa ekspor
+        self.export_path = os.path.splitext(path)[0] + ".json" if export_path is None else export_path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+        if self.export_path and len(self) == 0 and os.path.exists(self.export_path):
+            imported = self.import_json(self.export_path)
+            print(f"📥 {imported} edit marker dimuat dari {self.export_path}")
+
+    def upsert(self, edits: Iterable[dict]) -> int:
+        """
+        Simpan hasil edit marker dalam satu transaksi. Tiap item:
+        {"key": ..., "nama": ..., "id": ..., "lat": ..., "lng": ...}
+        ("key" boleh kosong; dihitung dari osmid/"osmid" atau lat/lng).
+        Field kosong tidak menimpa nilai lama. Mengembalikan jumlah baris yang disimpan.
+        """
+        now = time.time()
+        rows = []
+        for item in edits:
+            if not isinstance(item, dict):
+                continue
+            key = _clean_text(item.get("key")) or marker_key(item.get("osmid"), item.get("lat"), item.get("lng"))
+            if key is None:
+                continue
+            rows.append((key, _clean_text(item.get("nama")), _clean_text(item.get("id")),
+                         item.get("lat"), item.get("lng"), now))
+        if not rows:
+            return 0
+        with self._lock, self._conn:
+            self._conn.executemany(_UPSERT, rows)
+        self._export()
+        return len(rows)
+
+    def delete(self, keys: Iterable[str]) -> int:
+        keys = [(str(k),) for k in keys]
+        with self._lock, self._conn:
+            cur = self._conn.executemany("DELETE FROM markers WHERE key = ?", keys)
+        self._export()
+        return cur.rowcount
+
+    def edits(self) -> Dict[str, dict]:
+        """{key: {"nama": ..., "id": ...}} untuk semua marker yang pernah diedit."""
+        with self._lock:
+            rows = self._conn.execute("SELECT key, nama, node_id FROM markers").fetchall()
+        result = {}
+        for key, nama, node_id in rows:
+            entry = {}
+            if nama is not None:
+                entry["nama"] = nama
+            if node_id is not None:
+                entry["id"] = node_id
+            result[key] = entry
+        return result
+
+    def edits_json(self) -> str:
+        return json.dumps(self.edits(), ensure_ascii=False, separators=(",", ":"))
+
+    # --- ekspor / impor JSON (yang di-commit) ---
+
+    def export_json(self, path: str) -> int:
+        """Tulis semua edit ke `path` (atomik, urut per kunci). Return jumlah marker."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, nama, node_id, lat, lng FROM markers ORDER BY key").fetchall()
+        markers = {}
+        for key, nama, node_id, lat, lng in rows:
+            markers[key] = {"nama": nama, "id": node_id, "lat": lat, "lng": lng}
+        payload = {"version": EXPORT_FORMAT_VERSION, "markers": markers}
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=1)
+            f.write("\n")
+        os.replace(tmp, path)
+        return len(markers)
+
+    def import_json(self, path: str) -> int:
+        """Upsert semua edit dari file ekspor `path`. Return jumlah baris yang disimpan."""
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        markers = payload.get("markers", {}) if isinstance(payload, dict) else {}
+        return self.upsert(dict(entry, key=key) for key, entry in markers.items()
+                           if isinstance(entry, dict))
+
+    def _export(self) -> None:
+        if not self.export_path:
+            return
+        try:
+            self.export_json(self.export_path)
+        except OSError as e:
+            print(f"⚠️ Gagal mengekspor edit marker ke {self.export_path}: {e}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM markers").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_stores: Dict[str, MarkerStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_marker_store(path: str = DEFAULT_DB) -> MarkerStore:
+    key = os.path.abspath(path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = MarkerStore(key)
+        return store
+
+
+def parse_edit_payload(payload) -> List[dict]:
+    """
+    Normalisasi payload dari halaman peta: list editedMarkers, {"nodes": [...]}
+    (exportGraphHTML), atau string JSON dari keduanya. Item string di dalam list
+    (format lama) ikut di-decode.
+    """
+    if isinstance(payload, str):
+        payload = json.loads(payload)
+    if isinstance(payload, dict):
+        payload = payload.get("nodes", [])
+    items = []
+    for node in payload or []:
+        if isinstance(node, str):
+            try:
+                node = json.loads(node)
+            except json.JSONDecodeError:
+                continue
+        if isinstance(node, dict):
+            items.append(node)
+    return items
@@ -0,0 +1,186 @@
+"""
+name_search.py
+Indeks pencarian nama simpang/jalan (intersection_name) untuk autocomplete.
+
+Nama seperti "Jalan Sariasih & Jalan Sarimanah & Jalan Sarkasih I" dipecah menjadi
+token ternormalisasi (huruf kecil, tanpa tanda baca/aksen). Pencarian dilakukan
+dua tahap:
+1. Prefix: setiap kata pada query harus menjadi awalan salah satu token nama.
+   Token disimpan dalam array terurut sehingga lookup awalan cukup bisect
+   (setara trie untuk kueri awalan, tetapi jauh lebih ringkas di Python).
+2. Fuzzy: jika hasil prefix kurang dari k, kandidat ditambah dari indeks trigram
+   (kemiripan Jaccard), sehingga salah ketik seperti "sarimnah" tetap ketemu.
+
+Fungsi utama:
+- normalize_name(text): bentuk ternormalisasi untuk pencocokan
+- NameSearchIndex(names, regions).search(query, k, region): top-k nama
+- get_name_index(path): indeks ter-cache untuk katalog lokasi (output.geojson)
+"""
+
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from logic.graph.location_catalog import DEFAULT_LOCATIONS, get_location_catalog
+
+DEFAULT_LIMIT = 20
+FUZZY_MIN_SCORE = 0.3  # Jaccard trigram minimum agar dianggap mirip
+
+# Singkatan umum pada input pengguna -> token pada data OSM
+ALIASES = {
+    "jl": "jalan",
+    "jln": "jalan",
+    "gg": "gang",
+    "kp": "kampung",
+}
+
+_NON_ALNUM_RE = re.compile(r"[^0-9a-z]+")
+
+_lock = threading.Lock()
+_indexes: Dict[str, tuple] = {}  # path -> (LocationCatalog, NameSearchIndex)
+
+
+def normalize_name(text: str) -> str:
+    """Huruf kecil, aksen dibuang, semua selain huruf/angka menjadi satu spasi."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return _NON_ALNUM_RE.sub(" ", text).strip()
+
+
+def _trigrams(norm: str) -> set:
+    padded = f"  {norm} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameSearchIndex:
+    """
+    Indeks prefix + trigram atas daftar nama. READ-ONLY setelah dibuat.
+
+    Atribut:
+    - names: nama asli (unik, urutan input)
+    - regions: region per nama ("" jika tidak diketahui)
+    """
+
+    def __init__(self, names: List[str], regions: Optional[List[str]] = None):
+        self.names = list(dict.fromkeys(n for n in names if n))
+        region_of = dict(zip(names, regions)) if regions is not None else {}
+        self.regions = [region_of.get(n) or "" for n in self.names]
+        n = len(self.names)
+        norms = [normalize_name(name) for name in self.names]
+
+        # Peringkat statis: nama terpendek lalu abjad (dipakai sebagai tie-breaker)
+        order = sorted(range(n), key=lambda i: (len(self.names[i]), self.names[i]))
+        self._static_rank = np.empty(n, dtype=np.int64)
+        self._static_rank[order] = np.arange(n)
+
+        self._region_mask: Dict[str, np.ndarray] = {}
+        for i, r in enumerate(self.regions):
+            self._region_mask.setdefault(r, np.zeros(n, dtype=bool))[i] = True
+
+        # (token, id, posisi token) terurut -> rentang awalan cukup dua kali bisect
+        entries = sorted(
+            (tok, i, pos)
+            for i, norm in enumerate(norms)
+            for pos, tok in enumerate(dict.fromkeys(norm.split()))
+        )
+        self._tokens = [e[0] for e in entries]
+        self._token_ids = np.array([e[1] for e in entries], dtype=np.int64)
+        self._token_pos = np.array([e[2] for e in entries], dtype=np.int64)
+
+        grams_by_id = [_trigrams(norm) for norm in norms]
+        self._trigram_count = np.array([len(g) for g in grams_by_id], dtype=np.int64)
+        trigram_ids: Dict[str, list] = {}
+        for i, grams in enumerate(grams_by_id):
+            for g in grams:
+                trigram_ids.setdefault(g, []).append(i)
+        self._trigram_ids = {g: np.array(ids, dtype=np.int64) for g, ids in trigram_ids.items()}
+
+        self._id_of = {name: i for i, name in enumerate(self.names)}
+
+    def __len__(self):
+        return len(self.names)
+
+    def region_of(self, name: str) -> Optional[str]:
+        """Region sebuah nama ("" jika tanpa region), None jika nama tidak ada."""
+        i = self._id_of.get(name)
+        return None if i is None else self.regions[i]
+
+    def _first_pos(self, prefix: str) -> np.ndarray:
+        """Posisi token pertama berawalan `prefix` per nama (len(names) jika tidak ada)."""
+        lo = bisect_left(self._tokens, prefix)
+        hi = bisect_left(self._tokens, prefix + "\uffff", lo)
+        best = np.full(len(self.names), len(self.names), dtype=np.int64)
+        np.minimum.at(best, self._token_ids[lo:hi], self._token_pos[lo:hi])
+        return best
+
+    def _top(self, ids: np.ndarray, key: np.ndarray, k: int) -> np.ndarray:
+        if len(ids) > k:
+            part = np.argpartition(key, k - 1)[:k]
+            ids, key = ids[part], key[part]
+        return ids[np.argsort(key, kind="stable")]
+
+    def search(self, query: str, k: int = DEFAULT_LIMIT, region: Optional[str] = None,
+               fuzzy: bool = True) -> List[str]:
+        """
+        Top-k nama untuk `query`. Urutan: posisi kata pertama yang cocok (nama
+        yang diawali query lebih dulu), lalu nama terpendek/abjad. `region`
+        membatasi ke satu daerah. Query kosong mengembalikan k nama pertama.
+        """
+        n = len(self.names)
+        if k <= 0 or n == 0:
+            return []
+        allowed = None if region is None else self._region_mask.get(region, np.zeros(n, dtype=bool))
+        words = [ALIASES.get(w, w) for w in normalize_name(query).split()]
+        if not words:
+            ids = np.arange(n) if allowed is None else np.flatnonzero(allowed)
+            return [self.names[i] for i in self._top(ids, self._static_rank[ids], k)]
+
+        # Tahap 1: semua kata harus menjadi awalan token (AND)
+        first_pos = self._first_pos(words[0])
+        mask = first_pos < n
+        for word in words[1:]:
+            if not mask.any():
+                break
+            mask &= self._first_pos(word) < n
+        if allowed is not None:
+            mask &= allowed
+        ids = np.flatnonzero(mask)
+        ranked = self._top(ids, first_pos[ids] * n + self._static_rank[ids], k)
+        results = [self.names[i] for i in ranked]
+        if len(results) >= k or not fuzzy:
+            return results
+
+        # Tahap 2: lengkapi dengan kemiripan trigram (Jaccard)
+        grams = _trigrams(" ".join(words))
+        hits = [self._trigram_ids[g] for g in grams if g in self._trigram_ids]
+        if not hits:
+            return results
+        shared = np.bincount(np.concatenate(hits), minlength=n)
+        score = shared / (len(grams) + self._trigram_count - shared)
+        eligible = (score >= FUZZY_MIN_SCORE) & ~mask
+        if allowed is not None:
+            eligible &= allowed
+        ids = np.flatnonzero(eligible)
+        key = -score[ids] * n + self._static_rank[ids] / n  # skor tertinggi dulu
+        results.extend(self.names[i] for i in self._top(ids, key, k - len(results)))
+        return results
+
+
+def get_name_index(path: str = DEFAULT_LOCATIONS) -> NameSearchIndex:
+    """
+    Indeks pencarian untuk katalog lokasi `path`, dibuat ulang hanya jika
+    katalognya dimuat ulang (file GeoJSON berubah).
+    """
+    catalog = get_location_catalog(path)
+    with _lock:
+        cached = _indexes.get(catalog.path)
+        if cached is None or cached[0] is not catalog:
+            names = list(catalog.name_to_region.keys())
+            index = NameSearchIndex(names, [catalog.name_to_region[n] for n in names])
+            cached = (catalog, index)
+            _indexes[catalog.path] = cached
+        return cached[1]
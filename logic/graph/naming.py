@@ -0,0 +1,82 @@
+"""
+naming.py
+Penamaan ruas jalan & simpang dari GeoDataFrame OSMnx, tervektorisasi.
+
+Versi lama (scrape_roads.py) memfilter SELURUH GeoDataFrame edge untuk setiap
+simpang (O(simpul x sisi)) dan memberi akhiran duplikat dengan loop Python.
+Di sini nama jalan per simpul dibangun sekali lewat explode + groupby atas level
+index u dan v, dan akhiran duplikat dihitung dengan groupby().cumcount().
+
+Fungsi utama:
+- first_road_name(name): nama pertama (OSM bisa berupa list); kosong -> UNNAMED_ROAD
+- suffix_duplicates(names, sep): "A", "A<sep>1", "A<sep>2", ... untuk nama berulang
+- unique_road_names(names): nama unik per ruas ("Jalan X", "Jalan X 1", ...)
+- incident_road_names(edges_gdf): simpul -> "Jalan A & Jalan B" (nama jalan yang bertemu)
+- intersection_names(node_ids, edges_gdf): nama unik setiap simpang ("A & B", "A & B1", ...)
+"""
+
+import math
+from typing import Iterable, List
+
+import pandas as pd
+
+UNNAMED_ROAD = "Jalan Tanpa Nama"
+UNNAMED_INTERSECTION = "Simpang Tanpa Nama"
+NAME_JOINER = " & "
+
+
+def first_road_name(name) -> str:
+    """Nama jalan OSM bisa berupa list; ambil yang pertama, None/NaN -> 'Jalan Tanpa Nama'."""
+    if isinstance(name, list):
+        name = name[0] if name else None
+    if name is None or (isinstance(name, float) and math.isnan(name)):
+        return UNNAMED_ROAD
+    return str(name)
+
+
+def suffix_duplicates(names, sep: str = " ") -> pd.Series:
+    """
+    Kemunculan pertama sebuah nama tetap, berikutnya diberi akhiran 1, 2, ...
+    (urutan sama dengan loop counter lama). NaN dibiarkan apa adanya.
+    """
+    s = pd.Series(names, dtype=object).reset_index(drop=True)
+    valid = s.notna()
+    nth = s[valid].groupby(s[valid], sort=False).cumcount()
+    dup = nth[nth > 0]
+    out = s.copy()
+    out[dup.index] = s[dup.index].astype(str) + sep + dup.astype(str)
+    return out
+
+
+def unique_road_names(names: Iterable) -> List[str]:
+    """Beri akhiran angka pada nama jalan yang berulang."""
+    base = pd.Series(list(names), dtype=object).map(first_road_name)
+    return suffix_duplicates(base, sep=" ").tolist()
+
+
+def incident_road_names(edges_gdf) -> pd.Series:
+    """
+    Nama jalan yang bertemu di setiap simpul, dalam satu kali lintasan:
+    (u, name) + (v, name) -> explode list nama -> unik -> urut & gabung per simpul.
+    Simpul tanpa nama jalan tidak muncul di hasil.
+    """
+    idx = edges_gdf.index
+    names = edges_gdf["name"].to_numpy() if "name" in edges_gdf.columns else [None] * len(edges_gdf)
+    pairs = pd.concat([
+        pd.DataFrame({"node": idx.get_level_values("u"), "name": names}),
+        pd.DataFrame({"node": idx.get_level_values("v"), "name": names}),
+    ], ignore_index=True)
+    pairs = pairs.explode("name").dropna(subset=["name"])
+    pairs["name"] = pairs["name"].astype(str)
+    pairs = pairs.drop_duplicates().sort_values(["node", "name"])
+    return pairs.groupby("node", sort=False)["name"].agg(NAME_JOINER.join)
+
+
+def intersection_names(node_ids, edges_gdf) -> pd.Series:
+    """
+    Nama setiap simpang (index = node_ids): gabungan nama jalan yang bertemu,
+    duplikat diberi akhiran angka tanpa spasi ("A & B", "A & B1", ...).
+    """
+    node_index = pd.Index(node_ids)
+    joined = incident_road_names(edges_gdf).reindex(node_index).fillna(UNNAMED_INTERSECTION)
+    return pd.Series(suffix_duplicates(joined.to_numpy(), sep="").to_numpy(), index=node_index, name="intersection_name")
@@ -0,0 +1,186 @@
+"""
+ongkir.py
+Tabel ongkos kirim (ongkir) berbasis jarak JALAN dari depot, dihitung sekali di
+sisi seller lalu disimpan sebagai JSON di sebelah output.geojson.
+
+Build (butuh graf): jarak depot -> semua simpul diambil dari SATU SSSP atas snapshot
+graf (RoutingData.depot_dist, lihat map_cache.py). Setiap intersection_name di
+output.geojson dipetakan ke simpul terdekat (satu panggilan nearest_nodes); jarak =
+jarak jalan depot -> simpul + jarak lurus lokasi -> simpul ("jalan kaki terakhir"
+untuk lokasi di luar graf), lalu dipetakan ke tier ongkir.
+
+Tabel dicap dengan map_cache.graph_version() graf yang dipakai; prefetch seller
+membangun ulang tabel yang capnya tidak cocok lagi (graf berubah). File hanya ditulis
+ulang jika ada entri yang berubah, bukan karena capnya saja.
+
+Pemakaian (sisi pelanggan, TANPA graf/geopandas): OngkirTable hanya membaca JSON;
+ongkir satu lokasi = satu lookup dict.
+
+Fungsi utama:
+- ongkir_untuk_jarak(distance_m): tarif (Rp) untuk jarak jalan
+- build_ongkir_table(data, locations_path): dict tabel {nama: {distance_m, fee}}
+- write_ongkir_table(path, locations_path): build lalu simpan (juga: python -m logic.graph.ongkir)
+- ongkir_table_stale(path): True jika file belum ada atau dibuat dari versi graf lain
+- get_ongkir_table(path): OngkirTable (dimuat ulang otomatis jika file berubah)
+- OngkirTable.lookup(nama): (jarak_m, ongkir) atau None
+"""
+
+import json
+import math
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+GRAPH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_LOCATIONS = os.path.join(GRAPH_DIR, "output.geojson")
+DEFAULT_ONGKIR_TABLE = os.path.join(GRAPH_DIR, "ongkir_table.json")
+
+# (jarak jalan maksimum dalam meter, ongkir Rp), urut naik
+ONGKIR_TIERS = [(1000, 3000), (2000, 5000), (3000, 7000), (4000, 9000)]
+ONGKIR_PER_KM_LEBIH = 2000  # per km (dibulatkan ke atas) di atas tier terakhir
+METER_PER_DERAJAT = 111320.0
+TABLE_FORMAT = 1
+
+
+def ongkir_untuk_jarak(distance_m: float) -> int:
+    """Tarif tier pertama yang mencakup `distance_m`; di atas tier terakhir ditambah per km."""
+    for batas_m, fee in ONGKIR_TIERS:
+        if distance_m <= batas_m:
+            return fee
+    batas_m, fee = ONGKIR_TIERS[-1]
+    return fee + ONGKIR_PER_KM_LEBIH * math.ceil((distance_m - batas_m) / 1000)
+
+
+# =============================================================================
+# BUILD (butuh graf; dipanggil dari sisi seller / baris perintah)
+# =============================================================================
+
+def build_ongkir_table(data, locations_path: str = DEFAULT_LOCATIONS) -> dict:
+    """
+    Tabel ongkir untuk semua nama simpang di `locations_path` dari RoutingData `data`
+    (graf + depot_dist). Lokasi yang tidak terjangkau dari depot tidak dimasukkan.
+    """
+    import numpy as np
+    import osmnx as ox
+    from logic.graph.location_catalog import get_location_catalog
+
+    catalog = get_location_catalog(locations_path)
+    names = list(catalog.name_to_coords)
+    entries: Dict[str, dict] = {}
+    if names and data.depot_dist:
+        lats = np.array([catalog.name_to_coords[n][0] for n in names], dtype=float)
+        lons = np.array([catalog.name_to_coords[n][1] for n in names], dtype=float)
+        nodes = ox.distance.nearest_nodes(data.G, X=lons, Y=lats)
+        for name, lat, lon, node in zip(names, lats, lons, nodes):
+            road_m = data.depot_dist.get(node)
+            if road_m is None:
+                continue
+            nx_, ny_ = data.G.nodes[node]["x"], data.G.nodes[node]["y"]
+            snap_m = math.hypot((lon - nx_) * math.cos(math.radians(lat)), lat - ny_) * METER_PER_DERAJAT
+            distance_m = float(road_m) + snap_m
+            entries[name] = {"distance_m": round(distance_m, 1), "fee": ongkir_untuk_jarak(distance_m)}
+    return {
+        "format": TABLE_FORMAT,
+        "depot_name": data.depot_name,
+        "tiers": ONGKIR_TIERS,
+        "per_km_lebih": ONGKIR_PER_KM_LEBIH,
+        "entries": entries,
+    }
+
+
+def _same_except_stamp(path: str, data: dict) -> bool:
+    """True jika isi `path` sama dengan `data` kecuali graph_version (tidak perlu ditulis ulang)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            old = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if not isinstance(old, dict):
+        return False
+    new = json.loads(json.dumps(data))
+    old.pop("graph_version", None)
+    new.pop("graph_version", None)
+    return old == new
+
+
+def write_ongkir_table(path: str = DEFAULT_ONGKIR_TABLE, locations_path: str = DEFAULT_LOCATIONS) -> int:
+    """Build tabel ongkir dari data routing lalu tulis ke `path`. Return jumlah entri."""
+    from logic.graph.map_cache import get_routing_data, graph_version
+
+    data = get_routing_data()
+    if data is None or data.depot_node is None:
+        print("⚠️ Data routing/depot tidak tersedia, tabel ongkir tidak dibuat.")
+        return 0
+    table = build_ongkir_table(data, locations_path)
+    table["graph_version"] = graph_version()
+    if _same_except_stamp(path, table):
+        print(f"[OK] Tabel ongkir tidak berubah, {path} tidak ditulis ulang")
+        return len(table["entries"])
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(table, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+    print(f"✅ Tabel ongkir ({len(table['entries'])} lokasi) ditulis ke {path}")
+    return len(table["entries"])
+
+
+def ongkir_table_stale(path: str = DEFAULT_ONGKIR_TABLE) -> bool:
+    """True jika `path` belum ada, rusak, atau capnya bukan graph_version() saat ini."""
+    from logic.graph.map_cache import graph_version
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            stamp = json.load(f).get("graph_version")
+    except (OSError, ValueError, AttributeError):
+        return True
+    return stamp != graph_version()
+
+
+# =============================================================================
+# PEMAKAIAN (sisi pelanggan; hanya json, tanpa graf)
+# =============================================================================
+
+class OngkirTable:
+    """Isi ongkir_table.json. READ-ONLY, dibagikan ke semua pemakai."""
+
+    def __init__(self, path: str, stamp: Tuple[int, int], table: dict):
+        self.path = path
+        self.stamp = stamp
+        self.depot_name = table.get("depot_name")
+        self.entries: Dict[str, dict] = table.get("entries", {})
+
+    def lookup(self, name: str) -> Optional[Tuple[float, int]]:
+        """(jarak jalan dari depot dalam meter, ongkir Rp) untuk nama simpang, atau None."""
+        entry = self.entries.get((name or "").strip())
+        if entry is None:
+            return None
+        return entry["distance_m"], entry["fee"]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+_lock = threading.Lock()
+_tables: Dict[str, OngkirTable] = {}
+
+
+def get_ongkir_table(path: str = DEFAULT_ONGKIR_TABLE) -> Optional[OngkirTable]:
+    """OngkirTable untuk `path` (dimuat ulang jika file berubah); None jika file tidak ada."""
+    path = os.path.abspath(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _lock:
+        table = _tables.get(path)
+        if table is not None and table.stamp == stamp:
+            return table
+        with open(path, "r", encoding="utf-8") as f:
+            table = OngkirTable(path, stamp, json.load(f))
+        _tables[path] = table
+        return table
+
+
+if __name__ == "__main__":
+    write_ongkir_table()
@@ -0,0 +1,320 @@
+"""
+overpass_cache.py
+Bangun graf jalan langsung dari respons Overpass yang sudah di-cache OSMnx
+(cache/*.json dan UI/seller/cache/*.json), tanpa jaringan.
+
+File cache berisi satu objek JSON dengan array `elements` yang besar. Array itu
+dibaca secara streaming (elemen demi elemen via JSONDecoder.raw_decode) lalu
+diteruskan ke pembangun graf OSMnx per batch, sehingga daftar elemen mentah
+tidak pernah ada utuh di memori, apalagi dua kali.
+
+Indeks cache (bbox yang dicakup tiap file, jumlah elemen, timestamp OSM, tipe
+jaringan yang terdeteksi) disimpan di INDEX_PATH dan hanya dipindai ulang untuk
+file yang ukuran/mtime-nya berubah.
+
+Fungsi utama:
+- iter_elements(path): generator elemen OSM dari satu file cache (streaming)
+- iter_json_array(path, key): sama, untuk array level atas mana pun (mis. `features`)
+- read_json_header(path, key): kunci level atas sebelum array tersebut
+- scan_response(path): ringkasan satu file (bbox, jumlah node/way, timestamp, network)
+- load_cache_index(dirs, refresh): {path: ringkasan} untuk semua file cache
+- find_cache_files(bbox, network_type): file yang mencakup bbox, terkecil dulu
+- graph_from_cache(point, dist, network_type, path): graf seperti ox.graph_from_point
+  (fallback ke ox.graph_from_point jika versi osmnx belum didukung)
+"""
+
+import json
+import os
+import re
+import threading
+from itertools import islice
+from typing import Dict, Iterator, List, Optional
+
+GRAPH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(GRAPH_DIR))
+CACHE_DIRS = [
+    os.path.join(PROJECT_ROOT, "cache"),
+    os.path.join(PROJECT_ROOT, "UI", "seller", "cache"),
+]
+INDEX_PATH = os.path.join(GRAPH_DIR, "cache", "overpass_index.json")
+
+CHUNK_SIZE = 1 << 20   # byte per pembacaan file
+BATCH_SIZE = 20000     # elemen per batch ke pembangun graf
+BUFFER_DIST = 500      # meter; sama dengan buffer polygon di ox.graph_from_polygon
+# Rentang versi osmnx [min, max) yang fungsi privat osmnx.graph._create_graph-nya
+# sudah dicek (signature: responses, bidirectional). Di luar rentang ini graf
+# dibangun lewat ox.graph_from_point (API publik; cache Overpass tetap dipakai
+# jika query-nya persis sama).
+OSMNX_PRIVATE_API_RANGE = ((2, 0), (2, 2))
+
+# Tag highway yang tidak pernah lolos filter "drive" OSMnx
+_NON_DRIVE_HIGHWAYS = {
+    "footway", "path", "pedestrian", "steps", "cycleway", "track", "bridleway",
+    "corridor", "elevator", "escalator", "platform", "service",
+}
+
+_TIMESTAMP_RE = re.compile(r'"timestamp_osm_base"\s*:\s*"([^"]*)"')
+_index_lock = threading.Lock()
+
+
+class OverpassCacheError(Exception):
+    """Tidak ada respons cache yang cocok atau file cache rusak."""
+
+
+# =============================================================================
+# STREAMING PARSER
+# =============================================================================
+
+def _read_header(f, buf: str, key: str = "elements"):
+    """Baca sampai awal array `key`; kembalikan (buffer sisa setelah '[', header sebelum key)."""
+    pattern = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+    while True:
+        m = pattern.search(buf)
+        if m:
+            return buf[m.end():], buf[:m.start()]
+        chunk = f.read(CHUNK_SIZE)
+        if not chunk:
+            raise OverpassCacheError(f"Tidak ada array `{key}` di file JSON.")
+        buf += chunk
+
+
+def read_json_header(path: str, key: str) -> dict:
+    """Kunci-kunci level atas yang muncul SEBELUM array `key` (mis. type/name/crs GeoJSON)."""
+    with open(path, "r", encoding="utf-8") as f:
+        _, header = _read_header(f, f.read(4096), key)
+    text = header.strip().rstrip(",")
+    return json.loads(text + "}") if text != "{" else {}
+
+
+def iter_json_array(path: str, key: str) -> Iterator[dict]:
+    """
+    Item array `key` di level atas sebuah file JSON besar, dibaca bertahap
+    (dipakai juga untuk `features` GeoJSON di logic/graph/regions.py).
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buf, _ = _read_header(f, "", key)
+        pos = 0
+        eof = False
+        while True:
+            # lewati spasi & koma antar elemen
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf) and buf[pos] == "]":
+                return
+            try:
+                if pos >= len(buf):
+                    raise ValueError("buffer habis")
+                element, end = decoder.raw_decode(buf, pos)
+            except ValueError:
+                # elemen terpotong di batas chunk: buang bagian terpakai, baca lagi
+                if eof:
+                    raise OverpassCacheError(f"File JSON terpotong/rusak: {path}")
+                chunk = f.read(CHUNK_SIZE)
+                eof = not chunk
+                buf = buf[pos:] + chunk
+                pos = 0
+                continue
+            yield element
+            pos = end
+
+
+def iter_elements(path: str) -> Iterator[dict]:
+    """Elemen OSM (node/way/relation) dari satu file cache, dibaca bertahap."""
+    return iter_json_array(path, "elements")
+
+
+def _batched(iterable, size: int):
+    it = iter(iterable)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+# =============================================================================
+# INDEKS
+# =============================================================================
+
+def scan_response(path: str) -> dict:
+    """Ringkasan satu file cache tanpa memuat seluruh isinya."""
+    with open(path, "r", encoding="utf-8") as f:
+        _, header = _read_header(f, f.read(4096))
+    m = _TIMESTAMP_RE.search(header)
+
+    south = west = float("inf")
+    north = east = float("-inf")
+    n_nodes = n_ways = 0
+    highways = set()
+    for el in iter_elements(path):
+        kind = el.get("type")
+        if kind == "node":
+            n_nodes += 1
+            lat, lon = el["lat"], el["lon"]
+            south, north = min(south, lat), max(north, lat)
+            west, east = min(west, lon), max(east, lon)
+        elif kind == "way":
+            n_ways += 1
+            hw = el.get("tags", {}).get("highway")
+            if hw:
+                highways.add(hw)
+
+    return {
+        "bbox": [south, west, north, east] if n_nodes else None,
+        "nodes": n_nodes,
+        "ways": n_ways,
+        "timestamp": m.group(1) if m else None,
+        "highways": sorted(highways),
+        "network": "all" if highways & _NON_DRIVE_HIGHWAYS else "drive",
+        "size": os.path.getsize(path),
+        "mtime": os.path.getmtime(path),
+    }
+
+
+def _cache_files(dirs) -> List[str]:
+    files = []
+    for d in dirs:
+        if os.path.isdir(d):
+            files.extend(os.path.join(d, name) for name in sorted(os.listdir(d)) if name.endswith(".json"))
+    return files
+
+
+def load_cache_index(dirs=None, refresh: bool = False) -> Dict[str, dict]:
+    """
+    Indeks {path: ringkasan} semua file cache Overpass. Entri lama dipakai ulang
+    selama ukuran & mtime file sama; hanya file baru/berubah yang dipindai.
+    """
+    dirs = CACHE_DIRS if dirs is None else dirs
+    with _index_lock:
+        old = {}
+        if not refresh and os.path.exists(INDEX_PATH):
+            try:
+                with open(INDEX_PATH, "r", encoding="utf-8") as f:
+                    old = json.load(f)
+            except (OSError, ValueError):
+                old = {}
+
+        index = {}
+        changed = False
+        for path in _cache_files(dirs):
+            entry = old.get(path)
+            if entry and entry.get("size") == os.path.getsize(path) and entry.get("mtime") == os.path.getmtime(path):
+                index[path] = entry
+                continue
+            try:
+                index[path] = scan_response(path)
+            except OverpassCacheError as e:
+                print(f"[WARN] {e}")
+                continue
+            changed = True
+
+        if changed or set(index) != set(old):
+            try:
+                os.makedirs(os.path.dirname(INDEX_PATH), exist_ok=True)
+                tmp_path = INDEX_PATH + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(index, f, indent=1)
+                os.replace(tmp_path, INDEX_PATH)
+            except OSError as e:
+                print(f"Peringatan: gagal menyimpan indeks cache Overpass: {e}")
+        return index
+
+
+def _covers(outer, inner) -> bool:
+    return outer[0] <= inner[0] and outer[1] <= inner[1] and outer[2] >= inner[2] and outer[3] >= inner[3]
+
+
+def find_cache_files(bbox, network_type: str = "drive", dirs=None) -> List[str]:
+    """
+    File cache yang bbox-nya mencakup `bbox` (south, west, north, east), urut dari
+    yang terkecil. Untuk network "drive" hanya respons yang berisi jalan kendaraan.
+    """
+    candidates = []
+    for path, entry in load_cache_index(dirs).items():
+        if not entry.get("bbox") or not _covers(entry["bbox"], bbox):
+            continue
+        if network_type == "drive" and entry.get("network") != "drive":
+            continue
+        s, w, n, e = entry["bbox"]
+        candidates.append(((n - s) * (e - w), path))
+    return [path for _, path in sorted(candidates)]
+
+
+# =============================================================================
+# GRAF
+# =============================================================================
+
+def _private_graph_builder():
+    """osmnx.graph._create_graph jika versi osmnx ada di OSMNX_PRIVATE_API_RANGE, selain itu None."""
+    import osmnx as ox
+    try:
+        version = tuple(int(p) for p in re.findall(r"\d+", ox.__version__)[:2])
+    except ValueError:
+        return None
+    low, high = OSMNX_PRIVATE_API_RANGE
+    if not (low <= version < high):
+        return None
+    from osmnx import graph as ox_graph
+    return getattr(ox_graph, "_create_graph", None)
+
+
+def _graph_from_point(point, dist: int, network_type: str, simplify: bool, reason: str):
+    import osmnx as ox
+    print(f"Peringatan: {reason}; graf dibangun lewat ox.graph_from_point.")
+    return ox.graph_from_point(point, dist=dist, network_type=network_type, simplify=simplify)
+
+
+def graph_from_cache(point, dist: int = 1000, network_type: str = "drive", path: Optional[str] = None,
+                     simplify: bool = True):
+    """
+    Graf jalan di sekitar `point` (lat, lon) dari respons Overpass ter-cache,
+    mengikuti langkah ox.graph_from_point (dist_type="bbox"): bbox + buffer 500 m,
+    komponen terbesar, simplifikasi, lalu potong kembali ke bbox.
+    `path` memaksa file tertentu; default: file terkecil yang mencakup area.
+    """
+    import networkx as nx
+    import osmnx as ox
+    from osmnx import simplification, stats, truncate, utils_geo
+
+    west, south, east, north = utils_geo.bbox_from_point(point, dist)
+    polygon = utils_geo.bbox_to_poly((west, south, east, north))
+    poly_proj, crs_utm = ox.projection.project_geometry(polygon)
+    poly_buff, _ = ox.projection.project_geometry(poly_proj.buffer(BUFFER_DIST), crs=crs_utm, to_latlong=True)
+
+    if path is None:
+        # Respons harus mencakup area ber-buffer, bukan hanya bbox, agar ruas di tepi ikut
+        b_west, b_south, b_east, b_north = poly_buff.bounds
+        files = find_cache_files([b_south, b_west, b_north, b_east], network_type)
+        if not files:
+            raise OverpassCacheError(
+                f"Tidak ada respons Overpass ter-cache yang mencakup {point} radius {dist} m ({network_type})."
+            )
+        path = files[0]
+
+    create_graph = _private_graph_builder()
+    if create_graph is None:
+        return _graph_from_point(point, dist, network_type, simplify,
+                                 f"osmnx {ox.__version__} di luar rentang yang didukung overpass_cache")
+
+    bidirectional = network_type in ox.settings.bidirectional_network_types
+    # Pembangun graf OSMnx menerima iterable respons; tiap batch elemen dibungkus
+    # sebagai "respons" kecil sehingga file besar tidak perlu dimuat utuh.
+    responses = ({"elements": batch} for batch in _batched(iter_elements(path), BATCH_SIZE))
+    try:
+        G_buff = create_graph(responses, bidirectional)
+    except TypeError as e:
+        # Signature fungsi privat berubah walau versinya masih di rentang
+        return _graph_from_point(point, dist, network_type, simplify, f"osmnx.graph._create_graph berubah ({e})")
+
+    G_buff = truncate.truncate_graph_polygon(G_buff, poly_buff, truncate_by_edge=False)
+    G_buff = truncate.largest_component(G_buff, strongly=False)
+    if simplify:
+        G_buff = simplification.simplify_graph(G_buff)
+    G = truncate.truncate_graph_polygon(G_buff, polygon, truncate_by_edge=False)
+    G = truncate.largest_component(G, strongly=False)
+    nx.set_node_attributes(G, values=stats.count_streets_per_node(G_buff, nodes=G.nodes), name="street_count")
+    print(f"[OK] Graf dibangun dari cache Overpass {os.path.basename(path)} "
+          f"({G.number_of_nodes()} simpul, {G.number_of_edges()} sisi)")
+    return G
+
@@ -4,6 +4,10 @@ import networkx as nx
 import geopandas as gpd
 import matplotlib.pyplot as plt
 
+from logic.graph.graph_simplify import location_nodes, resolve_node, simplify_routing_graph
+from logic.graph.graph_view import closure_view, connectivity
+from logic.tracing import span
+
 # =============================================================================
 # BAGIAN SETUP AWAL (Cukup dijalankan sekali saat aplikasi pertama kali start)
 # =============================================================================
@@ -11,6 +15,8 @@ import matplotlib.pyplot as plt
 def muat_data_peta_dan_lokasi(point, distance=1000, network_type="drive", path_ke_geojson="intersections_named_final.geojson"):
     """
     Memuat graf peta dari OSMnx DAN data lokasi penting dari file GeoJSON.
+    Graf langsung disederhanakan (graph_simplify.py) agar routing & analisis lebih ringan;
+    simpul lokasi di GeoJSON dipertahankan sehingga jarak per nama tidak berubah.
     """
     print("Memuat graf jaringan jalan dari OpenStreetMap...")
     try:
@@ -21,6 +27,7 @@ def muat_data_peta_dan_lokasi(point, distance=1000, network_type="drive", path_k
         # 2. Muat data lokasi penting dari file GeoJSON
         gdf_lokasi = gpd.read_file(path_ke_geojson)
         print("[OK] Data lokasi penting (GeoJSON) berhasil dimuat.")
+        G = simplify_routing_graph(G, keep=location_nodes(G, gdf_lokasi))
 
         # Untuk melihat nama kolom
         print("Nama kolom yang tersedia di GeoJSON:", gdf_lokasi.columns)
@@ -35,7 +42,7 @@ def muat_data_peta_dan_lokasi(point, distance=1000, network_type="drive", path_k
 # FUNGSI INTI UNTUK DIJALANKAN DARI GUI (VERSI BARU)
 # =============================================================================
 
-def cari_rute_by_nama(G, gdf_lokasi, nama_awal, nama_akhir, show_preview: bool = False):
+def cari_rute_by_nama(G, gdf_lokasi, nama_awal, nama_akhir, show_preview: bool = False, name_index=None):
     """
     Fungsi utama yang mencari rute berdasarkan NAMA lokasi, bukan koordinat.
 
@@ -45,28 +52,38 @@ def cari_rute_by_nama(G, gdf_lokasi, nama_awal, nama_akhir, show_preview: bool =
         nama_awal (str): Nama lokasi awal (misal, "Depot Pusat").
         nama_akhir (str): Nama lokasi tujuan (misal, "Mitra_Sarijadi").
         show_preview (bool): Menampilkan preview rute jika True.
+        name_index (dict, opsional): Peta intersection_name -> simpul graf yang sudah
+            dihitung sebelumnya (lihat map_cache.RoutingData.name_to_node). Jika nama
+            ada di indeks dan simpulnya masih ada di G, pencarian nearest node dilewati.
 
     Returns:
         tuple: Berisi (daftar_sisi_rute, panjang_rute) jika berhasil,
                atau (None, None) jika gagal.
     """
     try:
-        # 1. Cari baris data untuk nama awal dan akhir di tabel GeoDataFrame
-        lokasi_awal = gdf_lokasi[gdf_lokasi['intersection_name'] == nama_awal].iloc[0]
-        lokasi_akhir = gdf_lokasi[gdf_lokasi['intersection_name'] == nama_akhir].iloc[0]
-        
-        # 2. Ambil koordinat dari geometri-nya
-        coord_awal = (lokasi_awal.geometry.y, lokasi_awal.geometry.x)
-        coord_akhir = (lokasi_akhir.geometry.y, lokasi_akhir.geometry.x)
-
-        # 3. Terjemahkan koordinat ke ID simpul terdekat (sama seperti sebelumnya)
-        node_awal = ox.distance.nearest_nodes(G, coord_awal[1], coord_awal[0])
-        node_akhir = ox.distance.nearest_nodes(G, coord_akhir[1], coord_akhir[0])
+        # 0. Jalur cepat: pakai indeks nama -> simpul yang sudah dihitung
+        name_index = name_index or {}
+        node_awal = name_index.get(nama_awal)
+        node_akhir = name_index.get(nama_akhir)
+        if node_awal not in G or node_akhir not in G:
+            with span("route.resolve_names"):
+                # 1. Cari baris data untuk nama awal dan akhir di tabel GeoDataFrame
+                lokasi_awal = gdf_lokasi[gdf_lokasi['intersection_name'] == nama_awal].iloc[0]
+                lokasi_akhir = gdf_lokasi[gdf_lokasi['intersection_name'] == nama_akhir].iloc[0]
+
+                # 2. Ambil koordinat dari geometri-nya
+                coord_awal = (lokasi_awal.geometry.y, lokasi_awal.geometry.x)
+                coord_akhir = (lokasi_akhir.geometry.y, lokasi_akhir.geometry.x)
+
+                # 3. Terjemahkan koordinat ke ID simpul terdekat (sama seperti sebelumnya)
+                node_awal = ox.distance.nearest_nodes(G, coord_awal[1], coord_awal[0])
+                node_akhir = ox.distance.nearest_nodes(G, coord_akhir[1], coord_akhir[0])
         
         # 4. Jalankan Algoritma Dijkstra
         print(f"Mencari rute dari '{nama_awal}' (simpul {node_awal}) ke '{nama_akhir}' (simpul {node_akhir})...")
-        shortest_path_nodes = nx.dijkstra_path(G, node_awal, node_akhir, weight='length')
-        path_length = nx.dijkstra_path_length(G, node_awal, node_akhir, weight='length')
+        with span("route.dijkstra", nodes=G.number_of_nodes()):
+            shortest_path_nodes = nx.dijkstra_path(G, node_awal, node_akhir, weight='length')
+            path_length = nx.dijkstra_path_length(G, node_awal, node_akhir, weight='length')
         path_length_km = path_length / 1000
         
         print(f"[OK] Rute ditemukan dengan panjang {path_length_km:.2f} km.")
@@ -186,7 +203,9 @@ def buat_visualisasi_timeline_dijkstra(
                 gdf_lokasi_indexed = gdf_lokasi.set_index('osmid')
             else:
                 gdf_lokasi_indexed = gdf_lokasi
-            nama_simpul_map = gdf_lokasi_indexed['intersection_name'].to_dict()
+            # osmid asli -> simpul graf (simpul antara yang dikontraksi -> ujung ruasnya)
+            nama_simpul_map = {resolve_node(G_peta, osmid) or osmid: nama
+                               for osmid, nama in gdf_lokasi_indexed['intersection_name'].items()}
         except KeyError:
             print("Peringatan: Kolom 'osmid' atau 'intersection_name' tidak ditemukan di gdf_lokasi.")
         except Exception as e:
@@ -363,21 +382,20 @@ def simulasi_putus_jalur(G, elemen_diputus):
         print("Tidak ada elemen yang dipilih untuk diputus.")
         return
 
-    # PENTING: Selalu buat salinan graf agar graf asli tidak rusak!
-    G_copy = G.copy()
-    
+    # Graf asli tidak disalin maupun diubah: penutupan diterapkan sebagai view
+    # yang menyaring simpul/sisi saat traversal (lihat graph_view.py)
     nama_elemen = str(elemen_diputus)
     
-    # Cek apakah elemen adalah simpul atau sisi, lalu hapus
+    # Cek apakah elemen adalah simpul atau sisi, lalu tutup
     if isinstance(elemen_diputus, (int, str)): # Jika input adalah ID simpul
         print(f"Mensimulasikan penutupan persimpangan: {nama_elemen}...")
-        G_copy.remove_node(elemen_diputus)
+        G_copy = closure_view(G, nodes=[elemen_diputus])
         tipe = "Persimpangan"
     elif isinstance(elemen_diputus, tuple) and len(elemen_diputus) == 2: # Jika input adalah sisi
         print(f"Mensimulasikan penutupan jalan: {nama_elemen}...")
-        # Pastikan sisi ada sebelum mencoba menghapus
-        if G_copy.has_edge(*elemen_diputus):
-            G_copy.remove_edge(*elemen_diputus)
+        # Pastikan sisi ada sebelum mencoba menutup
+        if G.has_edge(*elemen_diputus):
+            G_copy = closure_view(G, edges=[elemen_diputus], both_directions=False)
             tipe = "Jalan"
         else:
             print(f"Error: Sisi {nama_elemen} tidak ditemukan di graf.")
@@ -386,11 +404,11 @@ def simulasi_putus_jalur(G, elemen_diputus):
         print("Error: Input elemen tidak valid.")
         return
 
-    # Analisis dampak setelah penghapusan
-    if nx.is_connected(G_copy):
+    # Analisis dampak setelah penutupan (keterhubungan lemah untuk graf berarah)
+    terhubung, jumlah_komponen = connectivity(G_copy)
+    if terhubung:
         status = "Jaringan TETAP TERHUBUNG."
     else:
-        jumlah_komponen = nx.number_connected_components(G_copy)
         status = f"Jaringan TERPUTUS menjadi {jumlah_komponen} bagian!"
 
     print(f"Hasil: {status}")
@@ -0,0 +1,377 @@
+"""
+pipeline.py
+Pipeline build data peta bertahap (pengganti skrip tunggal scrape_roads.py).
+
+Tahap:
+    fetch -> normalize -> name -> region -> export -> render
+
+- fetch     : geocode lokasi (jika titik belum diberikan) + unduh graf OSMnx
+- normalize : graf -> GeoDataFrame node/edge + daftar simpang (derajat >= 3)
+- name      : nama unik ruas jalan & nama simpang (logic/graph/naming.py)
+- region    : kolom region_name untuk simpang (logika convert.py, logic/graph/regions.py)
+- export    : GeoJSON/Shapefile ke folder output
+- render    : road_map_detailed.html (logic/graph/map_render.py)
+
+Setiap tahap menyimpan artefak di ARTIFACT_DIR dengan nama berbasis hash dari
+(nama tahap, versi tahap, parameter, hash ISI artefak tahap sebelumnya). Saat
+dijalankan ulang, tahap yang masukannya tidak berubah dilewati; jika sebuah tahap
+gagal, run berikutnya melanjutkan dari artefak terakhir yang berhasil.
+
+Respons Overpass di-cache oleh OSMnx di folder cache/ proyek. Dengan --offline
+tidak ada request jaringan sama sekali: graf dibangun dari cache tersebut (query
+persis, atau dirakit dari respons lain yang mencakup area lewat overpass_cache)
+dan titik hasil geocode yang pernah disimpan; jika tidak ada, gagal dengan pesan jelas.
+
+Pemakaian:
+    python -m logic.graph.pipeline
+    python -m logic.graph.pipeline --offline --point=-6.872,107.578 --distance 1000
+    python -m logic.graph.pipeline --until name --force name
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import time
+
+STAGES = ("fetch", "normalize", "name", "region", "export", "render")
+
+# Naikkan versi sebuah tahap jika logikanya berubah agar artefak lama tidak dipakai
+STAGE_VERSION = {
+    "fetch": 1,
+    "normalize": 1,
+    "name": 1,
+    "region": 2,
+    "export": 1,
+    "render": 1,
+}
+
+GRAPH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(GRAPH_DIR))
+DEFAULT_CONFIG = os.path.join(PROJECT_ROOT, "config.yaml")
+OVERPASS_CACHE_DIR = os.path.join(PROJECT_ROOT, "cache")
+ARTIFACT_DIR = os.path.join(GRAPH_DIR, "cache", "pipeline")
+DEFAULT_OUT = os.path.join(PROJECT_ROOT, "output")
+
+# Proxy yang pasti menolak koneksi: cache miss di mode offline langsung gagal
+OFFLINE_PROXY = "http://127.0.0.1:9"
+
+
+class PipelineError(Exception):
+    """Tahap pipeline gagal dengan alasan yang bisa ditindaklanjuti pengguna."""
+
+
+def _hash_parts(*parts) -> str:
+    text = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _file_sha1(path: str) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _write_atomic(path: str, write):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+def configure_osmnx(offline: bool = False):
+    """Arahkan cache OSMnx ke cache/ proyek; di mode offline matikan semua akses jaringan."""
+    import osmnx as ox
+    ox.settings.cache_folder = OVERPASS_CACHE_DIR
+    ox.settings.use_cache = True
+    if offline:
+        # requests_timeout tidak diubah: nilainya ikut di query Overpass (= kunci cache)
+        ox.settings.overpass_rate_limit = False  # tanpa request ke endpoint /status
+        ox.settings.requests_kwargs = {"proxies": {"http": OFFLINE_PROXY, "https": OFFLINE_PROXY}}
+    return ox
+
+
+def load_config(path: str = DEFAULT_CONFIG) -> dict:
+    if not os.path.exists(path):
+        return {}
+    import yaml
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def _export_frame(gdf):
+    """Kolom berisi list (osmid, name, ...) tidak didukung GeoJSON/Shapefile; jadikan teks."""
+    out = gdf.reset_index()
+    for col in out.columns:
+        if col == "geometry" or out[col].dtype != object:
+            continue
+        if out[col].map(lambda v: isinstance(v, (list, set, tuple))).any():
+            out[col] = out[col].map(lambda v: ", ".join(map(str, v)) if isinstance(v, (list, set, tuple)) else v)
+    return out
+
+
+class _Artifact:
+    """Artefak pickle satu tahap; isinya baru dibaca saat dibutuhkan tahap berikutnya."""
+
+    def __init__(self, path: str, value=None):
+        self.path = path
+        self._value = value
+        self._loaded = value is not None
+        self.sha = _file_sha1(path)
+
+    def load(self):
+        if not self._loaded:
+            with open(self.path, "rb") as f:
+                self._value = pickle.load(f)
+            self._loaded = True
+        return self._value
+
+
+class MapPipeline:
+    """
+    Satu run pipeline untuk satu set parameter.
+
+    location/point: titik pusat; jika point None, lokasi di-geocode (hasilnya ikut di-cache)
+    force: nama-nama tahap yang wajib dijalankan ulang walau artefaknya ada
+    """
+
+    def __init__(self, location: str | None = None, point=None, distance: int = 1000,
+                 network_type: str = "drive", out_dir: str = DEFAULT_OUT,
+                 artifact_dir: str = ARTIFACT_DIR, offline: bool = False, force=()):
+        if point is None and not location:
+            raise PipelineError("Butuh --point atau `location` di config.yaml.")
+        self.location = location
+        self.point = tuple(point) if point is not None else None
+        self.distance = int(distance)
+        self.network_type = network_type
+        self.out_dir = out_dir
+        self.artifact_dir = artifact_dir
+        self.offline = offline
+        self.force = set(force)
+        self.timings = {}  # tahap -> detik (None jika dilewati)
+
+    # --- runner ---
+    def _artifact_path(self, stage: str, key: str, ext: str) -> str:
+        return os.path.join(self.artifact_dir, f"{stage}-{key[:16]}.{ext}")
+
+    def _stage(self, stage: str, params: dict, upstream: list, build, is_valid=None) -> _Artifact:
+        """
+        Jalankan `build()` (-> objek yang dipickle) kecuali artefak dengan kunci sama
+        sudah ada (dan, jika diberikan, `is_valid(isi_artefak)` bernilai True).
+        """
+        key = _hash_parts(stage, STAGE_VERSION[stage], params, [a.sha for a in upstream])
+        path = self._artifact_path(stage, key, "pkl")
+        if stage not in self.force and os.path.exists(path):
+            artifact = _Artifact(path)
+            if is_valid is None or is_valid(artifact.load()):
+                print(f"[SKIP] {stage}: artefak {os.path.basename(path)} masih berlaku")
+                self.timings[stage] = None
+                return artifact
+
+        print(f"[RUN ] {stage} ...")
+        t0 = time.perf_counter()
+        value = build()
+        os.makedirs(self.artifact_dir, exist_ok=True)
+        _write_atomic(path, lambda f: pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL))
+        self.timings[stage] = time.perf_counter() - t0
+        print(f"[OK  ] {stage} selesai dalam {self.timings[stage]:.2f} dtk")
+        return _Artifact(path, value)
+
+    def _file_stage(self, stage: str, params: dict, upstream: list, build) -> _Artifact:
+        """
+        Tahap yang menulis file ke out_dir. `build()` mengembalikan daftar path;
+        artefaknya {path: sha1} sehingga tahap diulang bila file output hilang/diubah.
+        """
+        def build_files():
+            return {p: _file_sha1(p) for p in build()}
+
+        def outputs_intact(files):
+            return all(os.path.exists(p) and _file_sha1(p) == sha for p, sha in files.items())
+
+        return self._stage(stage, dict(params, out_dir=self.out_dir), upstream, build_files, outputs_intact)
+
+    # --- tahap ---
+    def _resolve_point(self):
+        """Titik pusat; hasil geocode disimpan agar run berikutnya (dan mode offline) tidak perlu Nominatim."""
+        if self.point is not None:
+            return self.point
+        path = os.path.join(self.artifact_dir, f"geocode-{_hash_parts(self.location)[:16]}.json")
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.point = tuple(json.load(f)["point"])
+            return self.point
+        if self.offline:
+            raise PipelineError(f"Titik untuk '{self.location}' belum pernah di-geocode; berikan --point saat offline.")
+
+        ox = configure_osmnx(self.offline)
+        print(f"Mencari koordinat untuk: {self.location}")
+        try:
+            self.point = tuple(ox.geocode(self.location))
+        except Exception as e:
+            raise PipelineError(f"Geocode '{self.location}' gagal: {e}") from e
+        os.makedirs(self.artifact_dir, exist_ok=True)
+        _write_atomic(path, lambda f: f.write(json.dumps({"location": self.location, "point": self.point}).encode("utf-8")))
+        print(f"Koordinat: {self.point}")
+        return self.point
+
+    def fetch(self) -> _Artifact:
+        point = self._resolve_point()
+        ox = configure_osmnx(self.offline)
+        params = {"point": [round(point[0], 7), round(point[1], 7)], "distance": self.distance,
+                  "network_type": self.network_type, "osmnx": ox.__version__}
+
+        def build():
+            print("Mengambil jaringan jalan dari OpenStreetMap (cache Overpass dipakai bila ada)...")
+            try:
+                return ox.graph_from_point(point, dist=self.distance, network_type=self.network_type)
+            except Exception as e:
+                if self.offline:
+                    # Query persis belum pernah diunduh; coba rakit dari respons lain yang mencakup area
+                    from logic.graph.overpass_cache import OverpassCacheError, graph_from_cache
+                    try:
+                        return graph_from_cache(point, self.distance, self.network_type)
+                    except OverpassCacheError:
+                        pass
+                    raise PipelineError(
+                        f"Respons Overpass untuk titik {point} / {self.distance} m belum ada di "
+                        f"{OVERPASS_CACHE_DIR}; jalankan sekali tanpa --offline. ({type(e).__name__})"
+                    ) from e
+                raise
+
+        return self._stage("fetch", params, [], build)
+
+    def normalize(self, fetched: _Artifact) -> _Artifact:
+        def build():
+            import osmnx as ox
+            G = fetched.load()
+            nodes, edges = ox.graph_to_gdfs(G)
+            intersections = [node for node, degree in G.degree() if degree >= 3]
+            return {"nodes": nodes, "edges": edges, "intersections": nodes.loc[intersections].copy()}
+
+        return self._stage("normalize", {}, [fetched], build)
+
+    def name(self, normalized: _Artifact) -> _Artifact:
+        def build():
+            from logic.graph.naming import intersection_names, unique_road_names
+            data = normalized.load()
+            edges = data["edges"].copy()
+            inter = data["intersections"].copy()
+            edges["unique_name"] = unique_road_names(edges["name"] if "name" in edges.columns else [None] * len(edges))
+            inter["intersection_name"] = intersection_names(inter.index, edges)
+            return {"edges": edges, "intersections": inter}
+
+        return self._stage("name", {}, [normalized], build)
+
+    def region(self, named: _Artifact) -> _Artifact:
+        def build():
+            from logic.graph.regions import tag_regions
+            return tag_regions(named.load()["intersections"])
+
+        return self._stage("region", {}, [named], build)
+
+    def export(self, named: _Artifact, regioned: _Artifact) -> _Artifact:
+        def build():
+            data = named.load()
+            edges = data["edges"]
+            os.makedirs(self.out_dir, exist_ok=True)
+            paths = {
+                "road_names": os.path.join(self.out_dir, "road_names.geojson"),
+                "roads": os.path.join(self.out_dir, "roads.geojson"),
+                "roads_shp": os.path.join(self.out_dir, "roads.shp"),
+                "intersections": os.path.join(self.out_dir, "intersections_named.geojson"),
+                "regions": os.path.join(self.out_dir, "output.geojson"),
+            }
+            roads = _export_frame(edges)
+            road_names = edges[["unique_name", "geometry"]].rename(columns={"unique_name": "road_name"})
+            road_names.to_file(paths["road_names"], driver="GeoJSON")
+            roads.to_file(paths["roads"], driver="GeoJSON")
+            roads.to_file(paths["roads_shp"])
+            _export_frame(data["intersections"]).to_file(paths["intersections"], driver="GeoJSON")
+            _export_frame(regioned.load()).to_file(paths["regions"], driver="GeoJSON")
+            return list(paths.values())
+
+        return self._file_stage("export", {}, [named, regioned], build)
+
+    def render(self, named: _Artifact, regioned: _Artifact) -> _Artifact:
+        def build():
+            from logic.graph.map_render import intersection_rows_from_gdf, road_features_from_edges, write_road_map
+            os.makedirs(self.out_dir, exist_ok=True)
+            road_features = road_features_from_edges(named.load()["edges"], name_col="unique_name")
+            intersection_rows = intersection_rows_from_gdf(regioned.load())
+            map_file = os.path.join(self.out_dir, "road_map_detailed.html")
+            write_road_map(map_file, road_features, intersection_rows, center=self.point, zoom=15)
+            return [map_file]
+
+        return self._file_stage("render", {"center": self.point}, [named, regioned], build)
+
+    def run(self, until: str = "render") -> dict:
+        """Jalankan tahap berurutan sampai (termasuk) `until`. Mengembalikan {tahap: artefak}."""
+        if until not in STAGES:
+            raise PipelineError(f"Tahap tidak dikenal: {until}")
+        last = STAGES.index(until)
+        done = {}
+        done["fetch"] = self.fetch()
+        if last >= 1:
+            done["normalize"] = self.normalize(done["fetch"])
+        if last >= 2:
+            done["name"] = self.name(done["normalize"])
+        if last >= 3:
+            done["region"] = self.region(done["name"])
+        if last >= 4:
+            done["export"] = self.export(done["name"], done["region"])
+        if last >= 5:
+            done["render"] = self.render(done["name"], done["region"])
+        return done
+
+
+def _parse_point(text: str):
+    try:
+        lat, lon = (float(v) for v in text.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError("format titik: LAT,LON")
+    return lat, lon
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build data peta bertahap: " + " -> ".join(STAGES))
+    parser.add_argument("--config", default=DEFAULT_CONFIG)
+    parser.add_argument("--location", help="Nama lokasi untuk geocode (default: config.yaml)")
+    parser.add_argument("--point", type=_parse_point, help="Titik pusat LAT,LON (melewati geocode)")
+    parser.add_argument("--distance", type=int, help="Radius graf dalam meter (default: config.yaml)")
+    parser.add_argument("--network-type", help="Jenis jaringan OSMnx (default: config.yaml)")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="Folder output export/render")
+    parser.add_argument("--artifacts", default=ARTIFACT_DIR, help="Folder artefak antar tahap")
+    parser.add_argument("--until", default=STAGES[-1], choices=STAGES, help="Berhenti setelah tahap ini")
+    parser.add_argument("--force", nargs="*", default=[], choices=STAGES, help="Jalankan ulang tahap tertentu")
+    parser.add_argument("--offline", action="store_true", help="Tanpa jaringan: hanya dari cache Overpass")
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    point = args.point or (tuple(config["point"]) if config.get("point") else None)
+    pipeline = MapPipeline(
+        location=args.location or config.get("location"),
+        point=point,
+        distance=args.distance or config.get("distance", 1000),
+        network_type=args.network_type or config.get("network_type", "drive"),
+        out_dir=args.out,
+        artifact_dir=args.artifacts,
+        offline=args.offline,
+        force=args.force,
+    )
+    try:
+        pipeline.run(until=args.until)
+    except PipelineError as e:
+        print(f"[ERROR] {e}")
+        return 1
+
+    ran = [s for s, t in pipeline.timings.items() if t is not None]
+    print(f"\n[OK] Pipeline selesai. Dijalankan: {', '.join(ran) or '-'}; dilewati: "
+          f"{', '.join(s for s, t in pipeline.timings.items() if t is None) or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
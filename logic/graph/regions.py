@@ -0,0 +1,163 @@
+"""
+regions.py
+Penandaan wilayah (kelurahan) untuk titik simpang berdasarkan poligon wilayah.
+
+Batas wilayah dibaca dari GeoJSON (default: logic/graph/regions.geojson, properti
+`region_name` dan `priority`), jadi area layanan baru cukup ditambahkan sebagai
+data. Poligon dimasukkan ke STRtree (shapely) dan semua titik ditandai dalam satu
+kueri massal point-in-polygon. Jika satu titik masuk ke beberapa poligon (mis.
+tepat di garis batas), wilayah dengan `priority` terkecil yang dipakai.
+
+FeatureCollection besar diproses streaming per batch (tag_geojson_file), tanpa
+memuat seluruh fitur ke memori.
+
+Fungsi utama:
+- RegionIndex.from_geojson(path): indeks wilayah dari file poligon
+- get_region_index(path): indeks ter-cache per file
+- get_region_name(lat, lon): nama wilayah satu titik, "Unknown" jika di luar semua wilayah
+- tag_regions(gdf): tambah kolom region_name & buang kolom OSM yang tidak dipakai
+- tag_features(features): tandai list fitur GeoJSON (satu kueri untuk semua)
+- tag_geojson_file(input_path, output_path): tandai FeatureCollection secara streaming
+"""
+
+import json
+import os
+import threading
+from itertools import islice
+
+import numpy as np
+
+GRAPH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_REGIONS = os.path.join(GRAPH_DIR, "regions.geojson")
+
+UNKNOWN_REGION = "Unknown"
+DROPPED_COLUMNS = ("street_count", "ref", "highway")
+BATCH_SIZE = 50000  # fitur per batch saat streaming
+
+_lock = threading.Lock()
+_indexes = {}  # path -> RegionIndex
+
+
+class RegionIndex:
+    """
+    Indeks spasial poligon wilayah.
+
+    Atribut:
+    - names: nama wilayah per poligon
+    - priorities: prioritas per poligon (kecil = menang saat tumpang tindih)
+    - tree: shapely STRtree atas poligon
+    """
+
+    def __init__(self, names, geometries, priorities=None):
+        from shapely import STRtree
+        self.names = np.asarray(names, dtype=object)
+        self.priorities = np.asarray(priorities if priorities is not None else range(len(names)), dtype=float)
+        self.geometries = list(geometries)
+        self.tree = STRtree(self.geometries)
+
+    @classmethod
+    def from_geojson(cls, path: str = DEFAULT_REGIONS) -> "RegionIndex":
+        from shapely.geometry import shape
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        names, geoms, prios = [], [], []
+        for i, feat in enumerate(data.get("features", [])):
+            props = feat.get("properties") or {}
+            names.append(props.get("region_name") or f"Wilayah {i + 1}")
+            prios.append(props.get("priority", i))
+            geoms.append(shape(feat["geometry"]))
+        return cls(names, geoms, prios)
+
+    def lookup(self, lons, lats) -> np.ndarray:
+        """Nama wilayah untuk setiap (lon, lat); satu kueri STRtree untuk semua titik."""
+        import shapely
+        lons = np.asarray(lons, dtype=float)
+        lats = np.asarray(lats, dtype=float)
+        result = np.full(len(lons), UNKNOWN_REGION, dtype=object)
+        if len(lons) == 0 or not self.geometries:
+            return result
+
+        points = shapely.points(lons, lats)
+        point_idx, poly_idx = self.tree.query(points, predicate="intersects")
+        if len(point_idx) == 0:
+            return result
+
+        # Urutkan pasangan (titik, prioritas) lalu ambil kemunculan pertama per titik
+        order = np.lexsort((self.priorities[poly_idx], point_idx))
+        point_idx, poly_idx = point_idx[order], poly_idx[order]
+        first = np.concatenate(([True], point_idx[1:] != point_idx[:-1]))
+        result[point_idx[first]] = self.names[poly_idx[first]]
+        return result
+
+
+def get_region_index(path: str = DEFAULT_REGIONS) -> RegionIndex:
+    """RegionIndex untuk `path`, dibuat sekali per proses."""
+    key = os.path.abspath(path)
+    with _lock:
+        if key not in _indexes:
+            _indexes[key] = RegionIndex.from_geojson(key)
+        return _indexes[key]
+
+
+def get_region_name(lat, lon, regions: str = DEFAULT_REGIONS):
+    return get_region_index(regions).lookup([lon], [lat])[0]
+
+
+def tag_regions(gdf, regions: str = DEFAULT_REGIONS):
+    """Salinan `gdf` (GeoDataFrame simpang, kolom x/y) dengan kolom region_name."""
+    tagged = gdf.drop(columns=[c for c in DROPPED_COLUMNS if c in gdf.columns])
+    tagged["region_name"] = get_region_index(regions).lookup(gdf["x"].to_numpy(), gdf["y"].to_numpy())
+    return tagged
+
+
+def _feature_lonlat(feature):
+    """(lon, lat) fitur: properti x/y (output OSMnx) atau geometri Point."""
+    props = feature.get("properties") or {}
+    if "x" in props and "y" in props:
+        return props["x"], props["y"]
+    coords = (feature.get("geometry") or {}).get("coordinates") or [np.nan, np.nan]
+    return coords[0], coords[1]
+
+
+def tag_features(features: list, regions: str = DEFAULT_REGIONS, drop=DROPPED_COLUMNS) -> list:
+    """Tandai list fitur GeoJSON di tempat (region_name + buang kolom `drop`)."""
+    if not features:
+        return features
+    lons, lats = zip(*(_feature_lonlat(f) for f in features))
+    names = get_region_index(regions).lookup(lons, lats)
+    for feature, name in zip(features, names):
+        props = feature.setdefault("properties", {})
+        props["region_name"] = name
+        for key in drop:
+            props.pop(key, None)
+    return features
+
+
+def tag_geojson_file(input_path: str, output_path: str, regions: str = DEFAULT_REGIONS,
+                     batch_size: int = BATCH_SIZE) -> int:
+    """
+    Tandai FeatureCollection `input_path` dan tulis ke `output_path` secara streaming
+    (per batch fitur). Kunci level atas sebelum `features` (name, crs, ...) dipertahankan.
+    Mengembalikan jumlah fitur.
+    """
+    from logic.graph.overpass_cache import iter_json_array, read_json_header
+
+    head = read_json_header(input_path, "features")
+    head.setdefault("type", "FeatureCollection")
+
+    count = 0
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as out:
+        out.write(json.dumps(head, ensure_ascii=False)[:-1] + ', "features": [\n')
+        features = iter_json_array(input_path, "features")
+        while True:
+            batch = list(islice(features, batch_size))
+            if not batch:
+                break
+            for feature in tag_features(batch, regions):
+                out.write(",\n" if count else "")
+                out.write(json.dumps(feature, ensure_ascii=False))
+                count += 1
+        out.write("\n]}\n")
+    os.replace(tmp_path, output_path)
+    return count
@@ -0,0 +1,76 @@
+"""
+route_codec.py
+Encoding ringkas urutan simpul rute (osmid) untuk disimpan di record pesanan.
+
+Format "zvd1": selisih osmid berurutan (delta) -> zigzag (tanda ke bit terendah)
+-> varint 7-bit -> base64 URL-safe tanpa padding. Osmid simpul bertetangga
+sering berdekatan sehingga kebanyakan selisih muat 1-4 byte; rute 60 simpul
+cukup ~150-250 karakter, bukan ~700 karakter daftar angka JSON.
+
+Murni Python (tanpa graf/numpy) agar bisa dibaca dari sisi pelanggan.
+
+Fungsi utama:
+- encode_nodes(nodes) / decode_nodes(text): list osmid <-> string "zvd1"
+- encode_varints(values) / decode_varints(data): delta-zigzag-varint mentah (bytes)
+"""
+
+import base64
+from typing import Iterable, List
+
+ROUTE_CODEC = "zvd1"
+
+
+def _zigzag(n: int) -> int:
+    return (n << 1) if n >= 0 else ((-n << 1) - 1)
+
+
+def _unzigzag(z: int) -> int:
+    return (z >> 1) if not (z & 1) else -((z + 1) >> 1)
+
+
+def encode_varints(values: Iterable[int]) -> bytes:
+    """Delta antar nilai berurutan, zigzag, lalu varint (nilai pertama = delta dari 0)."""
+    out = bytearray()
+    prev = 0
+    for v in values:
+        v = int(v)
+        z = _zigzag(v - prev)
+        prev = v
+        while z >= 0x80:
+            out.append((z & 0x7F) | 0x80)
+            z >>= 7
+        out.append(z)
+    return bytes(out)
+
+
+def decode_varints(data: bytes) -> List[int]:
+    values = []
+    prev = 0
+    z = shift = 0
+    for byte in data:
+        z |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        prev += _unzigzag(z)
+        values.append(prev)
+        z = shift = 0
+    if shift:
+        raise ValueError("data varint terpotong")
+    return values
+
+
+def encode_nodes(nodes: Iterable[int]) -> str:
+    """Urutan osmid -> string ASCII ringkas (format ROUTE_CODEC)."""
+    return base64.urlsafe_b64encode(encode_varints(nodes)).rstrip(b"=").decode("ascii")
+
+
+def decode_nodes(text: str) -> List[int]:
+    """Kebalikan encode_nodes. ValueError jika string rusak."""
+    text = (text or "").strip()
+    padded = text + "=" * (-len(text) % 4)
+    try:
+        data = base64.urlsafe_b64decode(padded.encode("ascii"))
+    except (ValueError, UnicodeEncodeError) as e:
+        raise ValueError(f"rute ter-encode tidak valid: {e}") from e
+    return decode_varints(data)
@@ -0,0 +1,197 @@
+"""
+route_geometry.py
+Konversi rute (daftar simpul graf OSMnx) menjadi koordinat untuk peta web.
+
+Peta Leaflet hanya butuh koordinat polyline rute, bukan graf-nya, sehingga
+rute bisa dikirim ke halaman yang sudah termuat tanpa merender ulang basemap.
+
+Pipeline polyline rute: geometri ruas (path_to_latlon) -> penyederhanaan
+Douglas-Peucker tervektorisasi (numpy) dengan toleransi bergantung zoom ->
+encoding Google polyline. Toleransi setengah piksel pada zoom tampilan membuang
+titik yang tidak terlihat, sehingga payload overlay peta web, jumlah vertex yang
+digambar RoutePreviewDialog, dan ukuran rute tersimpan di pesanan ikut turun.
+
+Fungsi utama:
+- path_to_latlon(G, path_nodes, use_geometry): [[lat, lon], ...] mengikuti bentuk jalan
+- node_latlon(G, node): [lat, lon] satu simpul, atau None
+- zoom_tolerance_m(zoom, lat): toleransi (meter) = TOLERANCE_PX piksel pada zoom tsb.
+- extent_tolerance_m(span_lon, lat, width_px): idem untuk kanvas matplotlib (lebar derajat / piksel)
+- simplify_latlon(coords, tolerance_m): Douglas-Peucker tervektorisasi
+- route_polyline(G, path_nodes, zoom, tolerance_m): geometri rute yang sudah disederhanakan
+- encode_polyline(coords) / decode_polyline(text): format Google polyline (presisi 1e-5)
+"""
+
+import math
+from typing import List, Optional
+
+import numpy as np
+
+TOLERANCE_PX = 0.5            # toleransi penyederhanaan dalam piksel layar
+OVERLAY_ZOOM = 18             # zoom maksimum peta web: rute overlay tetap tajam saat di-zoom
+STORAGE_TOLERANCE_M = 2.0     # toleransi rute yang disimpan di record pesanan
+POLYLINE_PRECISION = 5
+METER_PER_DERAJAT = 111320.0
+
+
+def node_latlon(G, node) -> Optional[List[float]]:
+    if node not in G.nodes:
+        return None
+    data = G.nodes[node]
+    return [float(data['y']), float(data['x'])]
+
+
+def _edge_coords(G, u, v):
+    """Koordinat (lon, lat) sisi u->v terpendek; mengikuti geometry bila ada."""
+    edges = G.get_edge_data(u, v)
+    if not edges:
+        return None
+    data = min(edges.values(), key=lambda d: d.get('length', float('inf')))
+    geom = data.get('geometry')
+    if geom is None:
+        return None
+    coords = list(geom.coords)
+    # Geometry OSMnx searah u->v, tapi tetap dicek agar aman
+    ux, uy = G.nodes[u]['x'], G.nodes[u]['y']
+    first, last = coords[0], coords[-1]
+    if (first[0] - ux) ** 2 + (first[1] - uy) ** 2 > (last[0] - ux) ** 2 + (last[1] - uy) ** 2:
+        coords.reverse()
+    return coords
+
+
+def path_to_latlon(G, path_nodes: list, use_geometry: bool = True) -> List[List[float]]:
+    """
+    Ubah daftar simpul rute menjadi polyline [[lat, lon], ...].
+    Dengan use_geometry=True, tikungan jalan ikut tergambar (bukan garis lurus antar simpul).
+    """
+    nodes = [n for n in (path_nodes or []) if n in G.nodes]
+    if not nodes:
+        return []
+
+    coords = [node_latlon(G, nodes[0])]
+    for u, v in zip(nodes, nodes[1:]):
+        seg = _edge_coords(G, u, v) if use_geometry else None
+        if seg:
+            coords.extend([float(lat), float(lon)] for lon, lat in seg[1:])
+        else:
+            coords.append(node_latlon(G, v))
+    return coords
+
+
+# =============================================================================
+# PENYEDERHANAAN & ENCODING POLYLINE
+# =============================================================================
+
+def zoom_tolerance_m(zoom: float, lat: float = 0.0, tolerance_px: float = TOLERANCE_PX) -> float:
+    """Lebar `tolerance_px` piksel dalam meter pada level zoom web-mercator dan lintang `lat`."""
+    meter_per_px = 156543.03392 * math.cos(math.radians(lat)) / (2 ** zoom)
+    return tolerance_px * meter_per_px
+
+
+def extent_tolerance_m(span_lon: float, lat: float, width_px: float,
+                       tolerance_px: float = TOLERANCE_PX) -> float:
+    """Lebar `tolerance_px` piksel dalam meter untuk axes selebar `span_lon` derajat / `width_px` piksel."""
+    if width_px <= 0:
+        return 0.0
+    return tolerance_px * span_lon * METER_PER_DERAJAT * math.cos(math.radians(lat)) / width_px
+
+
+def simplify_latlon(coords, tolerance_m: float) -> List[List[float]]:
+    """
+    Douglas-Peucker atas [[lat, lon], ...] dengan toleransi dalam meter (proyeksi
+    equirectangular lokal). Jarak semua titik ke satu segmen dihitung sekaligus
+    dengan numpy; rekursi diganti stack. Titik awal & akhir selalu dipertahankan.
+    """
+    n = len(coords)
+    if n <= 2 or tolerance_m <= 0:
+        return [list(c) for c in coords]
+    pts = np.asarray(coords, dtype=float)
+    lat0 = math.radians(float(pts[:, 0].mean()))
+    xy = np.column_stack((pts[:, 1] * math.cos(lat0), pts[:, 0])) * METER_PER_DERAJAT
+
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    tol2 = tolerance_m * tolerance_m
+    while stack:
+        i, j = stack.pop()
+        if j - i < 2:
+            continue
+        seg = xy[j] - xy[i]
+        rel = xy[i + 1:j] - xy[i]
+        seg_len2 = float(seg @ seg)
+        if seg_len2 == 0.0:
+            d2 = (rel * rel).sum(axis=1)
+        else:
+            # Jarak ke SEGMEN (bukan garis tak hingga) agar rute bolak-balik tidak terpangkas
+            t = np.clip(rel @ seg / seg_len2, 0.0, 1.0)
+            diff = rel - np.outer(t, seg)
+            d2 = (diff * diff).sum(axis=1)
+        k = int(np.argmax(d2))
+        if d2[k] > tol2:
+            m = i + 1 + k
+            keep[m] = True
+            stack.append((i, m))
+            stack.append((m, j))
+    return pts[keep].tolist()
+
+
+def route_polyline(G, path_nodes: list, zoom: Optional[float] = None,
+                   tolerance_m: Optional[float] = None) -> List[List[float]]:
+    """
+    Polyline rute mengikuti geometri ruas, lalu disederhanakan: pakai `tolerance_m`
+    jika diberikan, selain itu toleransi setengah piksel pada `zoom` (default OVERLAY_ZOOM).
+    """
+    coords = path_to_latlon(G, path_nodes, use_geometry=True)
+    if len(coords) <= 2:
+        return coords
+    if tolerance_m is None:
+        lat = sum(c[0] for c in coords) / len(coords)
+        tolerance_m = zoom_tolerance_m(OVERLAY_ZOOM if zoom is None else zoom, lat)
+    return simplify_latlon(coords, tolerance_m)
+
+
+def _encode_value(value: int, out: list) -> None:
+    value = ~(value << 1) if value < 0 else (value << 1)
+    while value >= 0x20:
+        out.append(chr((0x20 | (value & 0x1F)) + 63))
+        value >>= 5
+    out.append(chr(value + 63))
+
+
+def encode_polyline(coords, precision: int = POLYLINE_PRECISION) -> str:
+    """[[lat, lon], ...] -> string Google encoded polyline."""
+    factor = 10 ** precision
+    out: list = []
+    prev_lat = prev_lon = 0
+    for lat, lon in coords:
+        ilat, ilon = int(round(lat * factor)), int(round(lon * factor))
+        _encode_value(ilat - prev_lat, out)
+        _encode_value(ilon - prev_lon, out)
+        prev_lat, prev_lon = ilat, ilon
+    return "".join(out)
+
+
+def decode_polyline(text: str, precision: int = POLYLINE_PRECISION) -> List[List[float]]:
+    """Kebalikan encode_polyline. ValueError jika string terpotong."""
+    factor = 10 ** precision
+    coords = []
+    index = lat = lon = 0
+    length = len(text or "")
+    while index < length:
+        deltas = []
+        for _ in range(2):
+            result = shift = 0
+            while True:
+                if index >= length:
+                    raise ValueError("polyline terpotong")
+                b = ord(text[index]) - 63
+                index += 1
+                result |= (b & 0x1F) << shift
+                shift += 5
+                if b < 0x20:
+                    break
+            deltas.append(~(result >> 1) if result & 1 else (result >> 1))
+        lat += deltas[0]
+        lon += deltas[1]
+        coords.append([lat / factor, lon / factor])
+    return coords
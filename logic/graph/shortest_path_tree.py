@@ -0,0 +1,360 @@
+"""
+shortest_path_tree.py
+Pohon jalur terpendek (SPT) berakar di depot dengan perbaikan dinamis setelah
+simulasi penutupan simpul/ruas jalan.
+
+Semua rute pengantaran berawal dari depot, jadi cukup satu SPT. Menutup simpul
+atau ruas hanya mengubah jarak simpul-simpul di SUBPOHON di bawah elemen yang
+ditutup; simpul lain tetap memakai jalur lamanya (jarak hanya bisa naik saat
+elemen dihapus, dan jalur lama mereka masih utuh). Maka perbaikan (gaya
+Ramalingam-Reps, kasus dekremental):
+1. tandai subpohon terdampak (anak dari simpul yang ditutup / ujung ruas pohon
+   yang ditutup) beserta seluruh turunannya;
+2. tiap simpul terdampak diberi jarak awal dari tetangga masuk yang TIDAK
+   terdampak (dist[u] + w(u, v));
+3. Dijkstra yang hanya merelaksasi simpul terdampak.
+Biayanya sebanding ukuran subpohon, bukan ukuran graf, dan graf tidak di-copy.
+Penutupan ruas direpresentasikan sebagai mask boolean atas array sisi CSR
+(satu elemen per pasangan berarah u->v), jadi tidak ada remove_edges_from.
+
+Jarak asli & jarak setelah penutupan disimpan sebagai array numpy berindeks
+sama, sehingga analisis "+X km detour" untuk semua simpang pelanggan cukup
+selisih array (lihat ClosureTree.detours).
+
+Fungsi/kelas utama:
+- ShortestPathTree(G, root, weight, dist, paths): SPT dasar (CSR numpy)
+- ShortestPathTree.with_closures(nodes, edges, edge_mask): ClosureTree hasil perbaikan (di-cache)
+- ShortestPathTree.edge_mask(edges, both_directions): mask penutupan atas array sisi CSR
+- ClosureTree.detours(nodes) / detour_by_name(name_to_node): jarak asli vs detour
+- distance(node) / path(node) / route(node): sama untuk kedua kelas
+"""
+
+import heapq
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from logic.tracing import span
+
+CLOSURE_CACHE_SIZE = 16  # kombinasi penutupan terakhir yang disimpan per pohon
+
+
+class _TreeView:
+    """Akses bersama untuk array dist/parent (dasar maupun hasil perbaikan)."""
+
+    nodes: list
+    index: Dict[Any, int]
+    root_index: int
+    dist: np.ndarray
+    parent: np.ndarray
+
+    def distance(self, node) -> Optional[float]:
+        """Jarak (meter) dari akar, atau None jika tidak terjangkau/tidak dikenal."""
+        i = self.index.get(node)
+        if i is None or not np.isfinite(self.dist[i]):
+            return None
+        return float(self.dist[i])
+
+    def path(self, node) -> Optional[list]:
+        """Daftar simpul akar -> node mengikuti pohon, atau None."""
+        i = self.index.get(node)
+        if i is None or not np.isfinite(self.dist[i]):
+            return None
+        out = []
+        parent = self.parent
+        while i >= 0:
+            out.append(self.nodes[i])
+            i = int(parent[i])
+        out.reverse()
+        return out
+
+    def route(self, node) -> Tuple[Optional[List[tuple]], Optional[float]]:
+        """Format sama dengan cari_rute_by_nama: (daftar_sisi_rute, panjang_km) atau (None, None)."""
+        path = self.path(node)
+        if path is None:
+            return None, None
+        return list(zip(path, path[1:])), float(self.dist[self.index[node]]) / 1000
+
+    def _indices(self, nodes: Iterable) -> np.ndarray:
+        return np.array([self.index.get(n, -1) for n in nodes], dtype=np.int64)
+
+
+class ShortestPathTree(_TreeView):
+    """
+    SPT berakar di `root` atas graf NetworkX (MultiDiGraph OSMnx atau graf lain).
+    Bobot sisi paralel diambil yang terkecil. `dist`/`paths` hasil
+    nx.single_source_dijkstra boleh diberikan agar Dijkstra tidak diulang.
+    """
+
+    def __init__(self, G, root, weight: str = "length", dist: Optional[dict] = None,
+                 paths: Optional[dict] = None):
+        self.nodes = list(G.nodes)
+        self.index = {n: i for i, n in enumerate(self.nodes)}
+        self.root = root
+        self.root_index = self.index[root]
+        self.weight = weight
+        self._build_csr(G, weight)
+
+        n = len(self.nodes)
+        if dist is not None and paths is not None:
+            self.dist = np.full(n, np.inf)
+            self.parent = np.full(n, -1, dtype=np.int64)
+            for node, d in dist.items():
+                i = self.index[node]
+                self.dist[i] = d
+                path = paths[node]
+                if len(path) > 1:
+                    self.parent[i] = self.index[path[-2]]
+        else:
+            self.dist, self.parent = self._dijkstra_all()
+
+        self._children = None
+        self._closure_cache: "OrderedDict[tuple, ClosureTree]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # --- struktur ---
+
+    def _build_csr(self, G, weight: str):
+        best: Dict[Tuple[int, int], float] = {}
+        index = self.index
+        directed = G.is_directed()
+        for u, v, w in G.edges(data=weight, default=1.0):
+            iu, iv = index[u], index[v]
+            w = float(w)
+            for key in ((iu, iv), (iv, iu)) if not directed else ((iu, iv),):
+                if w < best.get(key, np.inf):
+                    best[key] = w
+        n = len(self.nodes)
+        if best:
+            pairs = np.array(list(best.keys()), dtype=np.int64)
+            weights = np.fromiter(best.values(), dtype=float, count=len(best))
+        else:
+            pairs = np.zeros((0, 2), dtype=np.int64)
+            weights = np.zeros(0)
+
+        # CSR keluar & masuk; disimpan juga sebagai list Python untuk loop Dijkstra.
+        # Posisi di CSR keluar = id sisi (dipakai mask penutupan); in_to_out memetakan
+        # posisi CSR masuk ke id sisi yang sama.
+        order_out = np.argsort(pairs[:, 0], kind="stable")
+        self.out_ptr = np.searchsorted(pairs[order_out, 0], np.arange(n + 1)).tolist()
+        self.out_src = pairs[order_out, 0]
+        self.out_idx = pairs[order_out, 1].tolist()
+        self.out_w = weights[order_out].tolist()
+        order_in = np.argsort(pairs[:, 1], kind="stable")
+        self.in_ptr = np.searchsorted(pairs[order_in, 1], np.arange(n + 1)).tolist()
+        self.in_idx = pairs[order_in, 0].tolist()
+        self.in_w = weights[order_in].tolist()
+        edge_id = np.empty(len(pairs), dtype=np.int64)
+        edge_id[order_out] = np.arange(len(pairs))
+        self.in_to_out = edge_id[order_in]
+        self.edge_index = {(int(pairs[j, 0]), int(pairs[j, 1])): int(edge_id[j]) for j in range(len(pairs))}
+
+    def _dijkstra_all(self):
+        n = len(self.nodes)
+        dist = [np.inf] * n
+        parent = [-1] * n
+        dist[self.root_index] = 0.0
+        heap = [(0.0, self.root_index)]
+        out_ptr, out_idx, out_w = self.out_ptr, self.out_idx, self.out_w
+        while heap:
+            d, v = heapq.heappop(heap)
+            if d > dist[v]:
+                continue
+            for k in range(out_ptr[v], out_ptr[v + 1]):
+                x = out_idx[k]
+                nd = d + out_w[k]
+                if nd < dist[x]:
+                    dist[x] = nd
+                    parent[x] = v
+                    heapq.heappush(heap, (nd, x))
+        return np.array(dist), np.array(parent, dtype=np.int64)
+
+    def _child_lists(self):
+        """CSR anak per simpul pohon (dibuat sekali, saat perbaikan pertama)."""
+        if self._children is None:
+            parent = self.parent
+            has_parent = np.flatnonzero(parent >= 0)
+            order = has_parent[np.argsort(parent[has_parent], kind="stable")]
+            ptr = np.searchsorted(parent[order], np.arange(len(self.nodes) + 1))
+            self._children = (ptr.tolist(), order.tolist())
+        return self._children
+
+    def _subtree(self, roots: Iterable[int]) -> np.ndarray:
+        ptr, kids = self._child_lists()
+        mask = np.zeros(len(self.nodes), dtype=bool)
+        stack = [r for r in roots]
+        while stack:
+            v = stack.pop()
+            if mask[v]:
+                continue
+            mask[v] = True
+            stack.extend(kids[ptr[v]:ptr[v + 1]])
+        return mask
+
+    # --- penutupan ---
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.out_idx)
+
+    def edge_mask(self, edges: Iterable = (), both_directions: bool = False) -> np.ndarray:
+        """
+        Mask boolean (panjang edge_count) untuk ruas `edges` ((u, v) atau (u, v, key);
+        semua sisi paralel u->v ikut ditutup). both_directions=True ikut menutup v->u,
+        seperti penutupan jalan di peta. Ruas yang tidak ada di graf diabaikan.
+        """
+        mask = np.zeros(self.edge_count, dtype=bool)
+        index, edge_index = self.index, self.edge_index
+        for e in edges:
+            iu, iv = index.get(e[0]), index.get(e[1])
+            if iu is None or iv is None:
+                continue
+            for pair in ((iu, iv), (iv, iu)) if both_directions else ((iu, iv),):
+                eid = edge_index.get(pair)
+                if eid is not None:
+                    mask[eid] = True
+        return mask
+
+    def with_closures(self, nodes: Iterable = (), edges: Iterable = (),
+                      edge_mask: Optional[np.ndarray] = None) -> "ClosureTree":
+        """
+        SPT setelah simpul `nodes` dan ruas berarah `edges` (lihat edge_mask) dihapus.
+        Mask sisi yang sudah jadi boleh diberikan lewat `edge_mask` (digabung dengan
+        `edges`). Simpul yang tidak ada di graf diabaikan.
+        """
+        node_ids = frozenset(self.index[n] for n in nodes if n in self.index)
+        mask = self.edge_mask(edges)
+        if edge_mask is not None:
+            mask |= edge_mask
+        key = (node_ids, frozenset(np.flatnonzero(mask).tolist()))
+        with self._lock:
+            tree = self._closure_cache.get(key)
+            if tree is not None:
+                self._closure_cache.move_to_end(key)
+                return tree
+        tree = ClosureTree(self, node_ids, mask)
+        with self._lock:
+            self._closure_cache[key] = tree
+            while len(self._closure_cache) > CLOSURE_CACHE_SIZE:
+                self._closure_cache.popitem(last=False)
+        return tree
+
+
+class ClosureTree(_TreeView):
+    """
+    SPT hasil perbaikan dekremental. `base_dist` = jarak asli, `dist` = jarak
+    setelah penutupan (inf = terputus); keduanya berindeks simpul yang sama.
+    """
+
+    def __init__(self, base: ShortestPathTree, removed_nodes: frozenset, closed_edges: np.ndarray):
+        self.base = base
+        self.nodes = base.nodes
+        self.index = base.index
+        self.root_index = base.root_index
+        self.base_dist = base.dist
+        self.removed = np.zeros(len(base.nodes), dtype=bool)
+        if removed_nodes:
+            self.removed[list(removed_nodes)] = True
+        self.closed_edges = closed_edges  # mask atas id sisi CSR
+
+        with span("route.spt_repair", nodes=len(removed_nodes), edges=int(closed_edges.sum())) as sp:
+            self.dist, self.parent, self.affected = self._repair()
+            sp["affected"] = int(self.affected.sum())
+
+    def _repair(self):
+        base = self.base
+        parent0 = base.parent
+        removed = self.removed
+        closed_ids = np.flatnonzero(self.closed_edges)
+
+        # Akar subpohon terdampak: simpul yang ditutup & ujung ruas pohon yang ditutup
+        roots = [int(i) for i in np.flatnonzero(removed) if np.isfinite(base.dist[i])]
+        heads = np.asarray(base.out_idx, dtype=np.int64)[closed_ids] if len(closed_ids) else closed_ids
+        tails = base.out_src[closed_ids]
+        roots += heads[parent0[heads] == tails].tolist()
+        dist = base.dist.copy()
+        parent = parent0.copy()
+        if not roots:
+            return dist, parent, np.zeros(len(dist), dtype=bool)
+
+        affected = base._subtree(roots)
+        dist[affected] = np.inf
+        parent[affected] = -1
+        if removed[base.root_index]:
+            return dist, parent, affected
+
+        in_ptr, in_idx, in_w = base.in_ptr, base.in_idx, base.in_w
+        out_ptr, out_idx, out_w = base.out_ptr, base.out_idx, base.out_w
+        affected_l = affected.tolist()
+        removed_l = removed.tolist()
+        closed_out = self.closed_edges.tolist()
+        closed_in = self.closed_edges[base.in_to_out].tolist()
+        dist_l = dist.tolist()
+        parent_l = parent.tolist()
+
+        # Jarak awal dari tetangga masuk yang tidak terdampak (batas subpohon)
+        heap = []
+        for v in np.flatnonzero(affected & ~removed).tolist():
+            best, best_u = np.inf, -1
+            for k in range(in_ptr[v], in_ptr[v + 1]):
+                u = in_idx[k]
+                if affected_l[u] or removed_l[u] or closed_in[k]:
+                    continue
+                nd = dist_l[u] + in_w[k]
+                if nd < best:
+                    best, best_u = nd, u
+            if best_u >= 0:
+                dist_l[v] = best
+                parent_l[v] = best_u
+                heap.append((best, v))
+        heapq.heapify(heap)
+
+        # Dijkstra terbatas pada subpohon terdampak
+        while heap:
+            d, v = heapq.heappop(heap)
+            if d > dist_l[v]:
+                continue
+            for k in range(out_ptr[v], out_ptr[v + 1]):
+                x = out_idx[k]
+                if not affected_l[x] or removed_l[x] or closed_out[k]:
+                    continue
+                nd = d + out_w[k]
+                if nd < dist_l[x]:
+                    dist_l[x] = nd
+                    parent_l[x] = v
+                    heapq.heappush(heap, (nd, x))
+
+        return np.array(dist_l), np.array(parent_l, dtype=np.int64), affected
+
+    def is_closed(self, node) -> bool:
+        i = self.index.get(node)
+        return i is not None and bool(self.removed[i])
+
+    def detours(self, nodes: Iterable) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (jarak_asli, jarak_detour, selisih) dalam meter untuk tiap simpul `nodes`.
+        nan untuk simpul yang tidak dikenal; jarak_detour inf jika terputus atau
+        simpulnya sendiri ditutup.
+        """
+        idx = self._indices(nodes)
+        known = idx >= 0
+        orig = np.full(len(idx), np.nan)
+        new = np.full(len(idx), np.nan)
+        orig[known] = self.base_dist[idx[known]]
+        new[known] = self.dist[idx[known]]
+        closed = np.zeros(len(idx), dtype=bool)
+        closed[known] = self.removed[idx[known]]
+        new[closed] = np.inf
+        return orig, new, new - orig
+
+    def detour_by_name(self, name_to_node: Dict[str, Any]) -> Dict[str, Tuple[Optional[float], Optional[float]]]:
+        """{nama: (km_asli, km_detour)}; None jika tidak terjangkau/ditutup."""
+        names = list(name_to_node)
+        orig, new, _ = self.detours(name_to_node[n] for n in names)
+
+        def km(x):
+            return float(x) / 1000 if np.isfinite(x) else None
+
+        return {name: (km(o), km(d)) for name, o, d in zip(names, orig, new)}
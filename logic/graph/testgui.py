@@ -1,75 +1,39 @@
-import sys, os, json, hashlib
+import sys, os, json
 from PyQt5.QtWidgets import QApplication, QMainWindow, QPushButton, QVBoxLayout, QWidget, QHBoxLayout, QFileDialog
 from PyQt5.QtWebEngineWidgets import QWebEngineView
 from PyQt5.QtCore import QUrl, QObject, pyqtSlot
 from PyQt5.QtWebChannel import QWebChannel
 
-import re, json
-from PyQt5.QtCore import QObject, pyqtSlot
+# Root proyek agar paket logic/ bisa diimpor saat file ini dijalankan langsung
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from logic.graph.marker_store import get_marker_store, parse_edit_payload
 
 class GraphHandler(QObject):
+    """
+    Simpan/muat hasil edit marker lewat sidecar SQLite (logic/graph/marker_store.py),
+    yang juga diekspor ke road_map_markers.json (ikut di-commit) setiap kali disimpan.
+    HTML peta tidak pernah ditulis ulang; halaman memanggil loadMarkerEdits saat dimuat.
+    """
+
     @pyqtSlot(str)
     def saveGraphHTML(self, graph_json_str):
         """
         graph_json_str: JSON string dari frontend berisi list editedMarkers
-        Format tiap node: {"idx": <idx>, "lat": <lat>, "lng": <lng>, "nama": <nama>, "id": <id>}
+        (atau {"nodes": [...]} dari exportGraphHTML).
+        Format tiap node: {"key": <key>, "lat": <lat>, "lng": <lng>, "nama": <nama>, "id": <id>}
         """
-        data = json.loads(graph_json_str)
-        print(data)
-        processed_data = []
-
-        for node in data:
-            if isinstance(node, str):
-                try:
-                    node = json.loads(node)
-                except json.JSONDecodeError:
-                    continue
-            processed_data.append(node)
-
-        for node in processed_data:
-            idx = node.get("idx")
-            if idx is None:
-                continue
-
-        with open("./road_map_detailed.html", "r", encoding="utf-8") as f:
-            html = f.read()
-
-        for node in data:
-            idx = node.get("idx")
-            if idx is None:
-                continue  # skip jika idx tidak ada
-
-            marker_hash = hashlib.md5(str(idx).encode()).hexdigest()
-            marker_var = f"circle_marker_{marker_hash}"
-
-            nama = node.get("nama", "Nama Tidak Ada")
-            node_id = node.get("id", "ID Tidak Ada")
-
-            # tooltip baru
-            new_tooltip = (
-                f"`<div>\n"
-                f"     <b>{nama}</b><br>ID: {node_id}\n"
-                f" </div>`"
-            )
-
-            # regex: cari bindTooltip untuk marker tertentu
-            pattern = re.compile(
-                rf"({marker_var}\.bindTooltip\()\s*`[\s\S]*?`(\s*,\s*\{{\s*\"sticky\":\s*true\s*,?\s*\}}\s*\)\s*;)",
-                re.MULTILINE
-            )
-
-            new_html, count = re.subn(pattern, rf"\1{new_tooltip}\2", html)
-
-            if count > 0:
-                html = new_html
-                print(f"✅ Tooltip pada {marker_var} diperbarui.")
-            else:
-                print(f"⚠️ {marker_var} tidak ditemukan, dilewati.")
-
-        with open("./road_map_detailed.html", "w", encoding="utf-8") as f:
-            f.write(html)
-
-        print("💾 Semua tooltip pada circle_marker diperbarui.")
+        try:
+            nodes = parse_edit_payload(graph_json_str)
+        except json.JSONDecodeError as e:
+            print(f"⚠️ Payload marker tidak valid: {e}")
+            return
+        saved = get_marker_store().upsert(nodes)
+        print(f"💾 {saved} marker disimpan ke {get_marker_store().path}")
+
+    @pyqtSlot(result=str)
+    def loadMarkerEdits(self):
+        """JSON {key: {nama, id}} untuk diterapkan halaman peta (aquaApplyMarkerEdits)."""
+        return get_marker_store().edits_json()
 
 
 class Backend(QObject):
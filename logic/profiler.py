@@ -0,0 +1,310 @@
+"""
+profiler.py
+Profiler untuk mode `python main.py --profile`: mencari penyebab UI macet
+(stall beberapa detik) dengan data, bukan tebakan.
+
+Dua mode:
+- sampler (default): thread latar mengambil stack thread utama tiap INTERVAL_MS
+  via sys._current_frames(). Overhead kecil, tidak mengubah timing aplikasi.
+  Saat event loop Qt sedang idle, stack berhenti di `exec` sehingga waktu idle
+  terlihat terpisah dari waktu kerja.
+- cprofile: cProfile atas seluruh event loop; jumlah panggilan & waktu per
+  fungsi eksak, tetapi kode Python berjalan ~2x lebih lambat.
+
+Heartbeat QTimer (lihat install_stall_watch) menandai stall: jika event loop
+tidak memproses timer lebih lama dari STALL_MS, stack selama stall dicatat.
+
+Output (folder logs/profile_<waktu>/) ditulis saat aplikasi keluar:
+- stacks.collapsed : format "frame;frame;frame <jumlah>" untuk flamegraph.pl,
+                     speedscope, inferno, dll. (mode sampler)
+- slots.json       : biaya per handler slot/UI (mis. _on_deliver, reload_orders);
+                     ms inklusif = jumlah selisih waktu terukur antar sampel
+- stalls.json      : daftar stall beserta stack terberat selama stall
+- profile.pstats   : statistik cProfile (mode cprofile; buka dengan snakeviz/pstats)
+
+Fungsi utama:
+- SamplingProfiler(interval_ms).start()/stop()/write(out_dir)
+- CProfileSession().start()/stop()/write(out_dir)
+- install_stall_watch(app, profiler): heartbeat Qt untuk deteksi stall
+- start_profiling(app, mode, out_dir, interval_ms): pasang semuanya + tulis saat exit
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+INTERVAL_MS = 5          # periode sampling stack
+HEARTBEAT_MS = 50        # periode heartbeat event loop
+STALL_MS = 500           # jeda heartbeat di atas ini dianggap stall
+MAX_STACK_DEPTH = 128
+
+# Nama fungsi yang dianggap handler slot/UI untuk ringkasan slots.json
+SLOT_PREFIXES = ("_on_", "on_", "reload_", "refresh", "_perform_", "_calculate_", "_show_", "_render_",
+                 "_populate_", "_load_", "show_", "setup_")
+
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    if filename.startswith(PROJECT_ROOT):
+        filename = os.path.relpath(filename, PROJECT_ROOT)
+    else:
+        filename = os.path.basename(filename)
+    return f"{_qualname(code)} ({filename}:{code.co_firstlineno})".replace(";", ",")
+
+
+def _qualname(code) -> str:
+    # co_qualname baru ada sejak Python 3.11
+    return getattr(code, "co_qualname", code.co_name)
+
+
+def _is_slot(code) -> bool:
+    return code.co_filename.startswith(PROJECT_ROOT) and code.co_name.startswith(SLOT_PREFIXES)
+
+
+class SamplingProfiler:
+    """Sampler stack berbasis thread untuk satu thread target (default: thread utama)."""
+
+    def __init__(self, interval_ms: float = INTERVAL_MS, thread_id: Optional[int] = None):
+        self.interval = interval_ms / 1000.0
+        self.thread_id = thread_id or threading.main_thread().ident
+        self.stacks: Counter = Counter()
+        self.slot_samples: Counter = Counter()
+        # Waktu dinding per slot: tiap sampel diberi bobot selisih perf_counter sejak
+        # sampel sebelumnya, karena thread sampler bisa tertahan GIL jauh lebih lama
+        # dari interval nominal saat thread utama sibuk menjalankan Python
+        self.slot_ms: Counter = Counter()
+        self.samples = 0
+        self.stalls: List[dict] = []
+        self._stall_stacks: Optional[Counter] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.started_at = None
+        self.stopped_at = None
+
+    def start(self):
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name="profiler-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        self.stopped_at = time.time()
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            elapsed_ms, last = (now - last) * 1000.0, now
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            labels, slots = [], []
+            depth = 0
+            while frame is not None and depth < MAX_STACK_DEPTH:
+                code = frame.f_code
+                labels.append(_frame_label(code))
+                if _is_slot(code):
+                    slots.append(_qualname(code))
+                frame = frame.f_back
+                depth += 1
+            stack = ";".join(reversed(labels))
+            with self._lock:
+                self.samples += 1
+                self.stacks[stack] += 1
+                # Handler bersarang (mis. refresh -> reload_orders) sama-sama dihitung inklusif
+                for name in set(slots):
+                    self.slot_samples[name] += 1
+                    self.slot_ms[name] += elapsed_ms
+                if self._stall_stacks is not None:
+                    self._stall_stacks[stack] += 1
+
+    # --- stall (dipanggil dari heartbeat) ---
+
+    def stall_started(self):
+        with self._lock:
+            if self._stall_stacks is None:
+                self._stall_stacks = Counter()
+
+    def stall_ended(self, started_at: float, duration_ms: float):
+        with self._lock:
+            stacks, self._stall_stacks = self._stall_stacks or Counter(), None
+        top = stacks.most_common(3)
+        self.stalls.append({
+            "started_at": time.strftime("%H:%M:%S", time.localtime(started_at)),
+            "duration_ms": round(duration_ms, 1),
+            "samples": sum(stacks.values()),
+            "top_stacks": [{"samples": n, "stack": s.split(";")[-12:]} for s, n in top],
+        })
+        print(f"[PROFILE] UI stall {duration_ms:.0f} ms"
+              + (f" di {top[0][0].split(';')[-1]}" if top else ""))
+
+    def slot_costs(self) -> List[dict]:
+        rows = [
+            {"slot": name, "samples": n, "inclusive_ms": round(self.slot_ms[name], 1)}
+            for name, n in self.slot_samples.items()
+        ]
+        rows.sort(key=lambda r: r["inclusive_ms"], reverse=True)
+        return rows
+
+    def write(self, out_dir: str) -> Dict[str, str]:
+        os.makedirs(out_dir, exist_ok=True)
+        paths = {
+            "stacks": os.path.join(out_dir, "stacks.collapsed"),
+            "slots": os.path.join(out_dir, "slots.json"),
+            "stalls": os.path.join(out_dir, "stalls.json"),
+        }
+        with self._lock:
+            stacks = dict(self.stacks)
+        with open(paths["stacks"], "w", encoding="utf-8") as f:
+            for stack, n in sorted(stacks.items()):
+                f.write(f"{stack} {n}\n")
+        with open(paths["slots"], "w", encoding="utf-8") as f:
+            json.dump({
+                "mode": "sampler",
+                "interval_ms": self.interval * 1000,
+                "samples": self.samples,
+                "duration_s": round((self.stopped_at or time.time()) - (self.started_at or time.time()), 2),
+                "slots": self.slot_costs(),
+            }, f, indent=2)
+        with open(paths["stalls"], "w", encoding="utf-8") as f:
+            json.dump({"stall_ms": STALL_MS, "stalls": self.stalls}, f, indent=2)
+        return paths
+
+
+class CProfileSession:
+    """cProfile untuk seluruh event loop (thread utama)."""
+
+    def __init__(self):
+        import cProfile
+        self.profile = cProfile.Profile()
+        self.stalls: List[dict] = []
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def stall_started(self):
+        pass
+
+    def stall_ended(self, started_at: float, duration_ms: float):
+        self.stalls.append({
+            "started_at": time.strftime("%H:%M:%S", time.localtime(started_at)),
+            "duration_ms": round(duration_ms, 1),
+        })
+        print(f"[PROFILE] UI stall {duration_ms:.0f} ms")
+
+    def slot_costs(self) -> List[dict]:
+        import pstats
+        stats = pstats.Stats(self.profile).stats
+        rows = []
+        for (filename, lineno, name), (cc, nc, tt, ct, _) in stats.items():
+            if filename.startswith(PROJECT_ROOT) and name.startswith(SLOT_PREFIXES):
+                rows.append({
+                    "slot": name,
+                    "file": f"{os.path.relpath(filename, PROJECT_ROOT)}:{lineno}",
+                    "calls": nc,
+                    "inclusive_ms": round(ct * 1000, 1),
+                    "mean_ms": round(ct * 1000 / nc, 2) if nc else None,
+                })
+        rows.sort(key=lambda r: r["inclusive_ms"], reverse=True)
+        return rows
+
+    def write(self, out_dir: str) -> Dict[str, str]:
+        os.makedirs(out_dir, exist_ok=True)
+        paths = {
+            "pstats": os.path.join(out_dir, "profile.pstats"),
+            "slots": os.path.join(out_dir, "slots.json"),
+            "stalls": os.path.join(out_dir, "stalls.json"),
+        }
+        self.profile.dump_stats(paths["pstats"])
+        with open(paths["slots"], "w", encoding="utf-8") as f:
+            json.dump({"mode": "cprofile", "slots": self.slot_costs()}, f, indent=2)
+        with open(paths["stalls"], "w", encoding="utf-8") as f:
+            json.dump({"stall_ms": STALL_MS, "stalls": self.stalls}, f, indent=2)
+        return paths
+
+
+def install_stall_watch(app, profiler, heartbeat_ms: int = HEARTBEAT_MS, stall_ms: int = STALL_MS):
+    """
+    Heartbeat QTimer di thread utama + thread pengawas. Jika heartbeat telat lebih
+    dari stall_ms, profiler diberi tahu (mulai/akhir stall) sehingga stack selama
+    stall dikumpulkan terpisah.
+    """
+    from PyQt6.QtCore import QTimer
+
+    state = {"last": time.perf_counter(), "stall_start": None, "stall_wall": None}
+    lock = threading.Lock()
+
+    def beat():
+        now = time.perf_counter()
+        with lock:
+            started = state["stall_start"]
+            state["last"] = now
+            state["stall_start"] = None
+        if started is not None:
+            profiler.stall_ended(state["stall_wall"], (now - started) * 1000)
+
+    timer = QTimer(app)
+    timer.setInterval(heartbeat_ms)
+    timer.timeout.connect(beat)
+    timer.start()
+
+    stop = threading.Event()
+
+    def watch():
+        while not stop.wait(heartbeat_ms / 1000.0):
+            with lock:
+                late = (time.perf_counter() - state["last"]) * 1000
+                if late > stall_ms and state["stall_start"] is None:
+                    state["stall_start"] = state["last"]
+                    state["stall_wall"] = time.time() - late / 1000
+                    begin = True
+                else:
+                    begin = False
+            if begin:
+                profiler.stall_started()
+
+    watcher = threading.Thread(target=watch, name="profiler-stall-watch", daemon=True)
+    watcher.start()
+    return timer, stop
+
+
+def default_output_dir() -> str:
+    return os.path.join(PROJECT_ROOT, "logs", time.strftime("profile_%Y%m%d_%H%M%S"))
+
+
+def start_profiling(app, mode: str = "sampler", out_dir: Optional[str] = None,
+                    interval_ms: float = INTERVAL_MS):
+    """
+    Mulai profiling untuk QApplication `app`; hasil ditulis saat aboutToQuit.
+    Mengembalikan objek profiler (SamplingProfiler / CProfileSession).
+    """
+    out_dir = out_dir or default_output_dir()
+    profiler = CProfileSession() if mode == "cprofile" else SamplingProfiler(interval_ms)
+    _, stop_watch = install_stall_watch(app, profiler)
+
+    def finish():
+        stop_watch.set()
+        profiler.stop()
+        paths = profiler.write(out_dir)
+        print(f"[PROFILE] Hasil profiling ({mode}) ditulis ke {out_dir}")
+        for row in profiler.slot_costs()[:10]:
+            print(f"  {row['slot']:<40} {row['inclusive_ms']:>10.1f} ms")
+        if "stacks" in paths:
+            print(f"  Flame graph: flamegraph.pl {paths['stacks']} > flame.svg  (atau buka di speedscope.app)")
+
+    app.aboutToQuit.connect(finish)
+    profiler.start()
+    print(f"[PROFILE] Mode {mode} aktif; output -> {out_dir}")
+    return profiler
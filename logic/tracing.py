@@ -0,0 +1,249 @@
+"""
+tracing.py
+Lapisan tracing ringan untuk jalur panas (muat graf, resolusi nama, Dijkstra,
+simulasi ETA, baca/tulis JSON, rebuild widget).
+
+Setiap span mencatat durasi (perf_counter), span induk dan atribut kecil.
+Statistik per nama span (count, total, p50/p95/p99, max) dihitung dari sampel
+terakhir di memori (RESERVOIR_SIZE per span), jadi biaya per span hanya satu
+lock + append. Span bersarang membentuk pohon per klik: mis. span
+`ui.deliv.populate` berisi `graph.routing_data`, `route.dijkstra`, `eta.simulate`,
+sehingga terlihat apakah waktu habis di I/O, routing atau rendering.
+
+Ekspor:
+- export_jsonl(path): tulis event terbaru + ringkasan statistik sebagai JSON Lines
+- env AQUA_TRACE_FILE=<path>: setiap span selesai juga di-append ke file itu
+  (ditulis per batch dan saat proses keluar)
+- env AQUA_TRACE=0: matikan tracing sepenuhnya
+
+Fungsi utama:
+- span(name, **attrs): context manager
+- traced(name, **attrs): decorator
+- get_stats(): ringkasan per span (dipakai panel Diagnostik)
+- recent_events(limit): event span terbaru
+- reset(): kosongkan statistik & event
+"""
+
+import atexit
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_EXPORT_DIR = os.path.join(PROJECT_ROOT, "logs")
+
+RESERVOIR_SIZE = 1000   # sampel durasi terakhir per nama span
+EVENT_BUFFER = 5000     # event terakhir yang disimpan untuk panel/ekspor
+FLUSH_EVERY = 200       # event per penulisan ke AQUA_TRACE_FILE
+
+_enabled = os.environ.get("AQUA_TRACE", "1") not in ("0", "false", "no")
+_trace_file: Optional[str] = os.environ.get("AQUA_TRACE_FILE") or None
+
+_lock = threading.Lock()
+_local = threading.local()
+_ids = itertools.count(1)
+_stats: Dict[str, "_SpanStats"] = {}
+_events: deque = deque(maxlen=EVENT_BUFFER)
+_pending: List[dict] = []
+
+
+class _SpanStats:
+    __slots__ = ("count", "total", "max", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=RESERVOIR_SIZE)
+
+    def add(self, dur_ms: float):
+        self.count += 1
+        self.total += dur_ms
+        if dur_ms > self.max:
+            self.max = dur_ms
+        self.samples.append(dur_ms)
+
+
+def _percentile(sorted_values, q: float) -> float:
+    k = (len(sorted_values) - 1) * q
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def _stack() -> list:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(enabled: bool) -> None:
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def set_trace_file(path: Optional[str]) -> None:
+    """Aktifkan (atau matikan dengan None) penulisan event ke file JSONL."""
+    global _trace_file
+    flush()
+    _trace_file = path
+
+
+def _record(event: dict) -> None:
+    to_write = None
+    with _lock:
+        stats = _stats.get(event["name"])
+        if stats is None:
+            stats = _stats[event["name"]] = _SpanStats()
+        stats.add(event["dur_ms"])
+        _events.append(event)
+        if _trace_file:
+            _pending.append(event)
+            if len(_pending) >= FLUSH_EVERY:
+                to_write = _pending[:]
+                _pending.clear()
+    if to_write:
+        _write_lines(_trace_file, to_write)
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """
+    Ukur blok kode sebagai span `name`. Atribut tambahan bisa diisi di dalam blok:
+        with span("route.dijkstra", dest=nama) as s:
+            ...
+            s["nodes"] = len(path)
+    """
+    if not _enabled:
+        yield attrs
+        return
+    stack = _stack()
+    span_id = next(_ids)
+    parent = stack[-1] if stack else None
+    stack.append(span_id)
+    start_wall = time.time()
+    t0 = time.perf_counter()
+    error = None
+    try:
+        yield attrs
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        dur_ms = (time.perf_counter() - t0) * 1000
+        stack.pop()
+        event = {
+            "name": name,
+            "id": span_id,
+            "parent": parent,
+            "ts": round(start_wall, 6),
+            "dur_ms": round(dur_ms, 3),
+            "thread": threading.current_thread().name,
+        }
+        if attrs:
+            event["attrs"] = attrs
+        if error:
+            event["error"] = error
+        _record(event)
+
+
+def traced(name: Optional[str] = None, **attrs):
+    """Decorator: setiap pemanggilan fungsi menjadi satu span (default nama = modul.fungsi)."""
+    def decorator(fn):
+        span_name = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with span(span_name, **attrs):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_stats() -> List[dict]:
+    """Ringkasan per span, diurutkan dari total waktu terbesar."""
+    with _lock:
+        snapshot = [(name, s.count, s.total, s.max, sorted(s.samples)) for name, s in _stats.items()]
+    rows = []
+    for name, count, total, max_ms, samples in snapshot:
+        if not samples:
+            continue
+        rows.append({
+            "name": name,
+            "count": count,
+            "total_ms": round(total, 3),
+            "mean_ms": round(total / count, 3),
+            "p50_ms": round(_percentile(samples, 0.50), 3),
+            "p95_ms": round(_percentile(samples, 0.95), 3),
+            "p99_ms": round(_percentile(samples, 0.99), 3),
+            "max_ms": round(max_ms, 3),
+        })
+    rows.sort(key=lambda r: r["total_ms"], reverse=True)
+    return rows
+
+
+def recent_events(limit: Optional[int] = None) -> List[dict]:
+    with _lock:
+        events = list(_events)
+    return events[-limit:] if limit else events
+
+
+def reset() -> None:
+    with _lock:
+        _stats.clear()
+        _events.clear()
+
+
+def _write_lines(path: str, records: List[dict]) -> None:
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            for rec in records:
+                f.write(json.dumps(rec, ensure_ascii=False, default=str) + "\n")
+    except OSError as e:
+        print(f"Peringatan: gagal menulis trace ke {path}: {e}")
+
+
+def flush() -> None:
+    """Tulis event yang masih tertahan ke AQUA_TRACE_FILE (jika aktif)."""
+    with _lock:
+        to_write = _pending[:]
+        _pending.clear()
+        path = _trace_file
+    if path and to_write:
+        _write_lines(path, to_write)
+
+
+def default_export_path() -> str:
+    return os.path.join(DEFAULT_EXPORT_DIR, time.strftime("trace_%Y%m%d_%H%M%S.jsonl"))
+
+
+def export_jsonl(path: Optional[str] = None) -> str:
+    """
+    Tulis event terbaru (type=span) lalu ringkasan per span (type=summary) ke
+    `path` sebagai JSON Lines. Mengembalikan path file.
+    """
+    path = path or default_export_path()
+    records = [dict(e, type="span") for e in recent_events()]
+    records += [dict(s, type="summary") for s in get_stats()]
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for rec in records:
+            f.write(json.dumps(rec, ensure_ascii=False, default=str) + "\n")
+    return path
+
+
+atexit.register(flush)
@@ -3,8 +3,16 @@ AquaGalon - Sistem Pemesanan & Pengiriman Galon
 Berbasis Graph Theory untuk Matematika Diskrit
 
 Main entry point untuk aplikasi
+
+Opsi:
+    python main.py --profile                 # sampler stack + deteksi UI stall
+    python main.py --profile=cprofile        # cProfile seluruh event loop
+    python main.py --profile --profile-out logs/run1 --profile-interval 2
+Hasil profiling (flame graph collapsed stacks, biaya per slot, daftar stall)
+ditulis saat aplikasi ditutup; lihat logic/profiler.py.
 """
 
+import argparse
 import sys
 import os
 from PyQt6.QtWidgets import QApplication, QMainWindow, QStackedWidget, QMessageBox
@@ -17,6 +25,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'UI'))
 
 # Import components
 from UI.login.UI_login import create_login_system
+from UI.seller.UI_sl_map_scheme import register_map_scheme
 
 
 class AppController(QMainWindow):
@@ -24,6 +33,9 @@ class AppController(QMainWindow):
     Main application controller
     Mengelola alur aplikasi dari login hingga main interface
     """
+
+    # True jika data routing (graf, indeks nama, tabel jarak depot) sudah siap dipakai
+    routing_data_ready = pyqtSignal(bool)
     
     def __init__(self):
         super().__init__()
@@ -32,6 +44,7 @@ class AppController(QMainWindow):
         self.login_system = None
         self.graph_system = None
         self.graph_visualizer = None
+        self.routing_prefetcher = None
         
         self.init_app()
         
@@ -169,6 +182,8 @@ class AppController(QMainWindow):
             # Sembunyikan main window dan tampilkan dashboard seller
             self.hide()
             self.seller_dashboard.show()
+            # Hangatkan data routing di background selagi dashboard dirender
+            self.start_routing_prefetch()
 
         # JIKA GAGAL IMPORT, TAMPILKAN INTERFACE SEDERHANA DENGAN TEST GRAPH
         except ImportError as e:
@@ -190,6 +205,19 @@ class AppController(QMainWindow):
             layout.addStretch()
             self.setCentralWidget(central_widget)
     
+    def start_routing_prefetch(self):
+        """Mulai prefetch graf peta & tabel jarak depot di worker thread"""
+        try:
+            from UI.seller.UI_sl_prefetch import RoutingPrefetcher
+        except ImportError as e:
+            print(f"Prefetch routing tidak tersedia: {e}")
+            return
+        if self.routing_prefetcher is None:
+            self.routing_prefetcher = RoutingPrefetcher(parent=self)
+            self.routing_prefetcher.ready.connect(self.routing_data_ready.emit)
+        # Tunda satu siklus event loop agar paint pertama dashboard tidak terhambat
+        QTimer.singleShot(0, self.routing_prefetcher.start)
+
     def on_seller_logout(self):
         """Handle logout dari seller dashboard"""
         print("Seller logout requested")
@@ -230,10 +258,25 @@ class AppController(QMainWindow):
         event.accept()
 
 
-def setup_application():
+def parse_args(argv=None):
+    """Pisahkan opsi AquaGalon dari argumen sisa (diteruskan ke Qt)."""
+    parser = argparse.ArgumentParser(description="AquaGalon", add_help=True)
+    parser.add_argument("--profile", nargs="?", const="sampler", choices=("sampler", "cprofile"),
+                        help="Profiling event loop Qt; hasil ditulis saat aplikasi keluar")
+    parser.add_argument("--profile-out", help="Folder output profiling (default: logs/profile_<waktu>)")
+    parser.add_argument("--profile-interval", type=float, default=5.0,
+                        help="Interval sampling stack dalam ms (mode sampler)")
+    argv = sys.argv if argv is None else argv
+    args, qt_args = parser.parse_known_args(argv[1:])
+    return args, argv[:1] + qt_args
+
+
+def setup_application(argv=None):
     """Setup aplikasi dengan konfigurasi yang diperlukan"""
     QCoreApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
-    app = QApplication(sys.argv)
+    # Scheme aquamap:// (peta tiled) harus terdaftar sebelum QApplication dibuat
+    register_map_scheme()
+    app = QApplication(sys.argv if argv is None else argv)
     
     # Set application properties
     app.setApplicationName("AquaGalon")
@@ -263,9 +306,15 @@ def setup_application():
 
 def main():
     """Main function"""
+    args, qt_argv = parse_args()
     try:
         # Setup application
-        app = setup_application()
+        app = setup_application(qt_argv)
+
+        if args.profile:
+            # Dipasang sebelum controller dibuat agar startup & login ikut terukur
+            from logic.profiler import start_profiling
+            start_profiling(app, args.profile, args.profile_out, args.profile_interval)
         
         # Create main controller
         controller = AppController()